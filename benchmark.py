@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      benchmark
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Benchmarks every stage of the pipeline on synthetic inputs and checks the
+results against a stored baseline.
+
+STAGES:
+    attitude_generate : generateAttitude tables in memory         (cases/s)
+    attitude_dataset  : generateAttitudeDataset CSV files, 1 core  (cases/s)
+    quat_scalar       : Quat products, one at a time               (products/s)
+    quat_array        : QuatArray products                         (products/s)
+    tumble_propagate  : tumblePropagator, 300 frames per object    (frames/s)
+    tiff_decode_<res> : TIFFreader decode of 16-bit frames         (frames/s)
+    photometry_reduce : generatePhotometry over a frame directory  (frames/s)
+    phot_parse        : photometry.load_directory on CSV curves    (curves/s)
+    gp_sparse_fit     : SparseGPClassifier fit                     (curves/s)
+    gp_exact_fit      : sklearn GaussianProcessClassifier fit      (curves/s)
+                        (skipped when sklearn is not installed)
+
+Inputs are generated once into a work directory (16-bit TIFFs of each
+resolution, attitude files and photometry curves) and reused by later runs.
+Generating them is not timed.
+
+Each stage runs `repeat` times in its own freshly spawned process. The best
+and median times are reported, together with the throughput at the median and
+the peak resident memory of that process. That peak includes loading the
+inputs. It is not available on Windows.
+
+Results are saved as JSON. compareResults() flags every stage whose median
+time exceeds the baseline by more than the tolerance.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+import json
+import time
+import platform
+import multiprocessing
+from datetime import datetime
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'data_generation'))
+sys.path.insert(0, HERE)
+
+#%% CONSTANTS %%#
+SIZES = {"quick": {"num_cases": 200, "num_quats": 10000, "resolutions": [256, 512],
+                   "num_frames": 16, "num_curves": 1000, "num_train": 5000, "num_exact": 300,
+                   "num_tumble": 2000},
+         "full":  {"num_cases": 2000, "num_quats": 100000, "resolutions": [256, 512, 1024, 2048],
+                   "num_frames": 64, "num_curves": 100000, "num_train": 100000, "num_exact": 1000,
+                   "num_tumble": 10000}}
+
+STAGES = {}                                 # name : (function, unit)
+
+#%% INPUTS %%#
+
+# Write a single-strip 16-bit greyscale little endian TIFF
+def writeTIFF16(filepath, image):
+    import struct
+    height, width = image.shape
+    data    = np.asarray(image, dtype='<u2').tobytes()
+    entries = [(0x100, 4, width), (0x101, 4, height), (0x102, 3, 16), (0x103, 3, 1),
+               (0x106, 3, 1), (0x111, 4, None), (0x115, 3, 1), (0x116, 4, height),
+               (0x117, 4, len(data))]
+    data_off = 8 + 2 + 12*len(entries) + 4
+    
+    header = b'II' + struct.pack('<HIH', 42, 8, len(entries))
+    for tag, kind, value in entries:
+        value = data_off if value is None else value
+        header += struct.pack('<HHI', tag, kind, 1)
+        header += struct.pack('<Hxx' if kind == 3 else '<I', value)
+    with open(filepath, 'wb') as file:
+        file.write(header + struct.pack('<I', 0) + data)
+
+# Directory of synthetic frames named like Blender's output ('0000.tif', ...)
+def frameDirectory(workdir, resolution, num_frames):
+    path = os.path.join(workdir, 'frames_' + str(resolution)) + os.sep
+    if not os.path.isdir(path) or len(os.listdir(path)) < num_frames:
+        os.makedirs(path, exist_ok=True)
+        rng = np.random.default_rng(resolution)
+        yy, xx = np.mgrid[0:resolution, 0:resolution]/resolution - 0.5
+        for k in range(num_frames):
+            blob  = np.exp(-((xx - 0.1*np.cos(k/4))**2 + yy**2)*30)*40000
+            image = blob + rng.integers(0, 500, blob.shape)
+            writeTIFF16(path + str(k).zfill(4) + '.tif', image)
+    return path
+
+# Directory of synthetic photometry CSV files for the three satellite classes
+def photometryDirectory(workdir, num_curves):
+    import dataFormat as df
+    from photometryStore import SAT_CLASSES
+    path = os.path.join(workdir, 'phot_' + str(num_curves))
+    if not os.path.isdir(path) or len(os.listdir(path)) < num_curves:
+        os.makedirs(path, exist_ok=True)
+        X, y  = syntheticCurves(num_curves, seed=1)
+        names = list(SAT_CLASSES)
+        for k in range(num_curves):
+            n    = 192 + k % 96
+            meta = df.makeMeta(str(k).zfill(18), 24, n/24, 1.0, 2.0, [0, 0, 1], sat_name=names[y[k]])
+            df.writePhotometry(os.path.join(path, names[y[k]] + '_' + meta["file_id"] + '.csv'),
+                               meta, X[k,0:n], np.linspace(0, n/24, n))
+    return path
+
+# Synthetic class-dependent light curves (spinning, class sets the amplitude)
+# Returns (X, y)
+def syntheticCurves(num, num_attributes=288, seed=0):
+    rng = np.random.default_rng(seed)
+    y   = rng.integers(0, 3, num)
+    t   = np.arange(num_attributes)/24
+    w   = rng.uniform(2, 6, (num, 1))
+    amp = np.array([0.3, 0.6, 1.0])[y][:,None]
+    X   = amp*np.abs(np.sin(w*t + rng.uniform(0, 2*np.pi, (num, 1)))) + 0.05*rng.normal(size=(num, num_attributes))
+    return X, y
+
+#%% STAGES %%#
+# Each stage takes (sizes, workdir) and returns (function to time, units of work per call)
+
+def stage(name, unit):
+    def register(func):
+        STAGES[name] = (func, unit)
+        return func
+    return register
+
+@stage('attitude_generate', 'cases/s')
+def attitudeGenerate(sizes, workdir):
+    import random
+    import generateAttitudeData as gad
+    rng    = random.Random(0)
+    params = [gad.randomParameters(rng) for _ in range(sizes["num_cases"])]
+    for p in params:
+        p.pop("sun_angle")
+    return (lambda: [gad.generateAttitude(**p) for p in params]), len(params)
+
+@stage('attitude_dataset', 'cases/s')
+def attitudeDataset(sizes, workdir):
+    import generateAttitudeDataset as gads
+    path = os.path.join(workdir, 'rotation_data')
+    os.makedirs(path, exist_ok=True)
+    return (lambda: gads.generateAttitudeDataset(sizes["num_cases"], path, num_workers=1,
+                                                 seed=0, verbose=False)), sizes["num_cases"]
+
+@stage('quat_scalar', 'products/s')
+def quatScalar(sizes, workdir):
+    import quat
+    n = min(sizes["num_quats"], 20000)
+    a = [quat.Quat() for _ in range(n)]
+    b = [quat.Quat() for _ in range(n)]
+    for k in range(n):
+        a[k].setAngleAxis(0.001*k, np.array([1.0, 2.0, 3.0]))
+        b[k].setAngleAxis(0.002*k, np.array([3.0, 1.0, 2.0]))
+    return (lambda: [p*q for p, q in zip(a, b)]), n
+
+@stage('quat_array', 'products/s')
+def quatArray(sizes, workdir):
+    import quat
+    n = sizes["num_quats"]*10
+    a = quat.QuatArray.fromAngleAxis(0.001*np.arange(n), np.array([1.0, 2.0, 3.0]))
+    b = quat.QuatArray.fromAngleAxis(0.002*np.arange(n), np.array([3.0, 1.0, 2.0]))
+    return (lambda: a*b), n
+
+@stage('tumble_propagate', 'frames/s')
+def tumblePropagate(sizes, workdir):
+    import tumblePropagator as tp
+    n      = sizes["num_tumble"]
+    params = tp.randomTumble(np.random.default_rng(0), n)
+    return (lambda: tp.propagate(fps=24, num_frames=300, **params)), n*300
+
+def tiffDecode(resolution):
+    def setup(sizes, workdir):
+        import readTIFF as rt
+        path  = frameDirectory(workdir, resolution, sizes["num_frames"])
+        files = [path + str(k).zfill(4) + '.tif' for k in range(sizes["num_frames"])]
+        def run():
+            for filepath in files:
+                with rt.TIFFreader(filepath, row_major=True) as reader:
+                    reader.im_raw.sum()
+        return run, len(files)
+    return setup
+
+for _resolution in SIZES["full"]["resolutions"]:
+    stage('tiff_decode_' + str(_resolution), 'frames/s')(tiffDecode(_resolution))
+
+@stage('photometry_reduce', 'frames/s')
+def photometryReduce(sizes, workdir):
+    import generatePhotometryTIFF as gpt
+    resolution = sizes["resolutions"][-1]
+    path = frameDirectory(workdir, resolution, sizes["num_frames"])
+    return (lambda: gpt.generatePhotometry(path, 24, sizes["num_frames"], quiet=True)), sizes["num_frames"]
+
+@stage('phot_parse', 'curves/s')
+def photParse(sizes, workdir):
+    import photometry
+    path = photometryDirectory(workdir, sizes["num_curves"])
+    return (lambda: photometry.load_directory(path, workers=1)), sizes["num_curves"]
+
+@stage('gp_sparse_fit', 'curves/s')
+def gpSparseFit(sizes, workdir):
+    import sparseGP
+    X, y = syntheticCurves(sizes["num_train"])
+    return (lambda: sparseGP.SparseGPClassifier(256, epochs=5, random_state=0).fit(X, y)), len(X)
+
+@stage('gp_exact_fit', 'curves/s')
+def gpExactFit(sizes, workdir):
+    from sklearn.gaussian_process import GaussianProcessClassifier
+    from sklearn.gaussian_process.kernels import RBF
+    X, y = syntheticCurves(sizes["num_exact"])
+    return (lambda: GaussianProcessClassifier(kernel=1.0*RBF(1.0), random_state=0).fit(X, y)), len(X)
+
+#%% RUNNING %%#
+
+# Peak resident memory of this process [MB] (None where unavailable)
+def peakRSS():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak/2**20 if sys.platform == 'darwin' else peak/2**10   # bytes on macOS, KB on Linux
+
+# Run one stage (in the current process)
+# Returns a result dictionary, or None when the stage cannot run here
+def runStage(name, sizes, workdir, repeat=5):
+    func, unit = STAGES[name]
+    try:
+        run, count = func(sizes, workdir)
+    except ImportError as error:
+        print(name + " skipped: " + str(error))
+        return None
+    
+    times = []
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t_start)
+    
+    median = float(np.median(times))
+    return {"unit": unit, "count": count, "times": times, "best": min(times), "median": median,
+            "throughput": count/median if median > 0 else None, "peak_rss_mb": peakRSS()}
+
+# Run stages, each in a fresh process so its peak memory is its own
+#   scale  : Key of SIZES
+#   stages : Names of the stages to run (None = all that apply to the scale)
+# Returns the results dictionary
+def runBenchmarks(workdir, scale='quick', stages=None, repeat=5, verbose=True):
+    sizes = SIZES[scale]
+    os.makedirs(workdir, exist_ok=True)
+    if stages is None:
+        stages = [name for name in STAGES
+                  if not name.startswith('tiff_decode_') or int(name.split('_')[-1]) in sizes["resolutions"]]
+    
+    results = {"meta": {"date": datetime.now().isoformat(timespec='seconds'), "scale": scale,
+                        "python": platform.python_version(), "numpy": np.__version__,
+                        "platform": platform.platform(), "cpus": os.cpu_count()},
+               "stages": {}}
+    context = multiprocessing.get_context('spawn')
+    for name in stages:
+        with context.Pool(1) as pool:
+            result = pool.apply(runStage, (name, sizes, workdir, repeat))
+        if result is None:
+            continue
+        results["stages"][name] = result
+        if verbose:
+            print("{:20s} median {:9.4f} s  {:12.1f} {:12s} peak {} MB".format(
+                  name, result["median"], result["throughput"] or 0, result["unit"],
+                  None if result["peak_rss_mb"] is None else round(result["peak_rss_mb"], 1)))
+    return results
+
+# Write results to a JSON file
+def saveResults(filepath, results):
+    with open(filepath, 'w') as file:
+        json.dump(results, file, indent=2)
+
+# Read results from a JSON file
+def loadResults(filepath):
+    with open(filepath) as file:
+        return json.load(file)
+
+# Stages that got slower than the baseline
+#   tolerance : Allowed relative increase of the median time
+# Returns a list of (stage, baseline median, new median, ratio)
+def compareResults(results, baseline, tolerance=0.25, verbose=True):
+    regressions = []
+    for name, result in results["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            continue
+        ratio = result["median"]/base["median"] if base["median"] > 0 else float('inf')
+        if verbose:
+            print("{:20s} {:6.2f}x baseline{}".format(name, ratio, "  REGRESSION" if ratio > 1 + tolerance else ""))
+        if ratio > 1 + tolerance:
+            regressions.append((name, base["median"], result["median"], ratio))
+    return regressions
+
+if __name__ == "__main__":
+
+    #%% USER INPUT %%#
+    workdir   = "./benchmark_data/";            # Synthetic inputs (kept between runs)
+    scale     = "quick";                        # Key of SIZES
+    repeat    = 5;                              # Repetitions per stage
+    out_file  = "./benchmark_results.json";     # Results of this run
+    baseline  = "./benchmark_baseline.json";    # Compared against when it exists
+    tolerance = 0.25;                           # Allowed slowdown before a stage is flagged
+    
+    results = runBenchmarks(workdir, scale, repeat=repeat);
+    saveResults(out_file, results);
+    if os.path.exists(baseline):
+        regressions = compareResults(results, loadResults(baseline), tolerance);
+        sys.exit(1 if regressions else 0);
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      attitudeTrajectory
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Attitude trajectories that are evaluated on demand at any time stamps, so a
+case can be resampled at a new frame rate without regenerating or rewriting
+its attitude file.
+
+SpinTrajectory stores only the spin parameters of generateAttitude()
+(initial attitude, omega, rotation axis, duration). It evaluates the attitude
+in closed form:
+
+    q(t) = q_rot(omega t, rot_axis) * q_init
+
+KeyTrajectory stores a sparse set of key attitudes and interpolates between
+neighbouring keys with SLERP (QuatArray.slerp).
+
+Both share the same interface:
+
+    at(t)              : QuatArray of the attitudes at the time stamps t [s]
+    stream(fps, chunk) : Generator over (t, quaternion) frame by frame, or over
+                         (t, QuatArray) blocks of chunk frames
+    table(fps)         : Full (num_frames,5) attitude table (q0, q1, q2, q3, t)
+                         in the layout of generateAttitude()
+
+"""
+
+#%% IMPORTS %%#
+import numpy as np
+from abc import ABC, abstractmethod
+import quat
+import dataFormat as df
+
+#%% FUNCTIONS %%#
+
+# Frame times k/fps of the frames in [start, dur). The frame count from 0 is
+# ceil(fps*dur), as in generateAttitude.
+def frameTimes(fps, dur, start=0.0):
+    first = int(np.ceil(start*fps - 1e-9))
+    return np.arange(first, int(np.ceil(fps*dur)))/fps
+
+class Trajectory(ABC):
+
+    dur = 0.0                               # Duration [s]
+    
+    # Attitudes at the time stamps t [s]
+    @abstractmethod
+    def at(self, t):
+        pass
+    
+    # Attitude of each frame, produced chunk frames at a time
+    #   chunk : None yields (t, Quat) per frame, otherwise (t array, QuatArray) blocks
+    def stream(self, fps, chunk=None, start=0.0, stop=None):
+        times = frameTimes(fps, self.dur if stop is None else stop, start)
+        block = chunk or 256
+        for k0 in range(0, len(times), block):
+            t = times[k0:k0+block]
+            q = self.at(t)
+            if chunk:
+                yield t, q
+            else:
+                yield from zip(t.tolist(), q.toQuats())
+    
+    # Full attitude table at fps, in the generateAttitude() layout
+    # (attitudes at k/fps, t column spread over [0, dur] as in generateAttitude)
+    def table(self, fps):
+        t    = frameTimes(fps, self.dur)
+        data = np.empty((len(t),5))
+        data[:,0:4] = self.at(t).q
+        data[:,4]   = np.linspace(0, self.dur, len(t))
+        return data
+
+class SpinTrajectory(Trajectory):
+
+    #%% CONSTRUCTOR %%#
+    # Arguments as in generateAttitudeData.generateAttitude (without fps)
+    def __init__(self, init_ang, init_axis, omega, rot_axis, dur):
+        self.init_ang  = init_ang
+        self.init_axis = np.asarray(init_axis, dtype=float)
+        self.omega     = omega
+        self.rot_axis  = np.asarray(rot_axis, dtype=float)
+        self.dur       = dur
+        self.q_init    = quat.QuatArray.fromAngleAxis(init_ang, self.init_axis)
+    
+    # From a generateAttitudeData.randomParameters() dictionary
+    @classmethod
+    def fromParameters(cls, params):
+        return cls(params["init_ang"], params["init_axis"], params["omega"],
+                   params["rot_axis"], params["dur"])
+    
+    def at(self, t):
+        theta = self.omega*np.asarray(t, dtype=float).reshape(-1)
+        return quat.QuatArray.fromAngleAxis(theta, self.rot_axis)*self.q_init
+
+class KeyTrajectory(Trajectory):
+
+    #%% CONSTRUCTOR %%#
+    #   times : (K,) increasing key times [s]
+    #   quats : (K,4) key attitudes (anything QuatArray accepts)
+    def __init__(self, times, quats, dur=None):
+        self.times = np.asarray(times, dtype=float).reshape(-1)
+        q = quat.QuatArray(quats).q.copy()
+        q /= np.sqrt(np.sum(q**2, axis=1))[:,None]
+        
+        # Consecutive keys on the same hemisphere so SLERP never takes the long way
+        flip = np.cumsum(np.sum(q[1:]*q[:-1], axis=1) < 0) % 2
+        q[1:][flip == 1] *= -1
+        self.keys = quat.QuatArray(q)
+        self.dur  = self.times[-1] if dur is None else dur
+    
+    # Keep every step-th row of an attitude table (plus the last one)
+    #   data : (num_frames,5) table with columns (q0, q1, q2, q3, t)
+    #   fps  : Frame rate of the table (keys at k/fps). None uses the t column
+    @classmethod
+    def fromTable(cls, data, step=1, fps=None, dur=None):
+        n    = len(data)
+        rows = np.unique(np.r_[np.arange(0, n, step), n-1])
+        t    = data[rows,4] if fps is None else rows/fps
+        return cls(t, data[rows,0:4], dur if dur is not None else data[-1,4])
+    
+    # From an attitude file (CSV or binary, see dataFormat)
+    @classmethod
+    def fromFile(cls, filepath, step=1):
+        kind, meta, data = df.load(filepath)
+        return cls.fromTable(np.asarray(data), step, meta["fps"], meta["dur"])
+    
+    def at(self, t):
+        t = np.asarray(t, dtype=float).reshape(-1)
+        if len(self.times) == 1:
+            return quat.QuatArray(np.repeat(self.keys.q, len(t), axis=0))
+        
+        # Bracketing keys (held constant outside the key range)
+        k = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times)-2)
+        t0 = self.times[k]
+        t1 = self.times[k+1]
+        s  = np.clip((t - t0)/(t1 - t0), 0, 1)
+        return self.keys[k].slerp(self.keys[k+1], s)
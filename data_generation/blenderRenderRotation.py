@@ -11,136 +11,223 @@ of the active object.
 INPUTS:
     
 fps             : Animation frames per second 
-Rotation Data   : CSV file w/ time-series satellite attitude (quaternions)
-                CSV FORMAT:
+Rotation Data   : CSV or binary file w/ time-series satellite attitude (quaternions)
+                CSV FORMAT (see dataFormat.py):
                 Header
-                (file_id,fps,dur,omega,sun_angle)
+                (file_id,fps,dur,num_frames,sun_angle)
+                Header
+                (omega,x_rot,y_rot,z_rot)
                 Header
                 (q0, q1, q2, q3, t)
                 - q0 is quaternion scalar component
                 - q1-q3 are quaternion vector components
                 - t in seconds
+Satellite Name  : Written to the photometry file
+Photometry Path : Directory for the photometry file
+
+Render Mode     : 'files'  - render the animation to image files only
+                  'stream' - reduce frames to photometry as soon as Blender saves
+                             them (see streamPhotometry.py) and delete them
+                             straight away, so only a few frames are ever on disk
+                  'memory' - render frame by frame and reduce the render result
+                             in memory without writing images at all
+                             (see renderPhotometry.py)
+                  'gbuffer'- render normal, albedo and depth passes once and
+                             save them next to the photometry as
+                             <sat_name>_<file_id>.gbuf.npz for relighting
+                             with any sun direction (see relight.py)
+
+HEADLESS USE:
+    blender -b satellite.blend --python blenderRenderRotation.py -- [options] [rotation files]
+    
+    --photpath DIR   Photometry output directory
+    --renderpath DIR Render output directory
+    --sat-name NAME  Satellite name written to the photometry file
+    --mode MODE      Render mode ('files', 'stream', 'memory' or 'gbuffer')
+    --serve          Read attitude file paths from stdin, one per line, and
+                     report each result on stdout as a line starting with
+                     PROTOCOL_TAG (see renderScheduler.py)
+    
+    Set MA540_METRICS=metrics.jsonl in the environment to record read,
+    keyframe and render timings (see instrument.py)
 """
 
 #%% IMPORTS %%#
 import bpy
-import csv
-import math
 from mathutils import Vector, Quaternion
-import time
 import numpy as np
 import os
+import sys
+import dataFormat as df
+import streamPhotometry as sp
+import renderPhotometry as rp
+import renderGBuffer as rg
+import bulkKeyframes as bk
+import instrument as im
+
+#%% USER INPUT %%#
+rotpath     = 'P:/MA540/Project/rotation_data.csv';                     # Attitude File
+renderpath  = "P:\\MA540\\Project\\data_generation\\render\\";           # Render Output Directory
+photpath    = "P:\\MA540\\Project\\data_generation\\photometry\\";       # Photometry Output Directory
+sat_name    = 'Satellite';                                              # Satellite Name
+render_mode = 'stream';                                                 # 'files', 'stream', 'memory' or 'gbuffer'
+image_ext   = '.tif';                                                   # Extension of rendered frames
+sparse_keys = False;                                                    # Sparse keyframes for constant-rate spins
+
+PROTOCOL_TAG = '@@MA540';                                               # Prefix of --serve result lines
 
-#%% INITIALIZATION %%#
-# Light Initialization #
-sun = bpy.data.objects['Sun'];
-sun.rotation_mode = 'YXZ';
-
-# Object Initialization #
-sat = bpy.data.objects['Satellite'];     # Select the Satellite
-sat.rotation_mode = 'QUATERNION'         # Set Object rotation type to Quaternion
-sat.animation_data_clear();              # Delete All Animation Data
-
-# Scene Initialization #
-scn = bpy.context.scene;
-scn.frame_start = 0;
-
-# Load file of Quaternion Data
-file = open('P:/MA540/Project/rotation_data.csv')
-type(file)
-csvreader = csv.reader(file)
-
-# File System Initialization #
-renderpath = "P:\\MA540\\Project\\data_generation\\render\\";
-bpy.context.scene.render.filepath = renderpath;
-
-#%% ASSIGN KEYFRAMES %%#
-sunset_angle = -10*np.pi/180;                   # Slight angle so it's "after sunset" NOTE: YXZ rotation order
-i            = 0                                # Keyframe Number
-j            = 0                                # Line Number
-init_flag    = False;                           # Initialization Flag
-prog_bar     = list("[                   ]");   # Progress bar for fun
-prog_count    = 1;                              # Increments every 5%
-print('****************KEYFRAME ASSIGNMENT****************');
-for row in csvreader:
-    # Skip Headers
-    if j == 0 or j == 2:
-        j+=1;
-        continue;
+#%% FUNCTIONS %%#
+
+# Render one attitude file and write its photometry
+# Returns the photometry (or G-buffer) file path (None in 'files' mode)
+def renderCase(rotpath, renderpath, photpath, sat_name, render_mode='stream', image_ext='.tif', sparse_keys=False):
+    #%% INITIALIZATION %%#
+    # Light Initialization #
+    sun = bpy.data.objects['Sun'];
+    sun.rotation_mode = 'YXZ';
+    
+    # Object Initialization #
+    sat = bpy.data.objects['Satellite'];     # Select the Satellite
+    sat.rotation_mode = 'QUATERNION'         # Set Object rotation type to Quaternion
+    
+    # Scene Initialization #
+    scn = bpy.context.scene;
+    scn.frame_start = 0;
+    
+    # Load file of Quaternion Data
+    with im.timer('read'):
+        kind, meta, rot_data = df.load(rotpath);
     
+    # File System Initialization #
+    scn.render.filepath = renderpath;
+    
+    #%% ASSIGN KEYFRAMES %%#
+    sunset_angle = -10*np.pi/180;                   # Slight angle so it's "after sunset" NOTE: YXZ rotation order
+    print('****************KEYFRAME ASSIGNMENT****************');
     # Initialize Variables
-    if j == 1:
-        file_id   = row[0];                                 # File ID for saving
-        fps       = float(row[1]);                          # Animation FPS
-        dur       = float(row[2]);                          # Animation Duration
-        sun_angle = float(row[4]);                          # Sun Direction (radians
-        sun.rotation_euler = (sun_angle,sunset_angle,0);    # Set Sun Direction
-        init_flag = True;
-        j+=1;
-        print("INITIALIZED FILE: " + file_id);
-        continue;
-    
-    # Confirm Initialization
-    if init_flag == False:
-        print("FAILED TO INITIALIZE...");
-        break;
-    
-    # Parse Rotation Data
-    q0 = row[0]
-    q1 = row[1]
-    q2 = row[2]
-    q3 = row[3]
-    t  = float(row[4])
-    quat = float(q0), float(q1), float(q2), float(q3)
-    
-    # Set Orientation and add keyframe
-    sat.rotation_quaternion = quat
-    time.sleep(0.1)
-    
-    # Insert Key Frames
-    i = math.floor(t*fps);                               # Calculate Frame Number
-    sat.keyframe_insert('rotation_quaternion', frame=i)  # Set Keyframe
-    
-    # Progress Bar
-    perc = math.floor(t/dur*100);
-    if perc > 5*prog_count:
-        prog_bar[prog_count]="=";
-        prog_count+=1;
-    
-    print(''.join(prog_bar) + str (perc) + "%");
-    j+=1;
-    
-file.close()
-print('KEYFRAME ASSIGNMENT COMPLETE')
-
-#%% RENDER ANIMATION %%#
-print('****************RENDERING ANIMATION****************');
-print('OUTPUT TARGET: ' + renderpath);
-
-# Remove All PNG Files from Target Folder
-print("Attempting to delete image files at output target...");
-files = os.listdir(renderpath);                     # List of files in render path
-if files:
-    kill_count = 0;
-    for item in files:
-        if item.endswith(".png"):                       # Sort by png files
-            os.remove(os.path.join(renderpath,item))    # Delete file
-            kill_count += 1;
-    print(str(kill_count) + " files deleted");
-else:
-    print("No Files to delete")
+    file_id   = meta["file_id"];                        # File ID for saving
+    fps       = meta["fps"];                            # Animation FPS
+    sun_angle = meta["sun_angle"];                      # Sun Direction (radians)
+    sun.rotation_euler = (sun_angle,sunset_angle,0);    # Set Sun Direction
+    print("INITIALIZED FILE: " + file_id);
+    
+    # Frame Numbers and Keyframe Spacing
+    frames = np.floor(rot_data[:,4]*fps);               # Calculate Frame Numbers
+    step   = bk.sparseStep(meta["omega"], fps) if sparse_keys else 1;
     
-scn.frame_end = i;                          # Set Number of frames to render
-print("Rendering " + str(i+1) + " frames...");
-bpy.ops.render.render(animation=True);      # Render with current render settings
+    # Insert All Key Frames
+    with im.timer('keyframe'):
+        i = bk.insertQuaternionKeyframes(bpy, sat, frames, rot_data[:,0:4], step);
+    print(str(len(frames)) + " attitudes assigned (keyframe step " + str(step) + ")");
+    print('KEYFRAME ASSIGNMENT COMPLETE')
+    
+    #%% RENDER ANIMATION %%#
+    print('****************RENDERING ANIMATION****************');
+    scn.frame_end    = i;                       # Set Number of frames to render
+    meta["sat_name"] = sat_name;
+    phot_file        = os.path.join(photpath, sat_name + "_" + file_id + ".csv");
+    
+    if render_mode == 'gbuffer':
+        # Render Geometry Passes #
+        gb_file = os.path.join(photpath, sat_name + "_" + file_id + ".gbuf.npz");
+        print("Rendering passes of " + str(i+1) + " frames...");
+        rg.renderGBuffer(bpy, scn, range(0, i+1), gb_file, meta, renderpath);
+        print("G-BUFFER SAVED: " + gb_file);
+        return gb_file
+    
+    if render_mode == 'memory':
+        # Render Into Memory #
+        print("Rendering " + str(i+1) + " frames into memory...");
+        phot_data = rp.renderPhotometry(bpy, scn, range(0, i+1), fps);
+        t         = np.linspace(0, (i+1)/fps, i+1);
+        df.writePhotometry(phot_file, meta, phot_data, t);
+        print("PHOTOMETRY SAVED: " + phot_file);
+        return phot_file
+    
+    print('OUTPUT TARGET: ' + renderpath);
+    
+    # Remove All PNG Files from Target Folder
+    print("Attempting to delete image files at output target...");
+    files = os.listdir(renderpath);                     # List of files in render path
+    if files:
+        kill_count = 0;
+        for item in files:
+            if item.endswith(".png"):                       # Sort by png files
+                os.remove(os.path.join(renderpath,item))    # Delete file
+                kill_count += 1;
+        print(str(kill_count) + " files deleted");
+    else:
+        print("No Files to delete")
+    
+    # Photometry Stream #
+    if render_mode == 'stream':
+        stream = sp.PhotometryStream(renderpath, phot_file, meta, i+1, fps, ext=image_ext);
+        bpy.app.handlers.render_write.append(stream.renderWrite);
+    
+    print("Rendering " + str(i+1) + " frames...");
+    try:
+        with im.timer('render'):
+            bpy.ops.render.render(animation=True);  # Render with current render settings
+        im.count('frames', i+1);
+    finally:
+        if render_mode == 'stream':
+            bpy.app.handlers.render_write.remove(stream.renderWrite);
+            stream.finish();
+    
+    if render_mode == 'stream':
+        print("PHOTOMETRY SAVED: " + phot_file);
+        return phot_file
+    return None
+
+# Report a result line for the scheduler
+def report(status, text):
+    sys.stdout.write(PROTOCOL_TAG + " " + status + " " + text + "\n");
+    sys.stdout.flush();
+
+# Render attitude files read from stdin until it closes
+def serve(renderpath, photpath, sat_name, render_mode, image_ext, sparse_keys):
+    report("READY", str(os.getpid()));
+    for line in sys.stdin:
+        case = line.strip();
+        if not case:
+            continue;
+        try:
+            phot_file = renderCase(case, renderpath, photpath, sat_name, render_mode, image_ext, sparse_keys);
+            report("DONE", str(phot_file));
+        except Exception as err:
+            report("FAIL", repr(err).replace("\n", " "));
+        im.flush();
+
+#%% ********************** MAIN ********************** %%#
+# Arguments after '--' are passed through by Blender
+args     = sys.argv[sys.argv.index('--')+1:] if '--' in sys.argv else [];
+do_serve = False;
+cases    = [];
+while args:
+    arg = args.pop(0);
+    if arg == '--serve':
+        do_serve = True;
+    elif arg == '--photpath':
+        photpath = args.pop(0);
+    elif arg == '--renderpath':
+        renderpath = args.pop(0);
+    elif arg == '--sat-name':
+        sat_name = args.pop(0);
+    elif arg == '--mode':
+        render_mode = args.pop(0);
+    else:
+        cases.append(arg);
+
+if do_serve:
+    serve(renderpath, photpath, sat_name, render_mode, image_ext, sparse_keys);
+else:
+    for case in (cases or [rotpath]):
+        renderCase(case, renderpath, photpath, sat_name, render_mode, image_ext, sparse_keys);
 
 '''
 
 TODO:
     - Automatically Set Light Direction (Collimated light source)
-    - Automate Rendering - (Render animation with current settings and set output directory for images)
     - NOTE: camera position can be changed if desired. Might be mroe convenient to put it on the x-axis or something
-    
-    - Call script to generate photometry then delete images
 
 '''
\ No newline at end of file
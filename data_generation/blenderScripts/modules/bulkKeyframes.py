@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      bulkKeyframes
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Assigns a whole attitude time series to an object's rotation_quaternion in
+one go. The four F-curves are created once, and all keyframe points are
+filled with keyframe_points.add + foreach_set, so there is no per-row
+keyframe_insert call.
+
+Blender interpolates the four quaternion components independently and
+normalizes the result (nlerp). For constant-rate spins, sparse keyframes
+(every step-th frame) with LINEAR interpolation therefore follow the spin
+closely. sparseStep() picks the largest step that keeps the worst-case
+attitude error below a tolerance.
+
+The Blender module is passed in as an argument so the functions can be driven
+by a stand-in outside Blender.
+
+INPUTS:
+
+bpy      : The Blender python module (or a stand-in)
+obj      : Object to animate
+frames   : (N,) frame numbers
+quats    : (N,4) quaternions (q0, q1, q2, q3)
+step     : Keep every step-th keyframe (the last keyframe is always kept)
+
+"""
+
+#%% IMPORTS %%#
+import numpy as np
+
+#%% FUNCTIONS %%#
+
+# Flip signs so consecutive quaternions lie in the same hemisphere
+# (q and -q are the same attitude, but interpolating between them is not)
+def makeContinuous(quats):
+    quats = np.array(quats, dtype=float)
+    dots  = np.sum(quats[1:]*quats[:-1], axis=1)
+    signs = np.cumprod(np.where(dots < 0, -1.0, 1.0))
+    quats[1:] *= signs[:, None]
+    return quats
+
+# Worst-case attitude error [rad] of nlerp between keys that are angle [rad] apart
+def nlerpError(angle, samples=64):
+    u     = np.linspace(0, 1, samples)
+    half  = angle/2
+    interp = np.arctan2(u*np.sin(half), (1-u) + u*np.cos(half))
+    return 2*np.max(np.abs(interp - u*half))
+
+# Largest keyframe step for a constant-rate spin with worst-case error below tol
+#   omega : Angular velocity [rad/s]
+#   fps   : Frames per second
+#   tol   : Allowed attitude error [rad]
+def sparseStep(omega, fps, tol=np.radians(0.1), max_step=None):
+    step = 1
+    while (max_step is None or step < max_step) and nlerpError(abs(omega)*(step+1)/fps) <= tol:
+        step += 1
+    return step
+
+# Replace the rotation_quaternion animation of obj with the given keyframes
+#   interpolation : Interpolation of sparse keyframes (step > 1). Dense keyframes
+#                   keep Blender's default, as with keyframe_insert.
+# Returns the frame number of the last keyframe
+def insertQuaternionKeyframes(bpy, obj, frames, quats, step=1, interpolation='LINEAR'):
+    frames = np.asarray(frames, dtype=float)
+    quats  = makeContinuous(quats)
+    
+    # Sparse keyframes: every step-th row plus the last one
+    keep = np.arange(0, len(frames), step)
+    if keep[-1] != len(frames)-1:
+        keep = np.append(keep, len(frames)-1)
+    frames = frames[keep]
+    quats  = quats[keep]
+    
+    # Fresh action with one F-curve per quaternion component. The previous action
+    # is removed once nothing else uses it, so long-running workers do not
+    # collect an orphaned action per case.
+    obj.rotation_mode = 'QUATERNION'
+    old = obj.animation_data.action if obj.animation_data is not None else None
+    obj.animation_data_clear()
+    if old is not None and old.users == 0:
+        bpy.data.actions.remove(old)
+    anim   = obj.animation_data_create()
+    action = bpy.data.actions.new(obj.name + "Action")
+    anim.action = action
+    
+    co     = np.empty(2*len(frames), dtype=np.float32)
+    co[0::2] = frames
+    for c in range(4):
+        fcurve = action.fcurves.new('rotation_quaternion', index=c, action_group='Object Transforms')
+        fcurve.keyframe_points.add(len(frames))
+        co[1::2] = quats[:, c]
+        fcurve.keyframe_points.foreach_set('co', co)
+        fcurve.update()
+        if step > 1:
+            for point in fcurve.keyframe_points:
+                point.interpolation = interpolation
+    
+    return int(frames[-1])
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      exportFacetModel
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Exports the satellite mesh from a Blender scene as a facet model for
+lightCurveSim.py. Run it once per satellite, e.g. from the Blender python
+console:
+
+    import bpy, exportFacetModel
+    exportFacetModel.exportFacetModel(bpy, 'Satellite', 'P:/MA540/Project/models/2U.npz', '2U-NOWINGS-V1')
+
+Each polygon becomes a facet with its local-frame normal and area. Diffuse and
+specular albedo are taken from the polygon's material (Principled BSDF base
+color, specular and roughness) when available. The direction from the object
+to the scene camera is stored as obs_dir.
+
+"""
+
+#%% IMPORTS %%#
+import numpy as np
+
+#%% FUNCTIONS %%#
+
+# Read a Principled BSDF input value, or default when there is none
+def _bsdfValue(material, name, default):
+    if material is None or not material.use_nodes:
+        return default
+    node = next((n for n in material.node_tree.nodes if n.type == 'BSDF_PRINCIPLED'), None)
+    if node is None or name not in node.inputs:
+        return default
+    value = node.inputs[name].default_value
+    try:
+        return float(np.mean(list(value)[0:3]))     # Colors: mean of RGB
+    except TypeError:
+        return float(value)
+
+# Write the facet model of object obj_name to filepath (.npz)
+#   sat_name : Satellite name the photometry is labelled with (e.g. '2U-NOWINGS-V1')
+def exportFacetModel(bpy, obj_name, filepath, sat_name):
+    if not sat_name:
+        raise NameError('exportFacetModel needs a satellite name (it labels the photometry files)')
+    obj  = bpy.data.objects[obj_name]
+    mesh = obj.data
+    F    = len(mesh.polygons)
+    
+    normals = np.empty(F*3, dtype=np.float64)
+    areas   = np.empty(F, dtype=np.float64)
+    mat_idx = np.empty(F, dtype=np.int64)
+    mesh.polygons.foreach_get('normal', normals)
+    mesh.polygons.foreach_get('area', areas)
+    mesh.polygons.foreach_get('material_index', mat_idx)
+    
+    # Scale areas by the object's scale (normals are unaffected by uniform scale)
+    areas *= abs(np.prod(list(obj.scale)))**(2/3)
+    
+    # Material parameters per facet
+    slots = [slot.material for slot in obj.material_slots] or [None]
+    kd    = np.array([_bsdfValue(m, 'Base Color', 0.8) for m in slots])[np.clip(mat_idx, 0, len(slots)-1)]
+    ks    = np.array([_bsdfValue(m, 'Specular IOR Level', _bsdfValue(m, 'Specular', 0.5)) for m in slots])[np.clip(mat_idx, 0, len(slots)-1)]
+    rough = np.array([_bsdfValue(m, 'Roughness', 0.5) for m in slots])[np.clip(mat_idx, 0, len(slots)-1)]
+    
+    # Direction from the satellite to the camera
+    camera  = bpy.context.scene.camera
+    obs_dir = np.array(camera.matrix_world.translation) - np.array(obj.matrix_world.translation)
+    
+    np.savez(filepath, normals=normals.reshape(F,3), areas=areas, kd=kd, ks=ks,
+             shininess=np.full(F, 10.0), roughness=rough, shadow=np.ones(F),
+             obs_dir=obs_dir, name=sat_name)
+    return F
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      gbuffer
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Compact storage for geometry (G-buffer) passes of a rendered attitude
+sequence: world-space normal, albedo and depth of every pixel covered by the
+satellite, frame by frame. The passes do not depend on the sun, so one render
+can be relit for any number of sun directions afterwards (see relight.py).
+
+Only foreground pixels are kept. Normals are quantized to int8 (error below
+0.5 degrees), albedo to uint8, and depth is stored as float16. Everything is
+saved in one compressed .npz per sequence:
+
+    counts  : (num_frames,) foreground pixels per frame
+    index   : (P,) flat pixel index within the frame (row-major, top row first)
+    normal  : (P,3) int8 normal * 127
+    albedo  : (P,) uint8 albedo * 255
+    depth   : (P,) float16 depth
+    width, height, fps, meta fields (file_id, dur, omega, rot_axis, sat_name)
+
+"""
+
+#%% IMPORTS %%#
+import numpy as np
+
+#%% CONSTANTS %%#
+FAR_DEPTH = 1e9             # Depth at or beyond this is background
+
+#%% FUNCTIONS %%#
+
+class GBufferWriter:
+    
+    #%% CONSTRUCTOR %%#
+    def __init__(self, width, height, meta):
+        self.width  = width
+        self.height = height
+        self.meta   = meta
+        self.counts = []
+        self.parts  = []
+    
+    # Add one frame from full-size passes
+    #   normal : (height,width,3) world-space normals
+    #   albedo : (height,width) albedo
+    #   depth  : (height,width) depth
+    def addFrame(self, normal, albedo, depth):
+        depth = np.asarray(depth).reshape(-1)
+        index = np.flatnonzero(np.isfinite(depth) & (depth < FAR_DEPTH))
+        
+        n = np.asarray(normal).reshape(-1,3)[index]
+        n = n/np.maximum(np.linalg.norm(n, axis=1, keepdims=True), 1e-12)
+        
+        self.counts.append(len(index))
+        self.parts.append((index.astype(np.uint32),
+                           np.round(n*127).astype(np.int8),
+                           np.round(np.clip(np.asarray(albedo).reshape(-1)[index], 0, 1)*255).astype(np.uint8),
+                           depth[index].astype(np.float16)))
+    
+    # Write everything added so far
+    def save(self, filepath):
+        index, normal, albedo, depth = (np.concatenate([p[k] for p in self.parts]) if self.parts else None
+                                        for k in range(4))
+        meta = self.meta
+        np.savez_compressed(filepath, counts=np.array(self.counts, dtype=np.int64),
+                            index=index, normal=normal, albedo=albedo, depth=depth,
+                            width=self.width, height=self.height,
+                            file_id=str(meta["file_id"]), fps=meta["fps"], dur=meta["dur"],
+                            omega=meta["omega"], rot_axis=np.asarray(meta["rot_axis"], dtype=float),
+                            sat_name=meta.get("sat_name", ''))
+
+# Load a G-buffer file
+# Returns a dictionary with the stored arrays, normals as float32 unit vectors
+# and albedo as float32 in [0,1]
+def loadGBuffer(filepath):
+    with np.load(filepath) as data:
+        gb = {key: data[key] for key in data.files}
+    for key in ("file_id", "sat_name"):
+        gb[key] = str(gb[key])
+    for key in ("width", "height"):
+        gb[key] = int(gb[key])
+    for key in ("fps", "dur", "omega"):
+        gb[key] = float(gb[key])
+    
+    normal = gb["normal"].astype(np.float32)
+    gb["normal"] = normal/np.maximum(np.linalg.norm(normal, axis=1, keepdims=True), 1e-6)
+    gb["albedo"] = gb["albedo"].astype(np.float32)/255
+    return gb
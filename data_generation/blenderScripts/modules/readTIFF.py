@@ -3,11 +3,29 @@
 TITLE:      readTIFF
 DATE:       02-25-2022
 AUTHOR:     MA540 Team 4
-    
+
 DESCRIPTION:
 Reads pixel data from TIFF file
 
-Assumes single IFD. Requires 16-Bit greyscale and NO compression.
+Requires 16-Bit greyscale and NO compression. Images may be stored in one or
+more strips or in tiles, and a file may hold several pages (IFDs), e.g. a
+whole render sequence with one frame per page. The first page is selected on
+construction; use setPage() or iterPages() to move through the others.
+
+The file is memory-mapped and the pixel block is viewed through np.frombuffer
+with the file's byte order, so no per-pixel decoding is done. im_raw is a
+(height, width) uint16 view of the pixels (zero-copy unless the strips are
+scattered or the image is tiled). im_pixels keeps the original
+[width, height] float layout unless row_major=True is passed, in which case it
+is im_raw itself.
+
+iterStrips() yields the current page one strip (or row of tiles) at a time so
+a frame can be reduced without holding the whole image in memory.
+
+With lazy=True construction only parses the header and IFDs; pixels are
+decoded on first access to im_raw or im_pixels. read_region(x0, y0, w, h)
+decodes only the strips or tiles covering a window, so dimensions and
+sub-windows can be read without paying for a full-frame decode.
 
 Description of TIFF Format:
 https://docs.fileformat.com/image/tiff/
@@ -19,13 +37,32 @@ https://www.loc.gov/preservation/digital/formats/content/tiff_tags.shtml
 
 import numpy as np
 
+# IFD Entry Types: type -> (numpy type code, bytes per value)
+TAG_TYPES = {1:  ('u1', 1),     # BYTE
+             2:  ('u1', 1),     # ASCII
+             3:  ('u2', 2),     # SHORT
+             4:  ('u4', 4),     # LONG
+             5:  ('u4', 8),     # RATIONAL (two LONGs)
+             6:  ('i1', 1),     # SBYTE
+             7:  ('u1', 1),     # UNDEFINED
+             8:  ('i2', 2),     # SSHORT
+             9:  ('i4', 4),     # SLONG
+             10: ('i4', 8),     # SRATIONAL (two SLONGs)
+             11: ('f4', 4),     # FLOAT
+             12: ('f8', 8)}     # DOUBLE
+
 class TIFFreader:
-    
+
     #%% CLASS VARIABLES %%#
     filepath     = '';      # Directory and File Name
     tiff_data    = None;    # Array of bytes from file
     lil_end      = None;    # TIFF Bytes in Little Endian Format?
     
+    # Pages
+    pages       = None;     # List of IFDs (dict of tag -> value array)
+    num_pages   = 0;        # Number of pages (IFDs) in the file
+    page        = -1;       # Currently selected page
+    
     # IFD Entry Values
     im_width    = -1;       # Image Width
     im_height   = -1;       # Image Height
@@ -33,61 +70,219 @@ class TIFFreader:
     im_comp     = -1;       # Compression Type
     im_color    = -1;       # Image Color Space
     im_fill     = -1;       # Fill Order
-    im_stripOff = -1;       # Strip Offset
+    im_stripOff = None;     # Strip Offsets (array)
     im_spp      = -1;       # Samples Per Pixel
     im_rps      = -1;       # Rows Per Strip
-    im_sbc      = -1;       # Strip Byte Counts
+    im_sbc      = None;     # Strip Byte Counts (array)
     im_xRes     = -1;       # X Resolution
     im_yRes     = -1;       # Y Resolution
     im_pCon     = -1;       # Planar Configuration
     im_unit     = -1;       # Resolution Unit
+    im_tileW    = -1;       # Tile Width (tiled images only)
+    im_tileH    = -1;       # Tile Length (tiled images only)
+    im_tileOff  = None;     # Tile Offsets (array)
+    im_tbc      = None;     # Tile Byte Counts (array)
     
     # Pixel Data
-    im_data     = None;     # Raw Bytes
-    im_pixels   = None;     # Pixel Data
+    im_data     = None;     # Raw Bytes (contiguous strip images only)
+    _im_raw     = None;     # Pixel Data, (height, width) uint16 (see im_raw)
+    _im_pixels  = None;     # Pixel Data (see im_pixels)
+    
+    # Options
+    row_major   = False;    # im_pixels as (height, width) uint16 view
+    lazy        = False;    # Decode pixels on first access
     
     #%% CONSTRUCTOR %%#
-    def __init__(self, filepath):
+    # mmap      : Memory-map the file instead of reading it into memory
+    # row_major : Return im_pixels as the (height, width) uint16 array
+    #             instead of a [width, height] float array
+    # lazy      : Only parse the header and IFDs, decode pixels on first access
+    def __init__(self, filepath, mmap=True, row_major=False, lazy=False):
         #%% Load File %%#
-        self.filepath = filepath;
-        # Open File
-        file = open(filepath,"rb");
-        # Load File
-        self.tiff_data = file.read();
-        # Close File
-        file.close();
+        self.filepath  = filepath;
+        self.row_major = row_major;
+        self.lazy      = lazy;
+        if mmap:
+            self.tiff_data = np.memmap(filepath, dtype=np.uint8, mode='r');
+        else:
+            # Open File
+            file = open(filepath,"rb");
+            # Load File
+            self.tiff_data = file.read();
+            # Close File
+            file.close();
         
         # Read the TIFF Data
         self.readTIFF();
-        
+    
+    # Context Manager
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    # Release the file mapping (views of the file become invalid)
+    def close(self):
+        self.tiff_data = None;
+        self.im_data   = None;
+        self._im_raw   = None;
+        if self.row_major:
+            self._im_pixels = None;
+    
+    # Pixel Data, (height, width) uint16
+    @property
+    def im_raw(self):
+        if self._im_raw is None and self.tiff_data is not None:
+            self.__decodePage();
+        return self._im_raw
+    
+    # Pixel Data, [width, height] float or (height, width) uint16 if row_major
+    @property
+    def im_pixels(self):
+        if self._im_pixels is None and self.tiff_data is not None:
+            self.__decodePage();
+        return self._im_pixels
+    
     #%% Private Functions %%#
     
     # Return value of an array of bytes
     # arranged with MSB first (Big Endian)
     def __readBE(self,byte_array):
-        byte_sum    = 0;
-        place_value = 1;
-        for byte in reversed(byte_array):   
-            byte_sum += byte*place_value;
-            place_value *= 0x100;
-        return byte_sum
+        return int.from_bytes(bytes(byte_array), 'big')
     
     # Return value of an array of bytes
     # arranged with LSB first (Little Endian)
     def __readLE(self,byte_array):
-        byte_sum    = 0;
-        place_value = 1;
-        for byte in byte_array:   
-            byte_sum += byte*place_value;
-            place_value *= 0x100;
-        return byte_sum
+        return int.from_bytes(bytes(byte_array), 'little')
+    
+    # Read an unsigned integer at a byte offset in the file
+    def __readUInt(self,offset,num_bytes):
+        byte_array = self.tiff_data[offset:(offset+num_bytes)];
+        if self.lil_end:
+            return self.__readLE(byte_array)
+        return self.__readBE(byte_array)
+    
+    # Numpy dtype with the file's byte order
+    def __dtype(self,code):
+        return np.dtype(('<' if self.lil_end else '>') + code)
+    
+    # Read one Image File Directory
+    # Format: 2-bytes number of entries, followed by sequence of 12 byte entries,
+    # followed by 4-byte offset to next IFD (or 0 if none)
+    # Returns (dict of tag -> value array, offset of next IFD)
+    def __readIFD(self,IFD_address):
+        num_entries = self.__readUInt(IFD_address,2);
+        IFD_start   = IFD_address+2;
+        IFD = bytes(self.tiff_data[(IFD_start):(IFD_start+12*num_entries)]);
+        if len(IFD) != 12*num_entries:
+            raise NameError('Error reading IFD - File is truncated');
+        
+        entries = {};
+        for i in range(num_entries):
+            # Extract Entry
+            entry = IFD[i*12:i*12+12];
+            
+            # Extract Entry Components
+            if self.lil_end:
+                e_tag   = self.__readLE(entry[0:2]);
+                e_type  = self.__readLE(entry[2:4]);
+                e_count = self.__readLE(entry[4:8]);
+            else:
+                e_tag   = self.__readBE(entry[0:2]);
+                e_type  = self.__readBE(entry[2:4]);
+                e_count = self.__readBE(entry[4:8]);
+            
+            if e_type not in TAG_TYPES:
+                continue;
+            code, size = TAG_TYPES[e_type];
+            
+            # Values fit in the entry itself, otherwise the entry holds an offset
+            if e_count*size <= 4:
+                raw = entry[8:8+e_count*size];
+            else:
+                offset = self.__readUInt(IFD_start+i*12+8,4);
+                raw    = bytes(self.tiff_data[offset:(offset+e_count*size)]);
+            
+            e_val = np.frombuffer(raw, dtype=self.__dtype(code));
+            if e_type in (5, 10):
+                e_val = e_val[0::2]/e_val[1::2];
+            entries[e_tag] = e_val;
+            
+            # Print Each Entry
+            #print(hex(e_tag) + " : " + str(e_val) + " : " + hex(e_count));
+        
+        next_address = self.__readUInt(IFD_start+12*num_entries,4);
+        return entries, next_address
+    
+    # Number of rows stored in strip k
+    def __stripRows(self,k):
+        return min(self.im_rps, self.im_height - k*self.im_rps)
+    
+    # Pixel array of strip k, (rows, width) view into the file
+    def __readStrip(self,k):
+        rows  = self.__stripRows(k);
+        count = rows*self.im_width;
+        if self.im_sbc[k] < count*2:
+            raise NameError('Something went wrong parsing data...');
+        return np.frombuffer(self.tiff_data, dtype=self.__dtype('u2'), count=count,
+                             offset=int(self.im_stripOff[k])).reshape(rows, self.im_width)
+    
+    # Pixel array of one row of tiles starting at tile row r, cropped to the image
+    def __readTileRow(self,r):
+        tiles_across = -(-self.im_width // self.im_tileW);
+        row0  = r*self.im_tileH;
+        rows  = min(self.im_tileH, self.im_height - row0);
+        count = self.im_tileW*self.im_tileH;
+        band  = np.empty((rows, self.im_width), dtype=self.__dtype('u2'));
+        for c in range(tiles_across):
+            k = r*tiles_across + c;
+            if self.im_tbc[k] < count*2:
+                raise NameError('Something went wrong parsing data...');
+            tile = np.frombuffer(self.tiff_data, dtype=self.__dtype('u2'), count=count,
+                                 offset=int(self.im_tileOff[k])).reshape(self.im_tileH, self.im_tileW);
+            col0 = c*self.im_tileW;
+            cols = min(self.im_tileW, self.im_width - col0);
+            band[:, col0:(col0+cols)] = tile[:rows, :cols];
+        return band
+    
+    # Decode the pixels of the selected page
+    def __decodePage(self):
+        self.im_data = None;
+        if self.im_tileOff is not None:
+            tiles_down  = -(-self.im_height // self.im_tileH);
+            self._im_raw = np.vstack([self.__readTileRow(r) for r in range(tiles_down)]);
+        else:
+            # Strips stored back to back can be viewed as one block
+            num_strips = len(self.im_stripOff);
+            contiguous = np.all(self.im_stripOff[1:] == self.im_stripOff[:-1] + self.im_sbc[:-1]);
+            if contiguous:
+                start = int(self.im_stripOff[0]);
+                self.im_data = self.tiff_data[start:(start+int(np.sum(self.im_sbc)))];
+                
+                # Sanity Check
+                bpp = int(self.im_depth / 8);                       # Bytes Per Pixel
+                expected_bytes = self.im_height*self.im_width*bpp;  # Expected Bytes of image data
+                if len(self.im_data) < expected_bytes:
+                    raise NameError('Something went wrong parsing data...');
+                
+                # View Pixel Data (no copy)
+                self._im_raw = np.frombuffer(self.im_data, dtype=self.__dtype('u2'),
+                                            count=self.im_height*self.im_width).reshape(self.im_height, self.im_width);
+            else:
+                self._im_raw = np.vstack([self.__readStrip(k) for k in range(num_strips)]);
+        
+        if self.row_major:
+            self._im_pixels = self._im_raw;
+        else:
+            self._im_pixels = self._im_raw.T.astype(float);
     
     
     #%% Public Functions %%#
     def readTIFF(self):
         #%% Read Header %%#
         # First 8 Bytes
-        header = self.tiff_data[0:8]
+        header = bytes(self.tiff_data[0:8])
         
         # Byte Order (II = LSB First - Little Endian, MM = MSB First - Big Endian)
         if header[0] == header[1]:
@@ -103,83 +298,66 @@ class TIFFreader:
         # Check to make sure it's a TIFF
         # Arrange bytes
         if self.lil_end:
-            file_check = self.__readLE(header[2:4]); 
+            file_check = self.__readLE(header[2:4]);
         else:
             file_check = self.__readBE(header[2:4]);
         
         if file_check != 42:
             raise NameError('Error reading header - File check value incorrect');
-           
-        # Address of First IFD (Image File Directory)    
+        
+        # Address of First IFD (Image File Directory)
         if self.lil_end:
-            IFD_address = self.__readLE(header[4:8]);    
+            IFD_address = self.__readLE(header[4:8]);
         else:
-            IFD_address = self.__readBE(header[4:8]); 
-            
-        #%% Read Image File Directory %%#
+            IFD_address = self.__readBE(header[4:8]);
+        
+        #%% Read Image File Directories %%#
         # IFD Contains info about image and pointers to image data
-        # Format: 2-bytes number of entries, followed by sequence of 12 byte entries,
-        # followed by 4-byte offset to next IFD (or 0 if note)
+        # Each IFD ends with the offset of the next one (one IFD per page)
+        self.pages = [];
+        visited    = set();
+        while IFD_address != 0 and IFD_address not in visited:
+            visited.add(IFD_address);
+            entries, IFD_address = self.__readIFD(IFD_address);
+            self.pages.append(entries);
+        self.num_pages = len(self.pages);
         
-        if self.lil_end:
-            num_entries = self.__readLE(self.tiff_data[IFD_address:(IFD_address+1)]); 
-        else:
-            num_entries = self.__readBE(self.tiff_data[IFD_address:(IFD_address+1)]); 
+        if self.num_pages == 0:
+            raise NameError('Error reading header - No image file directory');
+        
+        self.setPage(0);
     
-        IFD_start = IFD_address+2;
-        IFD = self.tiff_data[(IFD_start):(IFD_start+12*num_entries)];
+    # Select page k and decode its pixels
+    def setPage(self, k):
+        IFD = self.pages[k];
+        self.page = k;
+        
+        # Single valued entries (with TIFF defaults where the tag is optional)
+        def value(tag, default=-1):
+            return IFD[tag][0].item() if tag in IFD else default
+        
+        # Decode Entries
+        self.im_width  = int(value(0x0100));            # Image Width
+        self.im_height = int(value(0x0101));            # Image Height
+        self.im_depth  = value(0x0102, 1);              # Bit Depth
+        self.im_comp   = value(0x0103, 1);              # Compression Type
+        self.im_color  = value(0x0106);                 # Image Color Space
+        self.im_fill   = value(0x010A, 1);              # Fill Order
+        self.im_spp    = value(0x0115, 1);              # Samples Per Pixel
+        self.im_rps    = int(min(value(0x0116, self.im_height), self.im_height));   # Rows Per Strip
+        self.im_xRes   = value(0x011A);                 # X Resolution
+        self.im_yRes   = value(0x011B);                 # Y Resolution
+        self.im_pCon   = value(0x011C, 1);              # Planar Configuration
+        self.im_unit   = value(0x0128, 2);              # Resolution Unit
+        self.im_tileW  = int(value(0x0142));            # Tile Width
+        self.im_tileH  = int(value(0x0143));            # Tile Length
+        
+        # Strip / Tile Offsets and Byte Counts
+        self.im_stripOff = IFD[0x0111].astype(np.int64) if 0x0111 in IFD else None;
+        self.im_sbc      = IFD[0x0117].astype(np.int64) if 0x0117 in IFD else None;
+        self.im_tileOff  = IFD[0x0144].astype(np.int64) if 0x0144 in IFD else None;
+        self.im_tbc      = IFD[0x0145].astype(np.int64) if 0x0145 in IFD else None;
         
-        # Iterate Through IFD Entries
-        for i in range(num_entries):
-            # Extract Entry
-            entry = IFD[i*12:i*12+12];
-            
-            # Extract Entry Components       
-            if self.lil_end:
-                e_tag   = self.__readLE(entry[0:2]);
-                e_type  = self.__readLE(entry[2:4]);
-                e_count = self.__readLE(entry[4:8]);
-                e_val   = self.__readLE(entry[8:12]);
-            else:
-                e_tag   = self.__readBE(entry[0:2]);
-                e_type  = self.__readBE(entry[2:4]);
-                e_count = self.__readBE(entry[4:8]);
-                e_val   = self.__readBE(entry[8:12]);
-            
-            # Decode Entries
-            if e_tag == 0x0100:         # Image Width
-                self.im_width = e_val;       
-            if e_tag == 0x0101:         # Image Height
-                self.im_height = e_val;       
-            if e_tag == 0x0102:         # Bit Depth
-                self.im_depth = e_val;       
-            if e_tag == 0x0103:         # Compression Type
-                self.im_comp = e_val;
-            if e_tag == 0x0106:         # Image Color Space
-                self.im_color = e_val;
-            if e_tag == 0x010A:         # Fill Order
-                self.im_fill = e_val; 
-            if e_tag == 0x0111:         # Strip Offset
-                self.im_stripOff = e_val;
-            if e_tag == 0x0115:         # Samples Per Pixel
-                self.im_spp = e_val;
-            if e_tag == 0x0116:         # Rows Per Strip
-                self.im_rps = e_val;
-            if e_tag == 0x0117:         # Strip Byte Counts
-                self.im_sbc = e_val;
-            if e_tag == 0x011A:         # X Resolution
-                self.im_xRes = e_val;
-            if e_tag == 0x011B:         # Y Resolution
-                self.im_yRes = e_val;
-            if e_tag == 0x011C:         # Planar Configuration
-                self.im_pCon = e_val;
-            if e_tag == 0x0128:         # Resolution Unit
-                self.im_unit = e_val;
-            
-            # Print Each Entry    
-            #print(hex(e_tag) + " : " + str(e_val) + " : " + hex(e_count)); 
-                
-             
         #  Check Entries
         if self.im_depth != 16:
             raise NameError('Not 16-Bit');
@@ -189,39 +367,84 @@ class TIFFreader:
             raise NameError('Image is not greyscale');
         if self.im_fill != 1:
             raise NameError('Encountered an unexpected fill order');
-
-        #%% Read Image Data %%#
-        # Extract Image Data
-        self.im_data = self.tiff_data[(self.im_stripOff):(self.im_stripOff+self.im_sbc)];
-        
-        # Sanity Check
-        bpp = int(self.im_depth / 8);                       # Bytes Per Pixel
-        expected_bytes = self.im_height*self.im_width*bpp;  # Expected Bytes of image data
-        if expected_bytes != self.im_sbc:
-            raise NameError('Something went wrong parsing data...');
-        
-        
-        self.im_pixels = np.zeros([self.im_width,self.im_height]);
-        
-        # Iterate and Save Pixel Data
-        for i in range(self.im_height):
-            for j in range(self.im_width):
-                # Start of Pixel Byte Array in Data
-                k = (i*self.im_width + j)*bpp;
-                
-                # Evaluate Pixel Value
-                if self.lil_end:
-                    pixel = self.__readLE(self.im_data[k:(k+bpp)]);
-                else:
-                    pixel = self.__readBE(self.im_data[k:(k+bpp)]);  
-                
-                self.im_pixels[j,i] = pixel;
+        if self.im_spp != 1:
+            raise NameError('Image must have one sample per pixel');
+        if self.im_tileOff is None and (self.im_stripOff is None or self.im_sbc is None):
+            raise NameError('Image has no strip or tile offsets');
+        if self.im_tileOff is not None and (self.im_tbc is None or self.im_tileW <= 0 or self.im_tileH <= 0):
+            raise NameError('Image has incomplete tile entries');
         
+        #%% Read Image Data %%#
+        self.im_data    = None;
+        self._im_raw    = None;
+        self._im_pixels = None;
+        if not self.lazy:
+            self.__decodePage();
+    
+    # Iterate through all pages, yielding the pixels of each in turn
+    def iterPages(self):
+        for k in range(self.num_pages):
+            self.setPage(k);
+            yield self.im_pixels
+    
+    # Iterate through the selected page one strip (or row of tiles) at a time
+    # Yields (first row, (rows, width) uint16 array)
+    def iterStrips(self):
+        if self.im_tileOff is not None:
+            tiles_down = -(-self.im_height // self.im_tileH);
+            for r in range(tiles_down):
+                yield r*self.im_tileH, self.__readTileRow(r)
+        else:
+            for k in range(len(self.im_stripOff)):
+                yield k*self.im_rps, self.__readStrip(k)
+    
+    # Read a window of the selected page, decoding only the strips or tiles it covers
+    # x0, y0 : Column and row of the top-left pixel
+    # w, h   : Width and height of the window
+    # Returns a [w, h] float array, or (h, w) uint16 if row_major
+    def read_region(self, x0, y0, w, h):
+        if x0 < 0 or y0 < 0 or w <= 0 or h <= 0 or x0+w > self.im_width or y0+h > self.im_height:
+            raise NameError('Region is outside the image');
         
+        if self._im_raw is not None:
+            region = self._im_raw[y0:(y0+h), x0:(x0+w)];
+        elif self.im_tileOff is not None:
+            tiles_across = -(-self.im_width // self.im_tileW);
+            count  = self.im_tileW*self.im_tileH;
+            region = np.empty((h, w), dtype=self.__dtype('u2'));
+            for r in range(y0 // self.im_tileH, (y0+h-1) // self.im_tileH + 1):
+                for c in range(x0 // self.im_tileW, (x0+w-1) // self.im_tileW + 1):
+                    k = r*tiles_across + c;
+                    if self.im_tbc[k] < count*2:
+                        raise NameError('Something went wrong parsing data...');
+                    tile = np.frombuffer(self.tiff_data, dtype=self.__dtype('u2'), count=count,
+                                         offset=int(self.im_tileOff[k])).reshape(self.im_tileH, self.im_tileW);
+                    
+                    # Overlap of this tile with the window (image coordinates)
+                    r0 = max(y0, r*self.im_tileH);
+                    r1 = min(y0+h, (r+1)*self.im_tileH);
+                    c0 = max(x0, c*self.im_tileW);
+                    c1 = min(x0+w, (c+1)*self.im_tileW);
+                    region[(r0-y0):(r1-y0), (c0-x0):(c1-x0)] = tile[(r0-r*self.im_tileH):(r1-r*self.im_tileH),
+                                                                    (c0-c*self.im_tileW):(c1-c*self.im_tileW)];
+        else:
+            strips = [];
+            for k in range(y0 // self.im_rps, (y0+h-1) // self.im_rps + 1):
+                row0 = k*self.im_rps;
+                r0   = max(y0, row0) - row0;
+                r1   = min(y0+h, row0 + self.__stripRows(k)) - row0;
+                strips.append(self.__readStrip(k)[r0:r1, x0:(x0+w)]);
+            region = strips[0] if len(strips) == 1 else np.vstack(strips);
         
+        if self.row_major:
+            return region
+        return region.T.astype(float)
+
+
+
 # DISPLAY IMAGE
 # from matplotlib import pyplot as plt
 # plt.imshow(np.transpose(a),cmap='gray',vmin=0,vmax=2**16)
-        
+
 
 
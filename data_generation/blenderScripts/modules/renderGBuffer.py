@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      renderGBuffer
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Renders the geometry passes (normal, diffuse color, depth) of an attitude
+sequence once and stores them with gbuffer.py, so the sequence can be relit
+for any number of sun directions without rendering again (see relight.py).
+
+The passes are enabled on the view layer and routed into a File Output node
+that writes one 32-bit OpenEXR per pass per frame into a scratch directory.
+Each file is loaded back with bpy.data.images.load, copied into a reusable
+numpy array with pixels.foreach_get and deleted straight away.
+
+The Blender module is passed in as an argument rather than imported (see
+renderPhotometry.py).
+
+INPUTS:
+
+bpy     : The Blender python module (or a stand-in)
+scene   : Scene to render
+frames  : Iterable of frame numbers
+gbpath  : Output .npz file
+meta    : Attitude file metadata (dataFormat.makeMeta)
+tmpdir  : Scratch directory for the pass files
+
+"""
+
+#%% IMPORTS %%#
+import os
+import numpy as np
+import gbuffer as gbuf
+import instrument as im
+
+#%% CONSTANTS %%#
+NODE_NAME = 'GBuffer Output'
+PASSES    = {'normal_': 'Normal', 'albedo_': 'DiffCol', 'depth_': 'Depth'}    # File slot: render layer output
+
+#%% FUNCTIONS %%#
+
+# Enable the passes and route them into an EXR File Output node
+def setupPasses(scene, tmpdir):
+    layer = scene.view_layers[0]
+    layer.use_pass_normal        = True
+    layer.use_pass_diffuse_color = True
+    layer.use_pass_z             = True
+    
+    scene.use_nodes = True
+    tree = scene.node_tree
+    layers = next((n for n in tree.nodes if n.type == 'R_LAYERS'), None)
+    if layers is None:
+        layers = tree.nodes.new('CompositorNodeRLayers')
+    node = tree.nodes.get(NODE_NAME)
+    if node is None:
+        node = tree.nodes.new('CompositorNodeOutputFile')
+        node.name = NODE_NAME
+    node.base_path          = tmpdir
+    node.format.file_format = 'OPEN_EXR'
+    node.format.color_depth = '32'
+    node.format.color_mode  = 'RGB'
+    node.file_slots.clear()
+    for slot, output in PASSES.items():
+        node.file_slots.new(slot)
+        tree.links.new(layers.outputs[output], node.inputs[slot])
+    return node
+
+# Load one pass file, delete it and return (height,width,4) float32, top row first
+def readPass(bpy, filepath, buf=None):
+    image = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        width, height = image.size
+        if buf is None or buf.size != width*height*4:
+            buf = np.empty(width*height*4, dtype=np.float32)
+        image.pixels.foreach_get(buf)
+    finally:
+        bpy.data.images.remove(image)
+        os.remove(filepath)
+    return buf, buf.reshape(height, width, 4)[::-1]
+
+# Render the passes of every frame and save them to gbpath
+def renderGBuffer(bpy, scene, frames, gbpath, meta, tmpdir, verbose=True):
+    setupPasses(scene, tmpdir)
+    frames = list(frames)
+    bufs   = {slot: None for slot in PASSES}
+    writer = None
+    for count, k in enumerate(frames):
+        scene.frame_set(k)
+        with im.timer('render'):
+            bpy.ops.render.render(write_still=False)
+        
+        passes = {}
+        with im.timer('read'):
+            for slot in PASSES:
+                filepath = os.path.join(tmpdir, slot + str(k).zfill(4) + '.exr')
+                bufs[slot], passes[slot] = readPass(bpy, filepath, bufs[slot])
+        
+        if writer is None:
+            height, width = passes['depth_'].shape[0:2]
+            writer = gbuf.GBufferWriter(width, height, meta)
+        albedo = passes['albedo_'][:, :, 0:3].mean(axis=2)
+        writer.addFrame(passes['normal_'][:, :, 0:3], albedo, passes['depth_'][:, :, 0])
+        im.count('frames')
+        if verbose:
+            im.progress("Rendered passes", count+1, len(frames))
+    
+    if writer is not None:
+        with im.timer('write'):
+            writer.save(gbpath)
+    return gbpath
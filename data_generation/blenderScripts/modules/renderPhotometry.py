@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      renderPhotometry
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Generates photometry straight from Blender's render result without writing
+any image files.
+
+The scene is rendered one frame at a time. After each render, the compositor's
+Viewer Node buffer is copied into a reusable numpy array with
+pixels.foreach_get and reduced immediately (see framePhotometry.py). Only the
+photometry curve is kept, so there is no image encode, disk write, decode or
+clean-up per frame.
+
+The Blender module is passed in as an argument rather than imported. A small
+stand-in object that provides the same attributes (context, data.images,
+ops.render.render, scene.frame_set) can therefore drive these functions
+outside Blender with synthetic pixel buffers.
+
+NOTE: Viewer Node pixels are scene-linear floats in [0, 1]. They match the
+brightness of the 16-bit image files when the scene's view transform is set to
+'Raw' (or 'Standard' with an sRGB-free display). Otherwise the file-based curves
+include the view transform and the two will differ.
+
+INPUTS:
+
+bpy       : The Blender python module (or a stand-in)
+scene     : Scene to render
+frames    : Iterable of frame numbers
+stats     : Return per-frame features (framePhotometry.STATS_DTYPE)
+threshold : Lit pixel threshold for stats, normalized units
+
+"""
+
+#%% IMPORTS %%#
+import numpy as np
+import framePhotometry as fp
+import instrument as im
+
+#%% CONSTANTS %%#
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)    # Rec. 709 luminance weights
+VIEWER_NAME = 'Viewer Node'                                     # Image holding the viewer buffer
+
+#%% FUNCTIONS %%#
+
+# Route the render layers into a compositor Viewer Node
+def setupViewer(scene):
+    scene.use_nodes = True
+    tree = scene.node_tree
+    
+    layers = next((n for n in tree.nodes if n.type == 'R_LAYERS'), None)
+    if layers is None:
+        layers = tree.nodes.new('CompositorNodeRLayers')
+    viewer = next((n for n in tree.nodes if n.type == 'VIEWER'), None)
+    if viewer is None:
+        viewer = tree.nodes.new('CompositorNodeViewer')
+    viewer.use_alpha = False
+    tree.links.new(layers.outputs['Image'], viewer.inputs['Image'])
+    return viewer
+
+# Copy the Viewer Node buffer into buf (allocated when None or the wrong size)
+# Returns (buffer, (height, width) luminance image, top row first)
+def readViewer(bpy, buf=None):
+    image  = bpy.data.images[VIEWER_NAME]
+    width, height = image.size
+    if buf is None or buf.size != width*height*4:
+        buf = np.empty(width*height*4, dtype=np.float32)
+    image.pixels.foreach_get(buf)
+    
+    # Blender stores rows bottom to top
+    rgba = buf.reshape(height, width, 4)
+    return buf, (rgba[:, :, 0:3] @ LUMA)[::-1]
+
+# Render frame k into memory and reduce it
+def renderFrame(bpy, scene, k, buf=None, stats=False, threshold=0.0):
+    scene.frame_set(k)
+    with im.timer('render'):
+        bpy.ops.render.render(write_still=False)
+    with im.timer('read'):
+        buf, image = readViewer(bpy, buf)
+    with im.timer('reduce'):
+        return buf, fp.reduceFrame(image, 1.0, stats, threshold)
+
+# Render every frame into memory and return the photometry
+# Returns a (num_frames,1) brightness array, or a STATS_DTYPE array if stats is True
+def renderPhotometry(bpy, scene, frames, frameRate, stats=False, threshold=0.0, verbose=True):
+    setupViewer(scene)
+    frames  = list(frames)
+    results = []
+    buf     = None
+    for count, k in enumerate(frames):
+        buf, result = renderFrame(bpy, scene, k, buf, stats, threshold)
+        results.append(result)
+        im.count('frames')
+        if verbose:
+            im.progress("Rendered frames", count+1, len(frames))
+    return fp.collectRun(results, frameRate, stats)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      dataFormat
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Readers and writers for attitude and photometry files, in both the CSV layout
+used throughout the pipeline and a compact binary container.
+
+CSV LAYOUT:
+    Attitude                                Photometry
+    file_id,fps,dur,num_frames,sun_angle    file_id,fps,dur,num_frames,sun_angle
+    <values>                                <values>
+    omega,x_rot,y_rot,z_rot                 omega,x_rot,y_rot,z_rot,sat_name
+    <values>                                <values>
+    q0,q1,q2,q3,t                           phot,t
+    <num_frames rows>                       <num_frames rows>
+
+BINARY LAYOUT (little endian):
+    A fixed HEADER_SIZE byte header holding the metadata fields, followed by
+    the data stored column by column (num_cols x num_rows) as float32 or
+    float64. The column block can be memory-mapped and viewed as a
+    (num_rows, num_cols) array without copying.
+
+Metadata is passed around as a dictionary with the keys
+file_id, fps, dur, num_frames, sun_angle, omega, rot_axis and sat_name
+(sat_name is only used for photometry).
+
+"""
+
+#%% IMPORTS %%#
+import csv
+import struct
+import numpy as np
+
+#%% CONSTANTS %%#
+ATTITUDE   = 0                              # File kind: attitude quaternions
+PHOTOMETRY = 1                              # File kind: photometry curve
+
+COLUMNS = {ATTITUDE:   ["q0","q1","q2","q3","t"],
+           PHOTOMETRY: ["phot","t"]}
+
+MAGIC       = b'MA540BIN'                   # Binary file signature
+VERSION     = 1                             # Binary format version
+HEADER_SIZE = 256                           # Bytes reserved for the header
+
+# magic, version, kind, bytes per value, num_rows, num_cols,
+# file_id, fps, dur, sun_angle, omega, x_rot, y_rot, z_rot, sat_name
+HEADER_STRUCT = struct.Struct('<8sHHHxxII32s7d64s')
+
+#%% FUNCTIONS %%#
+
+# Build a metadata dictionary
+def makeMeta(file_id, fps, dur, sun_angle, omega, rot_axis, num_frames=None, sat_name=''):
+    return {"file_id": str(file_id), "fps": fps, "dur": dur, "num_frames": num_frames,
+            "sun_angle": sun_angle, "omega": omega,
+            "rot_axis": np.asarray(rot_axis, dtype=float), "sat_name": sat_name}
+
+# Format a number the way the original scripts wrote it (integers without .0)
+def _fmt(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+#%% CSV %%#
+
+# Write the metadata rows and column header of a CSV file
+def writeCSVHeader(csvwriter, kind, meta, num_frames):
+    rot_axis = meta["rot_axis"]
+    
+    # Header Line 1
+    csvwriter.writerow(["file_id","fps","dur","num_frames","sun_angle"])
+    csvwriter.writerow([meta["file_id"], _fmt(meta["fps"]), meta["dur"], num_frames, meta["sun_angle"]])
+    
+    # Header Line 2
+    if kind == PHOTOMETRY:
+        csvwriter.writerow(["omega","x_rot","y_rot","z_rot","sat_name"])
+        csvwriter.writerow([meta["omega"], rot_axis[0], rot_axis[1], rot_axis[2], meta["sat_name"]])
+    else:
+        csvwriter.writerow(["omega","x_rot","y_rot","z_rot"])
+        csvwriter.writerow([meta["omega"], rot_axis[0], rot_axis[1], rot_axis[2]])
+    
+    # Data Header
+    csvwriter.writerow(COLUMNS[kind])
+
+# Write a CSV file of the given kind
+def writeCSV(filepath, kind, meta, data):
+    data = np.asarray(data)
+    with open(filepath, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+        writeCSVHeader(csvwriter, kind, meta, len(data))
+        csvwriter.writerows(data.tolist())
+
+# Read a CSV file of either kind
+# Returns (kind, meta, data) with data as a (num_frames, num_cols) float64 array
+def readCSV(filepath):
+    with open(filepath, newline='') as csvfile:
+        lines = csvfile.read().splitlines()
+    
+    row1 = next(csv.reader([lines[1]]))
+    row3 = next(csv.reader([lines[3]]))
+    kind = PHOTOMETRY if len(row3) > 4 else ATTITUDE
+    
+    meta = makeMeta(row1[0], float(row1[1]), float(row1[2]), float(row1[4]), float(row3[0]),
+                    [float(row3[1]), float(row3[2]), float(row3[3])],
+                    num_frames=int(row1[3]), sat_name=row3[4] if kind == PHOTOMETRY else '')
+    
+    # Parse the whole body in one call
+    body = [line for line in lines[5:] if line]
+    if body:
+        data = np.loadtxt(body, delimiter=',', ndmin=2)
+    else:
+        data = np.empty((0, len(COLUMNS[kind])))
+    return kind, meta, data
+
+#%% BINARY %%#
+
+# Write a binary file of the given kind
+# dtype : np.float32 or np.float64 for the column block
+def writeBinary(filepath, kind, meta, data, dtype=np.float64):
+    dtype = np.dtype(dtype).newbyteorder('<')
+    data  = np.asarray(data, dtype=dtype)
+    num_rows, num_cols = data.shape
+    rot_axis = meta["rot_axis"]
+    
+    header = HEADER_STRUCT.pack(MAGIC, VERSION, kind, dtype.itemsize, num_rows, num_cols,
+                                str(meta["file_id"]).encode(), meta["fps"], meta["dur"],
+                                meta["sun_angle"], meta["omega"],
+                                rot_axis[0], rot_axis[1], rot_axis[2],
+                                meta.get("sat_name", '').encode())
+    
+    with open(filepath, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\x00'))
+        file.write(np.ascontiguousarray(data.T).tobytes())
+
+# Read only the header of a binary file
+# Returns (kind, meta, dtype, num_rows, num_cols)
+def readBinaryHeader(filepath):
+    with open(filepath, 'rb') as file:
+        header = file.read(HEADER_STRUCT.size)
+    if len(header) < HEADER_STRUCT.size or header[0:8] != MAGIC:
+        raise NameError('Not a MA540 binary data file: ' + str(filepath))
+    
+    (magic, version, kind, itemsize, num_rows, num_cols, file_id, fps, dur,
+     sun_angle, omega, x_rot, y_rot, z_rot, sat_name) = HEADER_STRUCT.unpack(header)
+    if version != VERSION:
+        raise NameError('Unsupported binary data file version: ' + str(version))
+    
+    meta = makeMeta(file_id.rstrip(b'\x00').decode(), fps, dur, sun_angle, omega,
+                    [x_rot, y_rot, z_rot], num_frames=num_rows,
+                    sat_name=sat_name.rstrip(b'\x00').decode())
+    dtype = np.dtype('<f' + str(itemsize))
+    return kind, meta, dtype, num_rows, num_cols
+
+# Read a binary file
+# mmap : Memory-map the column block instead of loading it into memory
+# Returns (kind, meta, data) with data as a (num_rows, num_cols) view
+def readBinary(filepath, mmap=True):
+    kind, meta, dtype, num_rows, num_cols = readBinaryHeader(filepath)
+    if num_rows == 0:
+        return kind, meta, np.empty((0, num_cols), dtype=dtype)
+    
+    if mmap:
+        block = np.memmap(filepath, dtype=dtype, mode='r', offset=HEADER_SIZE,
+                          shape=(num_cols, num_rows))
+    else:
+        block = np.fromfile(filepath, dtype=dtype, count=num_cols*num_rows,
+                            offset=HEADER_SIZE).reshape(num_cols, num_rows)
+    return kind, meta, block.T
+
+# Check for the binary signature
+def isBinary(filepath):
+    with open(filepath, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+# Read a file in either format
+def load(filepath, mmap=True):
+    if isBinary(filepath):
+        return readBinary(filepath, mmap)
+    return readCSV(filepath)
+
+#%% CONVERTERS %%#
+
+# Convert a CSV file to the binary format
+def csvToBinary(csvpath, binpath, dtype=np.float64):
+    kind, meta, data = readCSV(csvpath)
+    writeBinary(binpath, kind, meta, data, dtype)
+
+# Convert a binary file to the CSV format
+def binaryToCSV(binpath, csvpath):
+    kind, meta, data = readBinary(binpath, mmap=False)
+    writeCSV(csvpath, kind, meta, data)
+
+#%% PHOTOMETRY WRITERS %%#
+
+# Write a photometry curve
+# fmt : 'csv' or 'bin'
+def writePhotometry(filepath, meta, phot, t, fmt='csv', dtype=np.float64):
+    data = np.column_stack((np.ravel(phot), np.ravel(t)))
+    if fmt == 'bin':
+        writeBinary(filepath, PHOTOMETRY, meta, data, dtype)
+    else:
+        writeCSV(filepath, PHOTOMETRY, meta, data)
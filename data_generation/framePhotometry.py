@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      framePhotometry
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Vectorized reduction of rendered frames to photometry.
+
+The mean brightness of a frame is computed from a single sum over its pixels.
+With stats=True the same pass also collects per-frame features through row
+and column projections of the image:
+
+    brightness : Mean pixel value normalized by normFac
+    peak       : Brightest pixel normalized by normFac
+    lit        : Number of pixels brighter than threshold (normalized units)
+    cx, cy     : Intensity-weighted centroid [pixels] (x = column, y = row)
+    mxx, myy   : Intensity-weighted central second moments [pixels^2]
+    mxy        : Intensity-weighted central cross moment [pixels^2]
+
+Frames can be reduced whole with reduceFrame() or strip by strip with
+reduceStrips() (e.g. from TIFFreader.iterStrips), which gives identical results
+in bounded memory. Images are expected row-major, i.e. (height, width).
+
+mapFrames() spreads per-image work across a process pool and returns the
+results in input order. Metrics recorded by the workers (see instrument.py) are
+added up in the calling process, which also prints the progress line.
+
+INPUTS:
+
+image     : (height, width) pixel array
+normFac   : Normalizing factor (2**16 for 16-bit images)
+stats     : Return all features instead of the brightness only
+threshold : Lit pixel threshold in normalized units
+
+"""
+
+#%% IMPORTS %%#
+import os
+import numpy as np
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import instrument as im
+
+#%% CONSTANTS %%#
+# Per-frame record returned by the stats reductions
+STATS_DTYPE = np.dtype([('t',          'f8'),
+                        ('brightness', 'f8'),
+                        ('peak',       'f8'),
+                        ('lit',        'i8'),
+                        ('cx',         'f8'),
+                        ('cy',         'f8'),
+                        ('mxx',        'f8'),
+                        ('myy',        'f8'),
+                        ('mxy',        'f8')])
+
+NORM_FAC = 2**16            # Default normalizing factor (16-bit)
+
+#%% FUNCTIONS %%#
+
+# Running sums for one frame
+def _newSums():
+    return {"n": 0, "S": 0.0, "Sx": 0.0, "Sy": 0.0, "Sxx": 0.0, "Syy": 0.0,
+            "Sxy": 0.0, "peak": 0.0, "lit": 0}
+
+# Add a block of rows (starting at image row row0) to the running sums
+def _accumulate(sums, block, row0, stats, lit_level):
+    sums["n"] += block.size
+    if not stats:
+        sums["S"] += block.sum(dtype=np.float64)
+        return
+    
+    # Row and column projections carry everything the moments need
+    x      = np.arange(block.shape[1], dtype=np.float64)
+    y      = np.arange(row0, row0+block.shape[0], dtype=np.float64)
+    colsum = block.sum(axis=0, dtype=np.float64)
+    rowsum = block.sum(axis=1, dtype=np.float64)
+    
+    sums["S"]    += rowsum.sum()
+    sums["Sx"]   += colsum @ x
+    sums["Sy"]   += rowsum @ y
+    sums["Sxx"]  += colsum @ (x*x)
+    sums["Syy"]  += rowsum @ (y*y)
+    sums["Sxy"]  += y @ (block @ x)
+    sums["peak"]  = max(sums["peak"], float(block.max()))
+    sums["lit"]  += int(np.count_nonzero(block > lit_level))
+
+# Turn running sums into brightness or a STATS_DTYPE record
+def _finalize(sums, normFac, stats):
+    brightness = sums["S"]/normFac/sums["n"]
+    if not stats:
+        return brightness
+    
+    record = np.zeros((), dtype=STATS_DTYPE)
+    record['brightness'] = brightness
+    record['peak']       = sums["peak"]/normFac
+    record['lit']        = sums["lit"]
+    
+    S = sums["S"]
+    if S > 0:
+        cx = sums["Sx"]/S
+        cy = sums["Sy"]/S
+        record['cx']  = cx
+        record['cy']  = cy
+        record['mxx'] = sums["Sxx"]/S - cx*cx
+        record['myy'] = sums["Syy"]/S - cy*cy
+        record['mxy'] = sums["Sxy"]/S - cx*cy
+    else:
+        for key in ('cx','cy','mxx','myy','mxy'):
+            record[key] = np.nan
+    return record
+
+# Reduce a whole frame
+# Returns the mean brightness, or a STATS_DTYPE record if stats is True
+def reduceFrame(image, normFac=NORM_FAC, stats=False, threshold=0.0):
+    sums = _newSums()
+    _accumulate(sums, np.asarray(image), 0, stats, threshold*normFac)
+    return _finalize(sums, normFac, stats)
+
+# Reduce a frame delivered as (first row, block of rows) pairs
+def reduceStrips(strips, normFac=NORM_FAC, stats=False, threshold=0.0):
+    sums = _newSums()
+    for row0, block in strips:
+        _accumulate(sums, np.asarray(block), row0, stats, threshold*normFac)
+    return _finalize(sums, normFac, stats)
+
+# Time vector of a run
+def timeVector(numImages, frameRate):
+    dur = numImages/frameRate                   # Animation Duration
+    return np.linspace(0,dur,numImages)
+
+# Assemble per-frame results into the run output
+#   frames : list of brightness values, or of STATS_DTYPE records
+# Returns a STATS_DTYPE array if stats is True, otherwise a (numImages,1) array
+def collectRun(frames, frameRate, stats=False):
+    t = timeVector(len(frames), frameRate)
+    if stats:
+        run = np.array(frames, dtype=STATS_DTYPE).reshape(-1)
+        run['t'] = t
+        return run
+    return np.array(frames, dtype=float).reshape(-1,1)
+
+# Number of frames named with Blender's default scheme ('0000.tif', ...) in a directory
+def countFrames(imDir, ext):
+    return sum(1 for name in os.listdir(imDir)
+               if name.endswith(ext) and name[:-len(ext)].isdigit())
+
+# Run func on one item in a worker and hand its metrics back to the parent
+def _measured(func, item):
+    return func(item), im.drain()
+
+# Apply func to every item across a process pool, returning results in order
+#   workers  : Number of processes (1 = run in this process, None = all cores)
+#   progress : Name of the progress line printed as items finish (None = quiet)
+#   kwargs   : Extra keyword arguments passed to func
+def mapFrames(func, items, workers=1, chunksize=None, progress=None, **kwargs):
+    func = partial(func, **kwargs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = []
+    if workers == 1 or len(items) <= 1:
+        for item in items:
+            results.append(func(item))
+            if progress is not None:
+                im.progress(progress, len(results), len(items))
+        return results
+    
+    if chunksize is None:
+        chunksize = max(1, len(items)//(4*workers))
+    measure = im.enabled
+    call    = partial(_measured, func) if measure else func
+    with ProcessPoolExecutor(max_workers=workers, initializer=im.workerInit,
+                             initargs=im.workerArgs()) as pool:
+        for result in pool.map(call, items, chunksize=chunksize):
+            if measure:
+                result, collected = result
+                im.merge(collected)
+            results.append(result)
+            if progress is not None:
+                im.progress(progress, len(results), len(items))
+    return results
@@ -9,6 +9,10 @@ A python script that generates a csv file of rotation quaternions to be
 read in by the blenderRenderRotation script. Rotation parameters are randomized
 within reasonable bounds. A set of fixed parameters may be specified by the user.
 
+The attitude table for a case is produced in one vectorized step by
+generateAttitude(), which can be imported and called directly to build
+trajectories in memory without writing them to disk.
+
 INPUTS:
 
 dur   : Durration of rotation in seconds
@@ -20,99 +24,107 @@ fps   : Animation frames per second
 import numpy as np
 import random as rnd
 import quat
-import csv
+import dataFormat as df
 from datetime import datetime
 
-#%% USER INPUT %%#
-num_files = 3;
+#%% FUNCTIONS %%#
 
-#%% ********************** BEGIN GENERATING FILES ********************** %%#
-for file_count in range(num_files):
-    
-    #%% GENERATE FILE ID %%#
-    today = datetime.now();
-    
-    # Format As YYYYMMDDhhmmssCCCC 
-    # CCCC is a 4-digit counter starting at 0 that increments for each file
-    
-    Y = str(today.year);
-    M = str(today.month);
-    D = str(today.day);
-    h = str(today.hour);
-    m = str(today.minute);
-    s = str(today.second);
-    c = str(file_count);
-    
-    YYYY  = Y.zfill(4); 
-    MM    = M.zfill(2);
-    DD    = D.zfill(2);
-    hh    = h.zfill(2);
-    mm    = m.zfill(2);
-    ss    = s.zfill(2);
-    CCCC = c.zfill(4);
-    
-    file_id = YYYY+MM+DD+hh+mm+ss+CCCC;
-    
+# Generate the full attitude table for a constant-rate spin about a fixed axis
+#   init_ang  : Initial rotation angle [rad]
+#   init_axis : Initial rotation axis (3 elements)
+#   omega     : Angular velocity [s^-1]
+#   rot_axis  : Rotation axis (3 elements)
+#   fps       : Frames per second
+#   dur       : Duration [s]
+# Returns a (num_frames,5) array with columns (q0, q1, q2, q3, t)
+def generateAttitude(init_ang, init_axis, omega, rot_axis, fps, dur):
+    t          = np.linspace(0,dur,int(np.ceil(fps*dur)))   # Time Vector
+    num_frames = len(t)                                     # Number of frames
+    
+    # Angular displacement advances by omega*dt each frame
+    theta = omega*np.arange(num_frames)/fps
+    
+    q_init = quat.Quat()                                    # Initial attitude quaternion
+    q_init.setAngleAxis(init_ang, np.asarray(init_axis, dtype=float))
+    q_rot  = quat.QuatArray.fromAngleAxis(theta, rot_axis)  # Applied rotation quaternions
+    
+    # Successive rotations: Multiply two quaternions
+    # q3 = q1*q2     is  Perform rotation q2 then q1
+    q = q_rot*q_init
+    
+    data = np.empty((num_frames,5))
+    data[:,0:4] = q.q
+    data[:,4]   = t
+    return data
+
+# Draw a random set of rotation parameters
+#   rng : random.Random-like source (defaults to the global random module)
+# Returns a dictionary of generateAttitude() arguments plus sun_angle
+def randomParameters(rng=rnd):
     #%% SOLAR VECTOR %%#
-    sun_angle = rnd.uniform(0,2*np.pi);  # Sun angle in ZY plane (radians)
+    sun_angle = rng.uniform(0,2*np.pi)      # Sun angle in ZY plane (radians)
     
     #%% ROTATION PARAMETERS %%#
     # Fixed Parameters
-    fps   = 24;                                         # Frames Per Second
-    dt    = 1/fps;                                      # Time interval
-    t_max = 12;                                         # Maximum Duration
-    t_min = 8;                                          # Minimum Duration
+    fps   = 24                              # Frames Per Second
+    t_max = 12                              # Maximum Duration
+    t_min = 8                               # Minimum Duration
     
     # Variable Parameters
-    dur        = rnd.uniform(t_min,t_max);                   # Durration in Seconds
-    t          = np.linspace(0,dur,int(np.ceil(fps*dur)));   # Time Vector
-    num_frames = len(t);                                     # Number of frames
-    
-    omega_max = 5*(2*np.pi/dur);                                        # Maximum of 6 rotations
-    omega_min = 2*(2*np.pi/dur);                                        # Minimum of 3 rotations
-    theta     = 0;                                                      # Anglular Displacement
-    omega     = rnd.uniform(omega_min,omega_max);                       # Angular velocity [s^-1]
-    rot_axis  = np.array([rnd.random(), rnd.random(), rnd.random()]);   # Rotation Axis
-    init_axis = np.array([rnd.random(), rnd.random(), rnd.random()]);   # Initial Rotation Axis
-    init_ang  = np.array(rnd.random()*np.pi*2);                         # Initial Rotation
-    
-    # Initialize Quaternions
-    q_init = quat.Quat();                           # Initial attitude quaternion
-    q_init.setAngleAxis(init_ang, init_axis);
-    
-    q_rot = quat.Quat();                            # Applied rotation quaternion
-    q_rot.setAngleAxis(theta, rot_axis);
-    
-    q = q_init;                                     # Quaternion attitude variable 
+    dur        = rng.uniform(t_min,t_max)                           # Durration in Seconds
+    omega_max  = 5*(2*np.pi/dur)                                    # Maximum of 6 rotations
+    omega_min  = 2*(2*np.pi/dur)                                    # Minimum of 3 rotations
+    omega      = rng.uniform(omega_min,omega_max)                   # Angular velocity [s^-1]
+    rot_axis   = np.array([rng.random(), rng.random(), rng.random()])   # Rotation Axis
+    init_axis  = np.array([rng.random(), rng.random(), rng.random()])   # Initial Rotation Axis
+    init_ang   = rng.random()*np.pi*2                                   # Initial Rotation
+    
+    return {"init_ang": init_ang, "init_axis": init_axis, "omega": omega,
+            "rot_axis": rot_axis, "fps": fps, "dur": dur, "sun_angle": sun_angle}
+
+# Generate a file ID formatted as YYYYMMDDhhmmssCCCC
+# CCCC is a 4-digit counter starting at 0 that increments for each file
+def generateFileID(file_count, today=None):
+    if today is None:
+        today = datetime.now()
+    return today.strftime("%Y%m%d%H%M%S") + str(file_count).zfill(4)
+
+# Write an attitude table to CSV in the layout read by blenderRenderRotation
+def writeAttitudeCSV(filepath, file_id, fps, dur, sun_angle, omega, rot_axis, data):
+    meta = df.makeMeta(file_id, fps, dur, sun_angle, omega, rot_axis)
+    df.writeCSV(filepath, df.ATTITUDE, meta, data)
+
+# Write an attitude table to the binary container (see dataFormat)
+def writeAttitudeBinary(filepath, file_id, fps, dur, sun_angle, omega, rot_axis, data, dtype=np.float64):
+    meta = df.makeMeta(file_id, fps, dur, sun_angle, omega, rot_axis)
+    df.writeBinary(filepath, df.ATTITUDE, meta, data, dtype)
+
+
+#%% ********************** BEGIN GENERATING FILES ********************** %%#
+if __name__ == "__main__":
     
-    path     = "./rotation_data/";
-    filename = "rotation_data_" + file_id + ".csv";
-    filepath = path + filename;
+    #%% USER INPUT %%#
+    num_files = 3;
+    path      = "./rotation_data/";
+    fmt       = 'csv';                  # 'csv' or 'bin' (see dataFormat)
     
-    #%% WRITE TO CSV %%#
-    with open(filepath, 'w', newline='') as csvfile:
-        csvwriter = csv.writer(csvfile)
+    today = datetime.now();
+    for file_count in range(num_files):
         
-        # Write Header
-        csvwriter.writerow(np.array(["file_id","fps","dur","num_frames","sun_angle"]));
-        csvwriter.writerow(np.array([file_id,fps,dur,num_frames,sun_angle]));
-        csvwriter.writerow(np.array(["omega","x_rot", "y_rot", "z_rot"]));
-        csvwriter.writerow(np.array([omega,rot_axis[0],rot_axis[1],rot_axis[2]]));
+        #%% GENERATE FILE ID %%#
+        file_id = generateFileID(file_count, today);
         
-        # Write Header
-        csvwriter.writerow(np.array(["q0","q1","q2","q3","t"]));
-        for i in range(num_frames):
-            # Write Row
-            row = np.array([q.q0, q.q1, q.q2, q.q3, t[i]]); 
-            csvwriter.writerow(row);
-            #print("Print Row: ", row.astype('str'))    
-            
-            # Apply Rotation
-            theta+=omega*dt;                        # Update Rotation Angle
-            q_rot.setAngleAxis(theta, rot_axis);    # Rotation Quaternion
-            q = q_rot*q_init;                       # Apply init and rotation
-    
-            # Successive rotations: Multiply two quaternions
-            # q3 = q1*q2     is  Perform rotation q2 then q1
-    
-    print("FILE: " + filename + " SAVED");
+        #%% ROTATION PARAMETERS %%#
+        params    = randomParameters();
+        sun_angle = params.pop("sun_angle");
+        data      = generateAttitude(**params);
+        
+        filename = "rotation_data_" + file_id + "." + fmt;
+        filepath = path + filename;
+        
+        #%% WRITE TO FILE %%#
+        write = writeAttitudeBinary if fmt == 'bin' else writeAttitudeCSV;
+        write(filepath, file_id, params["fps"], params["dur"], sun_angle,
+              params["omega"], params["rot_axis"], data);
+        
+        print("FILE: " + filename + " SAVED");
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      generateAttitudeDataset
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Bulk version of generateAttitudeData. Generates a large number of attitude
+cases across a process pool and writes one CSV per case to the output
+directory.
+
+Every case draws its parameters from its own random stream, derived from the
+dataset seed and the case index. The output is therefore identical for a given
+seed regardless of the number of workers or the order in which cases finish.
+
+File IDs keep the 18-digit format of generateAttitudeData but are built from
+the seed and case index (SSSSSSSSSSCCCCCCCC) instead of the wall clock, so
+parallel runs with different seeds never collide.
+
+INPUTS:
+
+num_cases   : Number of attitude cases to generate
+num_workers : Number of worker processes (None = all cores)
+seed        : Dataset seed (None = draw a fresh one)
+path        : Output directory
+fmt         : Output format, 'csv' or 'bin' (see dataFormat)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import time
+import secrets
+import numpy as np
+from multiprocessing import Pool
+import generateAttitudeData as gad
+
+#%% FUNCTIONS %%#
+
+# Independent random stream for a single case
+def caseRNG(seed, case_index):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(case_index,)))
+
+# File ID for a single case
+def caseFileID(seed, case_index):
+    return str(seed).zfill(10) + str(case_index).zfill(8)
+
+# Generate and write a single case. Returns the file name.
+def generateCase(seed, case_index, path, fmt='csv'):
+    rng       = caseRNG(seed, case_index)
+    file_id   = caseFileID(seed, case_index)
+    params    = gad.randomParameters(rng)
+    sun_angle = params.pop("sun_angle")
+    data      = gad.generateAttitude(**params)
+    
+    filename = "rotation_data_" + file_id + "." + fmt
+    write    = gad.writeAttitudeBinary if fmt == 'bin' else gad.writeAttitudeCSV
+    write(os.path.join(path, filename), file_id, params["fps"], params["dur"],
+          sun_angle, params["omega"], params["rot_axis"], data)
+    return filename
+
+# Pool entry point (arguments packed for imap)
+def _generateCase(args):
+    return generateCase(*args)
+
+# Generate num_cases attitude files in path using a process pool
+# Returns (seed, list of file names, cases per second)
+def generateAttitudeDataset(num_cases, path, num_workers=None, seed=None, fmt='csv', chunksize=64, verbose=True):
+    if seed is None:
+        seed = secrets.randbits(32)
+    if not 0 <= seed < 10**10:
+        raise ValueError("Seed must be a non-negative integer below 1e10")
+    os.makedirs(path, exist_ok=True)
+    
+    jobs = ((seed, k, path, fmt) for k in range(num_cases))
+    
+    t_start = time.perf_counter()
+    if num_workers == 1:
+        filenames = [_generateCase(job) for job in jobs]
+    else:
+        with Pool(num_workers) as pool:
+            filenames = list(pool.imap(_generateCase, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - t_start
+    
+    rate = num_cases/elapsed if elapsed > 0 else float('inf')
+    if verbose:
+        print("Generated %d cases in %.2f s (%.1f cases/s) with seed %d"
+              % (num_cases, elapsed, rate, seed))
+    return seed, filenames, rate
+
+
+#%% ********************** BEGIN GENERATING FILES ********************** %%#
+if __name__ == "__main__":
+    
+    #%% USER INPUT %%#
+    num_cases   = 10000;
+    num_workers = None;
+    seed        = None;
+    path        = "./rotation_data/";
+    fmt         = 'csv';
+    
+    generateAttitudeDataset(num_cases, path, num_workers, seed, fmt);
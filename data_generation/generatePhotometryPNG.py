@@ -17,55 +17,87 @@ numImages   : Number of images in directory
 imDir       : File path to directory
 frameRate   : Frames-per-second for the animation (from Blender)
 showImage   : Setting to 'True' will display each image  
+stats       : Return a structured array of per-frame features (see
+              framePhotometry.STATS_DTYPE) instead of brightness and time
+threshold   : Lit pixel threshold for stats, normalized units
+workers     : Number of processes to spread the images over (None = all cores)
+quiet       : Setting to 'True' suppresses the progress output (see instrument.py)
+
+generatePhotometryRuns() processes many render directories at once, sharing
+one process pool across all of their images. Results keep frame order.
 
 """
 import cv2
+import framePhotometry as fp
+import instrument as im
 import numpy as np
 import math
 
-def generatePhotometry(imDir,frameRate,numImages):
+# Load and reduce a single image (also runs in the worker processes)
+def reduceImage(imPath,normFac=2**16,stats=False,threshold=0.0):
+    ## Load Image Data ##
+    # Load Image
+    with im.timer('read'):
+        image = cv2.imread(imPath,cv2.IMREAD_UNCHANGED);
+    
+    ## Process Image ##
+    with im.timer('reduce'):
+        return fp.reduceFrame(image, normFac, stats, threshold)
+
+def generatePhotometry(imDir,frameRate,numImages,stats=False,threshold=0.0,workers=1,quiet=False):
     # Number of place values for zero padding
     num_places = 4;#math.floor(math.log10(numImages))+1;
     
     ## Photometry Array ##
-    photometry = np.empty(shape=(numImages,1))
     normFac  = 2**16;       # Normalizing Factor
     
     #%% Iterate Through All Images %%#
-    for k in range(numImages):
-        ## File Name ##
-        # Image Name
-        imName = str(k).zfill(num_places) + '.png'
-        
-        # File Path for this Image     
-        imPath = imDir + imName
-        print("Processing Image: ",imPath)
-        
-        ## Load Image Data ##
-        # Load Image
-        image = cv2.imread(imPath,cv2.IMREAD_UNCHANGED);
-        
-        # Image Data
-        numPixels = image.size
-        imgWidth  = image.shape[1]
-        imgHeight = image.shape[0]
-        
-        ## Process Image ##
-        pixelSum = 0;           
-        
-        # Loop Through Image
-        for i in range(imgHeight):
-            for j in range(imgWidth):
-                pixelSum += image[i][j]/normFac;
-        
-        # Normalize Pixel Sum
-        brightness = pixelSum/numPixels;
-        
-        # Save Photometry Data
-        photometry[k] = brightness;
+    # File Path for each Image
+    imPaths = [imDir + str(k).zfill(num_places) + '.png' for k in range(numImages)];
+    frames  = fp.mapFrames(reduceImage, imPaths, workers, normFac=normFac,
+                           stats=stats, threshold=threshold,
+                           progress=None if quiet else "Processing images");
+    
+    return savePhotometry(frames, frameRate, stats)
+
+# Process several render directories with one shared process pool
+#   runDirs   : List of directory paths (with trailing separator)
+#   numImages : Images per directory (None = count the files in each directory)
+# Returns a list with the generatePhotometry output of each directory
+def generatePhotometryRuns(runDirs,frameRate,numImages=None,stats=False,threshold=0.0,workers=None,quiet=True):
+    num_places = 4;
+    normFac    = 2**16;
+    
+    # Flatten the images of all runs into one job list
+    counts  = [];
+    imPaths = [];
+    for imDir in runDirs:
+        n = numImages if numImages is not None else fp.countFrames(imDir, '.png');
+        imPaths += [imDir + str(k).zfill(num_places) + '.png' for k in range(n)];
+        counts.append(n);
+    
+    frames = fp.mapFrames(reduceImage, imPaths, workers, normFac=normFac,
+                          stats=stats, threshold=threshold,
+                          progress=None if quiet else "Processing images");
+    
+    # Split results back into runs
+    runs  = [];
+    start = 0;
+    for n in counts:
+        runs.append(savePhotometry(frames[start:(start+n)], frameRate, stats));
+        start += n;
+    return runs
+
+# Assemble the photometry output of one run
+def savePhotometry(frames,frameRate,stats=False):
+    numImages = len(frames);
     
     #%% Save Photometry Data %%#
     
+    if stats:
+        return fp.collectRun(frames, frameRate, stats=True)
+    photometry = fp.collectRun(frames, frameRate);
+    
     # Generate Time Space
     dur = numImages/frameRate;              # Animation Duration
     t   = np.array([np.linspace(0,dur,numImages)]);     # Time Vector
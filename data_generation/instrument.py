@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      instrument
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Lightweight timing, counters and progress output for the pipeline stages
+(read, decode, reduce, write, keyframe, render, ...).
+
+    with timer('decode'):               # Time a block
+        ...
+    
+    @timer('reduce')                    # Time every call of a function
+    def reduceImage(...):
+    
+    count('frames', n)                  # Add to a counter
+    observe('frame_bytes', size)        # Add a sample to a histogram
+    progress('Processing images')       # Rate-limited progress line
+
+Metrics are off by default. When disabled, timer() returns a no-op object
+and count()/observe() return immediately, so the calls can stay in the
+hot loops. Call enable() to turn them on, or set the MA540_METRICS environment
+variable. The variable also reaches worker processes and headless Blender:
+
+    MA540_METRICS=1                     Collect in memory (see summary/report)
+    MA540_METRICS=metrics.jsonl         Also append every event as a JSON line
+
+Each JSON line holds the event type, name, value, time and process id, so files
+written by several worker processes can be merged. progress() prints at most
+once per PROGRESS_INTERVAL seconds whether metrics are enabled or not.
+
+Timers, counters and histograms live in the process that records them. Pools
+started by framePhotometry.mapFrames() set up their workers with workerInit()
+and send each worker's values back with drain(). The parent adds them up with
+merge() and prints progress() itself, so summary(), report() and the progress
+totals and rates cover the whole pool.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import numpy as np
+
+#%% CONSTANTS %%#
+PROGRESS_INTERVAL = 1.0                     # Minimum seconds between progress lines
+FLUSH_EVENTS      = 1000                    # Buffered events before the metrics file is written
+HIST_EDGES        = 2.0**np.arange(-20, 41) # Histogram bucket edges (powers of two)
+
+#%% STATE %%#
+enabled   = False
+_path     = None                             # JSON lines file (None = in memory only)
+_events   = []                               # Events not yet written
+_timers   = {}                               # name : [calls, total, min, max]
+_counts   = {}                               # name : total
+_hists    = {}                               # name : [bucket counts, n, sum, min, max]
+_progress = {}                               # name : [done, start time, last print time]
+
+#%% FUNCTIONS %%#
+
+# Turn metrics on
+#   path : Optional JSON lines file to append events to
+def enable(path=None):
+    global enabled, _path
+    enabled = True
+    _path   = path
+
+# Turn metrics off (collected values are kept)
+def disable():
+    global enabled
+    flush()
+    enabled = False
+
+# Forget all collected values
+def reset():
+    _events.clear()
+    _timers.clear()
+    _counts.clear()
+    _hists.clear()
+    _progress.clear()
+
+# Record an event for the metrics file
+def _emit(kind, name, value):
+    if _path is None:
+        return
+    _events.append({"type": kind, "name": name, "value": value,
+                    "time": time.time(), "pid": os.getpid()})
+    if len(_events) >= FLUSH_EVENTS:
+        flush()
+
+# Append buffered events to the metrics file
+def flush():
+    if _path is None or not _events:
+        return
+    with open(_path, 'a') as file:
+        file.write(''.join(json.dumps(event) + '\n' for event in _events))
+    _events.clear()
+
+#%% TIMERS %%#
+
+class _Timer:
+    __slots__ = ("name", "start")
+    
+    def __init__(self, name):
+        self.name  = name
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        addTime(self.name, time.perf_counter() - self.start)
+        return False
+    
+    # Use as a decorator
+    def __call__(self, func):
+        name = self.name
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+class _NullTimer:
+    __slots__ = ("name",)
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+    
+    # As a decorator it still checks enabled on every call, so enabling later works
+    def __call__(self, func):
+        return _Timer(self.name)(func)
+
+# Timer for a stage, as a context manager or decorator
+def timer(name):
+    return _Timer(name) if enabled else _NullTimer(name)
+
+# Add a measured duration [s] to a timer
+def addTime(name, seconds):
+    if not enabled:
+        return
+    stat = _timers.get(name)
+    if stat is None:
+        _timers[name] = [1, seconds, seconds, seconds]
+    else:
+        stat[0] += 1
+        stat[1] += seconds
+        stat[2]  = min(stat[2], seconds)
+        stat[3]  = max(stat[3], seconds)
+    _emit('timer', name, seconds)
+
+#%% COUNTERS AND HISTOGRAMS %%#
+
+# Add n to a counter
+def count(name, n=1):
+    if not enabled:
+        return
+    _counts[name] = _counts.get(name, 0) + n
+    _emit('count', name, n)
+
+# Add a sample to a histogram
+def observe(name, value):
+    if not enabled:
+        return
+    hist = _hists.get(name)
+    if hist is None:
+        hist = _hists[name] = [np.zeros(len(HIST_EDGES)+1, dtype=np.int64), 0, 0.0, value, value]
+    hist[0][np.searchsorted(HIST_EDGES, value)] += 1
+    hist[1] += 1
+    hist[2] += value
+    hist[3]  = min(hist[3], value)
+    hist[4]  = max(hist[4], value)
+    _emit('observe', name, value)
+
+#%% PROGRESS %%#
+
+# Rate-limited progress line
+#   done  : Units done so far (None = one more than last call)
+#   total : Total units, if known
+#   force : Print regardless of the interval (e.g. for the last unit)
+# A run ends when done reaches total, or starts over when done goes back down,
+# so the next run under the same name gets its own count and rate.
+def progress(name, done=None, total=None, force=False, interval=PROGRESS_INTERVAL):
+    now   = time.monotonic()
+    state = _progress.get(name)
+    if state is None or (done is not None and done < state[0]):
+        state = _progress[name] = [0, now, -np.inf]
+    first    = state[2] == -np.inf
+    state[0] = state[0] + 1 if done is None else done
+    if total is not None and state[0] >= total:
+        force = True
+        del _progress[name]
+    if not force and now - state[2] < interval:
+        return
+    
+    state[2] = now
+    elapsed  = now - state[1]
+    text     = name + ": " + str(state[0]) + ("" if total is None else "/" + str(total))
+    if not first and elapsed > 0:
+        text += " (%.1f/s)" % (state[0]/elapsed)
+    print(text)
+    sys.stdout.flush()
+
+#%% WORKER PROCESSES %%#
+
+# Arguments for workerInit() that reproduce this process's settings in a worker
+def workerArgs():
+    return (enabled, _path)
+
+# Pool initializer: start from empty values (a forked worker inherits the parent's)
+def workerInit(on, path=None):
+    reset()
+    if on:
+        enable(path)
+    else:
+        disable()
+
+# Timers, counters and histograms collected in this process, cleared afterwards
+def drain():
+    collected = {"timers": dict(_timers), "counts": dict(_counts), "hists": dict(_hists)}
+    _timers.clear()
+    _counts.clear()
+    _hists.clear()
+    return collected
+
+# Add values drained in another process (their events were already written there)
+def merge(collected):
+    for name, s in collected["timers"].items():
+        stat = _timers.get(name)
+        if stat is None:
+            _timers[name] = list(s)
+        else:
+            stat[0] += s[0]
+            stat[1] += s[1]
+            stat[2]  = min(stat[2], s[2])
+            stat[3]  = max(stat[3], s[3])
+    for name, n in collected["counts"].items():
+        _counts[name] = _counts.get(name, 0) + n
+    for name, h in collected["hists"].items():
+        hist = _hists.get(name)
+        if hist is None:
+            _hists[name] = [h[0].copy(), h[1], h[2], h[3], h[4]]
+        else:
+            hist[0] += h[0]
+            hist[1] += h[1]
+            hist[2] += h[2]
+            hist[3]  = min(hist[3], h[3])
+            hist[4]  = max(hist[4], h[4])
+
+#%% REPORTING %%#
+
+# Collected values as a dictionary
+def summary():
+    timers = {name: {"calls": s[0], "total": s[1], "mean": s[1]/s[0], "min": s[2], "max": s[3]}
+              for name, s in _timers.items()}
+    hists  = {name: {"n": h[1], "mean": h[2]/h[1], "min": h[3], "max": h[4],
+                     "buckets": {str(HIST_EDGES[k-1] if k else 0): int(c)
+                                 for k, c in enumerate(h[0]) if c}}
+              for name, h in _hists.items()}
+    return {"timers": timers, "counts": dict(_counts), "histograms": hists}
+
+# Print a table of the collected timers and counters
+def report():
+    for name, s in sorted(_timers.items(), key=lambda item: -item[1][1]):
+        print("%-16s %8d calls %10.3f s total %10.3f ms mean" % (name, s[0], s[1], 1e3*s[1]/s[0]))
+    for name, n in sorted(_counts.items()):
+        print("%-16s %8d" % (name, n))
+
+# Enable from the environment (also in worker processes)
+_setting = os.environ.get('MA540_METRICS', '')
+if _setting:
+    enable(None if _setting == '1' else _setting)
+atexit.register(flush)
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      lightCurveSim
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Pure numpy light-curve simulator for faceted satellite models. It is a fast
+alternative to rendering the scene in Blender.
+
+A model is a set of flat facets, each with a normal, an area and BRDF
+parameters. For every frame the sun and observer directions are rotated into
+the body frame with the attitude quaternions. The brightness of all facets in
+all frames is then evaluated in one vectorized pass:
+
+    B = scale * sum_facets  A * shadow * mu0 * mu * BRDF(n, s, o)
+
+    mu0 = n.s (sun), mu = n.o (observer). Only facets that face both the sun
+    and the observer contribute. This is exact for convex bodies and is the
+    self-shadowing approximation used for everything else. The per-facet
+    shadow factor (0-1) can further darken facets that are partly occluded
+    by the rest of the body (e.g. panel undersides).
+
+BRDF = kd/pi  +  specular term
+    'phong'         : ks * (r.o)^shininess / mu0   (r = mirror direction of s)
+    'cook-torrance' : ks * D*F*G / (4 mu0 mu)      (GGX distribution,
+                      Schlick Fresnel with F0 = ks, Smith shadowing, roughness)
+
+The scene geometry follows blenderRenderRotation: the sun is rotated by the
+YXZ Euler angles (sun_angle, SUNSET_ANGLE, 0) and shines along its local -Z
+axis. The observer direction points from the satellite to the camera.
+Models exported from satellite.blend (blenderScripts/modules/exportFacetModel.py)
+carry the camera direction of that scene. Otherwise the direction of
+Blender's default camera is used.
+
+Outputs use the photometry format (see dataFormat.py), so simulated curves can
+be used anywhere rendered ones are.
+
+MODEL FILE (.npz):
+    normals   : (F,3) facet normals in the body frame
+    areas     : (F,) facet areas
+    kd        : (F,) diffuse albedo
+    ks        : (F,) specular albedo
+    shininess : (F,) Phong exponent
+    roughness : (F,) Cook-Torrance roughness
+    shadow    : (F,) shadow factor (optional, default 1)
+    obs_dir   : (3,) observer direction in the world frame (optional)
+    name      : satellite name (optional, defaults to the file name)
+
+Every model carries a satellite name. It becomes sat_name in the photometry
+files and the <sat_name>_<file_id> file names that the classifiers take their
+labels from. boxModel() names a box after its dimensions unless given a name.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import time
+import numpy as np
+import quat
+import dataFormat as df
+import generateAttitudeData as gad
+import generateAttitudeDataset as gads
+
+#%% CONSTANTS %%#
+SUNSET_ANGLE = -10*np.pi/180                                    # Sun elevation used by blenderRenderRotation
+DEFAULT_OBS  = np.array([7.3589, -6.9258, 4.9583])              # Blender's default camera location
+CHUNK_SIZE   = 2**22                                            # Frame x facet elements per pass
+
+#%% MODELS %%#
+
+# Build a model dictionary, filling per-facet parameters from scalars
+#   name : Satellite name written to the photometry files (required)
+def makeModel(normals, areas, kd=0.5, ks=0.0, shininess=10.0, roughness=0.3,
+              shadow=1.0, obs_dir=None, name=None):
+    if not name:
+        raise NameError('Facet models need a satellite name (it labels the photometry files)')
+    normals = np.asarray(normals, dtype=float).reshape(-1,3)
+    normals = normals/np.linalg.norm(normals, axis=1)[:,None]
+    F = len(normals)
+    model = {"normals": normals, "areas": np.broadcast_to(np.asarray(areas, dtype=float), (F,)).copy(),
+             "name": name, "obs_dir": DEFAULT_OBS if obs_dir is None else np.asarray(obs_dir, dtype=float)}
+    for key, value in (("kd", kd), ("ks", ks), ("shininess", shininess),
+                       ("roughness", roughness), ("shadow", shadow)):
+        model[key] = np.broadcast_to(np.asarray(value, dtype=float), (F,)).copy()
+    return model
+
+# Rectangular box (e.g. a CubeSat bus) with sides of length dims = (x, y, z)
+#   name : Satellite name (None = 'BOX-<x>x<y>x<z>')
+def boxModel(dims, name=None, **kwargs):
+    x, y, z = dims
+    if name is None:
+        name = "BOX-%gx%gx%g" % (x, y, z)
+    normals = [[1,0,0],[-1,0,0],[0,1,0],[0,-1,0],[0,0,1],[0,0,-1]]
+    areas   = [y*z, y*z, x*z, x*z, x*y, x*y]
+    return makeModel(normals, areas, name=name, **kwargs)
+
+# Save a model to .npz
+def saveModel(filepath, model):
+    np.savez(filepath, **model)
+
+# Load a model from .npz
+def loadModel(filepath):
+    with np.load(filepath) as data:
+        fields = {key: data[key] for key in data.files}
+    name = str(fields.pop("name")) if "name" in fields else os.path.splitext(os.path.basename(filepath))[0]
+    return makeModel(fields.pop("normals"), fields.pop("areas"), name=name, **fields)
+
+#%% GEOMETRY %%#
+
+# Unit vector pointing towards the sun for the given sun angles (scalar or (N,))
+def sunDirection(sun_angle, sunset_angle=SUNSET_ANGLE):
+    # YXZ Euler with z = 0: R = Rx(sun_angle) * Ry(sunset_angle), sun points along R*(0,0,1)
+    a = np.asarray(sun_angle, dtype=float)
+    b = sunset_angle
+    return np.stack(np.broadcast_arrays(np.sin(b), -np.sin(a)*np.cos(b), np.cos(a)*np.cos(b)), axis=-1)
+
+# Rotate world-frame directions into the body frame of each attitude
+def toBody(quats, vectors):
+    return quat.QuatArray(quats).conj().rotate(vectors)
+
+#%% SIMULATION %%#
+
+# Brightness of every frame
+#   model   : Facet model
+#   quats   : (N,4) attitude quaternions (body to world)
+#   sun_dir : (3,) or (N,3) world-frame direction towards the sun
+#   obs_dir : (3,) world-frame direction towards the observer (None = model's)
+#   brdf    : 'lambert', 'phong' or 'cook-torrance'
+# Returns (N,) brightness
+def simulate(model, quats, sun_dir, obs_dir=None, brdf='phong', scale=1.0):
+    quats   = np.asarray(quats, dtype=float).reshape(-1,4)
+    obs_dir = model["obs_dir"] if obs_dir is None else obs_dir
+    sun_dir = np.asarray(sun_dir, dtype=float)
+    obs_dir = np.asarray(obs_dir, dtype=float)
+    
+    s = toBody(quats, sun_dir/np.linalg.norm(sun_dir, axis=-1, keepdims=True))    # (N,3)
+    o = toBody(quats, obs_dir/np.linalg.norm(obs_dir))                          # (N,3)
+    
+    N = len(quats)
+    F = len(model["normals"])
+    out  = np.empty(N)
+    rows = max(1, CHUNK_SIZE // max(F,1))
+    for start in range(0, N, rows):
+        stop = min(N, start+rows)
+        out[start:stop] = _facetSum(model, s[start:stop], o[start:stop], brdf)
+    return scale*out
+
+# Sum the facet contributions for a block of frames
+def _facetSum(model, s, o, brdf):
+    n   = model["normals"]
+    mu0 = s @ n.T                               # (N,F) cosine of incidence
+    mu  = o @ n.T                               # (N,F) cosine of emission
+    lit = (mu0 > 0) & (mu > 0)                  # Facing both sun and observer
+    mu0 = np.where(lit, mu0, 0.0)
+    mu  = np.where(lit, mu, 0.0)
+    
+    # Diffuse term
+    radiance = model["kd"]/np.pi*mu0
+    
+    # Specular term
+    if brdf == 'phong':
+        # r.o with r = 2(n.s)n - s
+        ro = 2*mu0*mu - np.sum(s*o, axis=1)[:,None]
+        radiance = radiance + model["ks"]*np.power(np.clip(ro, 0, None), model["shininess"])
+    elif brdf == 'cook-torrance':
+        h   = s + o
+        h   = h/np.maximum(np.linalg.norm(h, axis=1, keepdims=True), 1e-12)
+        nh  = np.clip(h @ n.T, 0, 1)
+        vh  = np.clip(np.sum(o*h, axis=1), 0, 1)[:,None]
+        a2  = model["roughness"]**4
+        D   = a2/(np.pi*(nh*nh*(a2 - 1) + 1)**2)
+        Fr  = model["ks"] + (1 - model["ks"])*(1 - vh)**5
+        k   = model["roughness"]**2/2
+        G   = mu0*mu/((mu0*(1 - k) + k)*(mu*(1 - k) + k))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spec = np.where(lit, D*Fr*G/(4*mu), 0.0)
+        radiance = radiance + spec
+    elif brdf != 'lambert':
+        raise ValueError("Unknown BRDF: " + str(brdf))
+    
+    return (radiance*mu*(model["areas"]*model["shadow"])).sum(axis=1)
+
+# Simulate one attitude table (columns q0..q3, t) and write the photometry file
+def simulateCase(model, meta, data, photpath=None, fmt='csv', **kwargs):
+    data = np.asarray(data)
+    phot = simulate(model, data[:,0:4], sunDirection(meta["sun_angle"]), **kwargs)
+    meta = dict(meta, sat_name=meta.get("sat_name") or model["name"])
+    if photpath is not None:
+        df.writePhotometry(photpath, meta, phot, data[:,4], fmt=fmt)
+    return phot
+
+# Simulate a list of attitude tables in one vectorized pass
+#   tables     : List of (N_i,5) attitude tables
+#   sun_angles : Sun angle of each table
+# Returns a list of (N_i,) brightness arrays
+def simulateMany(model, tables, sun_angles, **kwargs):
+    lengths = [len(table) for table in tables]
+    quats   = np.concatenate([np.asarray(table)[:,0:4] for table in tables])
+    sun_dir = np.repeat(sunDirection(np.asarray(sun_angles)), lengths, axis=0)
+    phot    = simulate(model, quats, sun_dir, **kwargs)
+    return np.split(phot, np.cumsum(lengths)[:-1])
+
+# Generate num_cases random attitude cases (as generateAttitudeDataset would)
+# and write their simulated photometry to path
+# Returns (file names, curves per second)
+def simulateDataset(model, num_cases, path, seed=0, fmt='csv', batch=1000, verbose=True, **kwargs):
+    os.makedirs(path, exist_ok=True)
+    filenames = []
+    t_start   = time.perf_counter()
+    for first in range(0, num_cases, batch):
+        metas, tables = [], []
+        for k in range(first, min(num_cases, first+batch)):
+            params    = gad.randomParameters(gads.caseRNG(seed, k))
+            sun_angle = params.pop("sun_angle")
+            tables.append(gad.generateAttitude(**params))
+            metas.append(df.makeMeta(gads.caseFileID(seed, k), params["fps"], params["dur"], sun_angle,
+                                     params["omega"], params["rot_axis"], sat_name=model["name"]))
+        
+        curves = simulateMany(model, tables, [meta["sun_angle"] for meta in metas], **kwargs)
+        for meta, table, phot in zip(metas, tables, curves):
+            filename = meta["sat_name"] + "_" + meta["file_id"] + "." + fmt
+            df.writePhotometry(os.path.join(path, filename), meta, phot, table[:,4], fmt=fmt)
+            filenames.append(filename)
+    
+    elapsed = time.perf_counter() - t_start
+    rate    = num_cases/elapsed if elapsed > 0 else float('inf')
+    if verbose:
+        print("Simulated %d curves in %.2f s (%.1f curves/s)" % (num_cases, elapsed, rate))
+    return filenames, rate
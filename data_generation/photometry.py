@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      photometry
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Loader for photometry files (CSV or binary, see dataFormat.py).
+
+Phot holds one curve: the parsed header fields plus numpy arrays for the
+brightness (phot) and time (t). The body of a file is parsed in a single call
+rather than row by row.
+
+load_directory reads every photometry file in a directory across a process
+pool and returns the curves stacked into one (num_files, num_attributes)
+array together with their metadata, ready for sklearn:
+
+    X, info = load_directory(filepath, num_attributes=288, norm=True)
+    keep    = info["sat_class"] >= 0
+    X, y    = X[keep], info["sat_class"][keep]
+
+"""
+
+#%% IMPORTS %%#
+import os
+import numpy as np
+import dataFormat as df
+import framePhotometry as fp
+from photometryStore import INDEX_DTYPE, EXTENSIONS, satClass
+
+#%% CONSTANTS %%#
+INFO_DTYPE = np.dtype([field for field in INDEX_DTYPE.descr         # Per-file metadata of load_directory
+                       if field[0] not in ("chunk", "offset")])
+
+#%% FUNCTIONS %%#
+
+class Phot:
+    __slots__ = ("file_id", "fps", "dur", "num_frames", "sun_angle", "omega", "rot_axis",
+                 "sat_name", "sat_class", "phot", "t")
+    
+    #%% CONSTRUCTOR %%#
+    def __init__(self, filepath):
+        kind, meta, data = df.load(filepath, mmap=False)
+        if kind != df.PHOTOMETRY:
+            raise NameError('Not a photometry file: ' + str(filepath))
+        
+        self.file_id    = meta["file_id"]                    # File ID
+        self.fps        = meta["fps"]                        # Animation FPS
+        self.dur        = meta["dur"]                        # Animation Duration
+        self.num_frames = len(data)                          # Number of frames
+        self.sun_angle  = meta["sun_angle"]                  # Sun Direction (radians)
+        self.omega      = meta["omega"]                      # Angular Velocity
+        self.rot_axis   = meta["rot_axis"]                   # Rotation Axis
+        self.sat_name   = meta["sat_name"]                   # Satellite Type
+        self.sat_class  = satClass(self.sat_name)            # Class Label (-1 if unrecognized)
+        self.phot       = np.array(data[:,0])                # Photometry
+        self.t          = np.array(data[:,1])                # Time [s]
+    
+    # Normalize the photometry to a peak of 1
+    def norm(self):
+        peak = np.max(self.phot) if self.num_frames else 0.0
+        if peak > 0:
+            self.phot = self.phot/peak
+        return self
+    
+    # Header fields as a dataFormat metadata dictionary
+    def meta(self):
+        return df.makeMeta(self.file_id, self.fps, self.dur, self.sun_angle, self.omega,
+                           self.rot_axis, self.num_frames, self.sat_name)
+
+# Load one file into a fixed-length row
+# Returns (info tuple, row)
+def _loadRow(filepath, num_attributes, norm):
+    p = Phot(filepath)
+    if norm:
+        p.norm()
+    
+    row = np.zeros(num_attributes)
+    n   = min(num_attributes, p.num_frames)
+    row[0:n] = p.phot[0:n]
+    info = (p.file_id, p.sat_name, p.sat_class, p.fps, p.dur, p.num_frames,
+            p.sun_angle, p.omega, p.rot_axis)
+    return info, row
+
+# Load every photometry file in a directory
+#   num_attributes : Columns of X (shorter curves are zero padded, longer ones truncated)
+#   norm           : Normalize each curve to a peak of 1
+#   workers        : Number of reader processes (1 = this process, None = all cores)
+# Returns (X, info): (num_files, num_attributes) photometry and an INFO_DTYPE array
+def load_directory(path, num_attributes=288, norm=False, workers=None, ext=EXTENSIONS):
+    files   = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(ext)]
+    results = fp.mapFrames(_loadRow, files, workers,
+                           num_attributes=num_attributes, norm=norm)
+    
+    X    = np.zeros((len(results), num_attributes))
+    info = np.empty(len(results), dtype=INFO_DTYPE)
+    for i, (record, row) in enumerate(results):
+        info[i] = record
+        X[i]    = row
+    return X, info
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      photometryStore
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Consolidated photometry dataset. A directory of photometry files (CSV or
+binary, see dataFormat.py) is ingested once into a single store, which can then
+be loaded and filtered without touching the source files again.
+
+STORE LAYOUT:
+    index.npy         Metadata table, one record per curve (INDEX_DTYPE)
+    chunk_00000.npz   Curves of one append, float32, concatenated end to end
+    chunk_00001.npz   ...
+
+Each curve is located by its chunk number and its offset into that chunk.
+Chunks are compressed (.npz) by default. A store created with compress=False
+writes plain .npy chunks instead, which are memory-mapped on load, so only the
+pages of the selected curves are read.
+
+Appending writes new chunks and rewrites only the (small) index. Curves are
+identified by (sat_name, file_id), since every satellite rendered from the same
+attitude file shares its file_id. Files whose (sat_name, file_id) is already in
+the store are skipped, so running ingest() again on a growing directory only
+adds the new runs.
+
+EXAMPLE:
+    store = PhotometryStore('./photometry_store')
+    store.ingest('./photometry')
+    rows  = store.select(sat_class=2, omega=lambda w: w > 0.5)
+    X, y  = store.dataset(rows, num_attributes=288)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import numpy as np
+import dataFormat as df
+import framePhotometry as fp
+
+#%% CONSTANTS %%#
+SAT_CLASSES = {"1U-NOWINGS-V1": 0,          # Class label of each satellite
+               "2U-NOWINGS-V1": 1,
+               "6U-NOWINGS-V1": 2}
+
+INDEX_DTYPE = np.dtype([("file_id",    'U32'),
+                        ("sat_name",   'U32'),
+                        ("sat_class",  'i1'),         # -1 for unrecognized satellites
+                        ("fps",        'f8'),
+                        ("dur",        'f8'),
+                        ("num_frames", 'i4'),
+                        ("sun_angle",  'f8'),
+                        ("omega",      'f8'),
+                        ("rot_axis",   'f8', (3,)),
+                        ("chunk",      'i4'),
+                        ("offset",     'i8')])
+
+INDEX_FILE  = 'index.npy'
+EXTENSIONS  = ('.csv', '.bin')
+CACHE_SIZE  = 4                             # Decompressed chunks kept in memory
+
+#%% FUNCTIONS %%#
+
+# Class label of a satellite name
+def satClass(sat_name):
+    return SAT_CLASSES.get(sat_name, -1)
+
+# Read one photometry file
+# Returns (meta, float32 brightness)
+def readCurve(filepath):
+    kind, meta, data = df.load(filepath, mmap=False)
+    if kind != df.PHOTOMETRY:
+        raise NameError('Not a photometry file: ' + str(filepath))
+    return meta, np.asarray(data[:,0], dtype=np.float32)
+
+class PhotometryStore:
+
+    #%% CONSTRUCTOR %%#
+    # Open the store at path, creating it if needed
+    #   compress : Compress new chunks (False = memory-mappable .npy chunks)
+    def __init__(self, path, compress=True):
+        self.path     = path
+        self.compress = compress
+        self._cache   = {}
+        os.makedirs(path, exist_ok=True)
+        
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            self.index = np.load(index_path)
+        else:
+            self.index = np.empty(0, dtype=INDEX_DTYPE)
+    
+    def __len__(self):
+        return len(self.index)
+    
+    #%% WRITING %%#
+    
+    # Number of the next chunk
+    def _nextChunk(self):
+        return int(self.index["chunk"].max()) + 1 if len(self.index) else 0
+    
+    # Chunk file name (compressed or plain)
+    def _chunkPath(self, chunk, compress):
+        return os.path.join(self.path, 'chunk_' + str(chunk).zfill(5) + ('.npz' if compress else '.npy'))
+    
+    # Add curves to the store as one new chunk
+    #   metas  : list of metadata dictionaries (dataFormat.makeMeta)
+    #   curves : list of brightness arrays
+    # Returns the rows added
+    def add(self, metas, curves):
+        if len(metas) == 0:
+            return np.arange(0)
+        chunk   = self._nextChunk()
+        lengths = np.array([len(c) for c in curves], dtype=np.int64)
+        
+        records = np.empty(len(metas), dtype=INDEX_DTYPE)
+        for record, meta in zip(records, metas):
+            record["file_id"]   = meta["file_id"]
+            record["sat_name"]  = meta["sat_name"]
+            record["sat_class"] = satClass(meta["sat_name"])
+            record["fps"]       = meta["fps"]
+            record["dur"]       = meta["dur"]
+            record["sun_angle"] = meta["sun_angle"]
+            record["omega"]     = meta["omega"]
+            record["rot_axis"]  = meta["rot_axis"]
+        records["num_frames"] = lengths
+        records["chunk"]      = chunk
+        records["offset"]     = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        
+        # Data first, then the index, so an interrupted append leaves the store valid
+        data = np.concatenate([np.asarray(c, dtype=np.float32) for c in curves])
+        if self.compress:
+            np.savez_compressed(self._chunkPath(chunk, True), phot=data)
+        else:
+            np.save(self._chunkPath(chunk, False), data)
+        
+        rows = np.arange(len(self.index), len(self.index)+len(records))
+        self.index = np.concatenate((self.index, records))
+        tmp_path = os.path.join(self.path, INDEX_FILE + '.tmp.npy')
+        np.save(tmp_path, self.index)
+        os.replace(tmp_path, os.path.join(self.path, INDEX_FILE))
+        return rows
+    
+    # (sat_name, file_id) keys of the curves in the store
+    def _keys(self):
+        return set(zip(self.index["sat_name"].tolist(), self.index["file_id"].tolist()))
+    
+    # Read photometry files and add the ones not yet in the store
+    #   workers : Number of reader processes (None = all cores)
+    # Returns the rows added
+    def append(self, filepaths, workers=None):
+        known   = self._keys()
+        results = fp.mapFrames(readCurve, list(filepaths), workers)
+        
+        metas, curves = [], []
+        for meta, curve in results:
+            key = (meta["sat_name"], meta["file_id"])
+            if key in known:
+                continue
+            known.add(key)
+            metas.append(meta)
+            curves.append(curve)
+        return self.add(metas, curves)
+    
+    # Add every new photometry file in a directory
+    # Files named <sat_name>_<file_id>.<ext> with a known (sat_name, file_id) are skipped without being read
+    # Returns the rows added
+    def ingest(self, directory, workers=None, ext=EXTENSIONS):
+        known = self._keys()
+        filepaths = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                     if name.endswith(ext) and tuple(os.path.splitext(name)[0].rsplit('_', 1)) not in known]
+        return self.append(filepaths, workers)
+    
+    #%% READING %%#
+    
+    # Brightness array of a whole chunk (memory-mapped for plain chunks)
+    def _chunk(self, chunk):
+        if chunk in self._cache:
+            return self._cache[chunk]
+        
+        if os.path.exists(self._chunkPath(chunk, False)):
+            data = np.load(self._chunkPath(chunk, False), mmap_mode='r')
+        else:
+            with np.load(self._chunkPath(chunk, True)) as npz:
+                data = npz["phot"]
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[chunk] = data
+        return data
+    
+    # Rows whose metadata pass every filter
+    #   where   : Optional boolean mask over the index, or a function of the index returning one
+    #   filters : field=value (equality), field=(lo, hi) (lo <= value < hi, None for open ends)
+    #             or field=function (applied to the whole column, returns a mask)
+    # Returns an array of row numbers
+    def select(self, where=None, **filters):
+        mask = np.ones(len(self.index), dtype=bool)
+        if where is not None:
+            mask &= where(self.index) if callable(where) else np.asarray(where, dtype=bool)
+        
+        for field, value in filters.items():
+            column = self.index[field]
+            if callable(value):
+                mask &= np.asarray(value(column), dtype=bool)
+            elif isinstance(value, tuple):
+                lo, hi = value
+                if lo is not None:
+                    mask &= column >= lo
+                if hi is not None:
+                    mask &= column < hi
+            else:
+                mask &= column == value
+        return np.flatnonzero(mask)
+    
+    # Brightness of one row
+    def curve(self, row):
+        record = self.index[row]
+        start  = int(record["offset"])
+        return np.array(self._chunk(int(record["chunk"]))[start:start+int(record["num_frames"])])
+    
+    # Time vector of one row
+    def time(self, row):
+        record = self.index[row]
+        return fp.timeVector(int(record["num_frames"]), record["fps"])
+    
+    # Curves of the given rows in one (len(rows), num_attributes) float32 matrix
+    # Shorter curves are padded with fill, longer ones are truncated
+    #   rows           : Row numbers (None = all)
+    #   num_attributes : Number of columns (None = longest selected curve)
+    def matrix(self, rows=None, num_attributes=None, fill=0.0):
+        rows    = np.arange(len(self.index)) if rows is None else np.asarray(rows).reshape(-1)
+        records = self.index[rows]
+        if num_attributes is None:
+            num_attributes = int(records["num_frames"].max()) if len(rows) else 0
+        
+        X    = np.full((len(rows), num_attributes), fill, dtype=np.float32)
+        cols = np.arange(num_attributes)
+        for chunk in np.unique(records["chunk"]):
+            which = np.flatnonzero(records["chunk"] == chunk)
+            data  = self._chunk(int(chunk))
+            
+            # Gather every selected curve of the chunk in one indexing operation
+            n     = records["num_frames"][which, None]
+            valid = cols < n
+            idx   = records["offset"][which, None] + np.minimum(cols, np.maximum(n-1, 0))
+            X[which] = np.where(valid, data[idx] if len(data) else fill, fill)
+        return X
+    
+    # Attribute matrix and class labels for training
+    # Returns (X, y)
+    def dataset(self, rows=None, num_attributes=None, fill=0.0):
+        rows = np.arange(len(self.index)) if rows is None else np.asarray(rows).reshape(-1)
+        return self.matrix(rows, num_attributes, fill), self.index["sat_class"][rows].astype(float)
@@ -8,6 +8,10 @@ DESCRIPTION:
     
 A quaternion object class.
 Operators have been overriden for quaternion arithmetic.
+
+QuatArray holds many quaternions in one (N,4) numpy array for batch attitude
+math. It supports the same operations as Quat over whole arrays at once and
+mixes freely with Quat objects in arithmetic.
     
 """
 
@@ -91,6 +95,8 @@ class Quat:
         
     # Quaternion Multiplication
     def __mul__(self,other):
+        if isinstance(other, QuatArray):
+            return QuatArray(self)*other
         q0 = self.q0*other.q0-self.q1*other.q1-self.q2*other.q2-self.q3*other.q3
         q1 = self.q0*other.q1+self.q1*other.q0+self.q2*other.q3-self.q3*other.q2
         q2 = self.q0*other.q2-self.q1*other.q3+self.q2*other.q0+self.q3*other.q1
@@ -108,4 +114,200 @@ class Quat:
     # Quaternion Division
     def __truediv__(self,other):
         return self*other.inv()
-    
\ No newline at end of file
+    
+
+class QuatArray:
+    # An array of quaternions stored as a contiguous (N,4) numpy array with
+    # columns (q0, q1, q2, q3). Operations act on the whole array at once and
+    # broadcast a single quaternion (N = 1) against many.
+    
+    # Class Variables
+    q = None;           # (N,4) Quaternion Array
+    
+    # Constructor
+    # q : (N,4) or (4,) array-like, a Quat, a list of Quat objects, or a QuatArray
+    def __init__(self, q=None):
+        if q is None:
+            q = np.zeros((0,4))
+        elif isinstance(q, QuatArray):
+            q = q.q
+        elif isinstance(q, Quat):
+            q = [[q.q0, q.q1, q.q2, q.q3]]
+        elif len(q) > 0 and isinstance(q[0], Quat):
+            q = [[p.q0, p.q1, p.q2, p.q3] for p in q]
+        
+        q = np.ascontiguousarray(q, dtype=float)
+        if q.ndim == 1:
+            q = q.reshape(1,4)
+        if q.ndim != 2 or q.shape[1] != 4:
+            raise Exception("Quaternion array must have shape (N,4)");
+        self.q = q;
+        
+    # Build From Rotation Angles and Axes
+    # angle : scalar or (N,) array of angles [rad]
+    # axis  : (3,) or (N,3) array of rotation axes (need not be normalized)
+    @classmethod
+    def fromAngleAxis(cls, angle, axis):
+        qa = cls()
+        qa.setAngleAxis(angle, axis)
+        return qa
+    
+    # Set With Axis and Angle
+    def setAngleAxis(self, angle, axis):
+        angle = np.asarray(angle, dtype=float).reshape(-1)
+        axis  = np.asarray(axis, dtype=float).reshape(-1,3)
+        
+        # Normalize
+        normAxis = axis / np.sqrt(np.sum(axis**2, axis=1))[:,None]
+        
+        # Scalar and Vector Components
+        n = max(len(angle), len(normAxis))
+        q = np.empty((n,4))
+        q[:,0]  = np.cos(angle/2)
+        q[:,1:] = np.sin(angle/2)[:,None]*normAxis
+        self.q = q;
+        
+    # Component Views
+    @property
+    def q0(self):
+        return self.q[:,0]
+    
+    @property
+    def q1(self):
+        return self.q[:,1]
+    
+    @property
+    def q2(self):
+        return self.q[:,2]
+    
+    @property
+    def q3(self):
+        return self.q[:,3]
+    
+    # Normalize all quaternions in place
+    def normalize(self):
+        mag = self.getMagnitude()
+        if np.any(mag == 0):
+            raise Exception("Cannot normalize quaternion with magnitude of 0");
+        self.q /= mag[:,None]
+        
+    # Return Rotation Angles
+    def getAngle(self):
+        return np.arccos(np.clip(self.q[:,0], -1, 1))*2
+    
+    # Return Rotation Axes
+    # Zero rotations have no defined axis and are returned as the x-axis
+    def getAxis(self):
+        halfSin = np.sin(self.getAngle()/2)
+        axis    = np.tile([1.0, 0.0, 0.0], (len(self), 1))
+        nz      = halfSin != 0
+        axis[nz] = self.q[nz,1:]/halfSin[nz,None]
+        return axis
+    
+    # Return Magnitudes
+    def getMagnitude(self):
+        return np.sqrt(np.sum(self.q**2, axis=1))
+    
+    # Conjugate
+    def conj(self):
+        return QuatArray(self.q*[1,-1,-1,-1])
+    
+    # Inverse
+    def inv(self):
+        mag2 = np.sum(self.q**2, axis=1)
+        return QuatArray(self.q*[1,-1,-1,-1]/mag2[:,None])
+    
+    # Rotation Matrices (N,3,3) of the normalized quaternions
+    def toRotationMatrix(self):
+        q0, q1, q2, q3 = (self.q/self.getMagnitude()[:,None]).T
+        R = np.empty((len(self),3,3))
+        R[:,0,0] = 1 - 2*(q2*q2 + q3*q3)
+        R[:,0,1] = 2*(q1*q2 - q0*q3)
+        R[:,0,2] = 2*(q1*q3 + q0*q2)
+        R[:,1,0] = 2*(q1*q2 + q0*q3)
+        R[:,1,1] = 1 - 2*(q1*q1 + q3*q3)
+        R[:,1,2] = 2*(q2*q3 - q0*q1)
+        R[:,2,0] = 2*(q1*q3 - q0*q2)
+        R[:,2,1] = 2*(q2*q3 + q0*q1)
+        R[:,2,2] = 1 - 2*(q1*q1 + q2*q2)
+        return R
+    
+    # Rotate Vectors (q v q^-1)
+    # v : (3,) or (M,3) array. Broadcasts one quaternion against many vectors,
+    #     many quaternions against one vector, or pairs them up when N == M.
+    def rotate(self, v):
+        v = np.asarray(v, dtype=float)
+        u = self.q[:,1:]/self.getMagnitude()[:,None]
+        w = self.q[:,0:1]/self.getMagnitude()[:,None]
+        uv = np.cross(u, v)
+        return v + 2*(w*uv + np.cross(u, uv))
+    
+    # Spherical Linear Interpolation towards other (unit quaternions)
+    # s : scalar or (N,) interpolation fractions, 0 gives self and 1 gives other.
+    #     Follows the shorter arc (other is flipped when the dot product is negative).
+    def slerp(self, other, s):
+        a   = self.q
+        b   = QuatArray(other).q
+        s   = np.asarray(s, dtype=float).reshape(-1,1)
+        dot = np.sum(a*b, axis=1, keepdims=True)
+        b   = np.where(dot < 0, -b, b)
+        dot = np.clip(np.abs(dot), 0, 1)
+        
+        # Nearly parallel: fall back to normalized linear interpolation
+        theta = np.arccos(dot)
+        sin_t = np.sin(theta)
+        small = sin_t < 1e-9
+        safe  = np.where(small, 1, sin_t)
+        wa = np.where(small, 1-s, np.sin((1-s)*theta)/safe)
+        wb = np.where(small, s, np.sin(s*theta)/safe)
+        q  = wa*a + wb*b
+        return QuatArray(q/np.sqrt(np.sum(q**2, axis=1))[:,None])
+    
+    # Return a list of Quat objects
+    def toQuats(self):
+        return [Quat(*row) for row in self.q.tolist()]
+        
+    ## OPERATORS ##
+    
+    def __len__(self):
+        return self.q.shape[0]
+    
+    # Integer index returns a Quat, anything else a QuatArray
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return Quat(*self.q[key].tolist())
+        return QuatArray(self.q[key])
+    
+    def __iter__(self):
+        return iter(self.toQuats())
+    
+    def __array__(self, dtype=None, copy=None):
+        return self.q if dtype is None else self.q.astype(dtype)
+    
+    # Quaternion Multiplication
+    def __mul__(self, other):
+        if isinstance(other, Quat):
+            other = QuatArray(other)
+        a0, a1, a2, a3 = self.q.T
+        b0, b1, b2, b3 = other.q.T
+        q = np.empty((max(len(self), len(other)),4))
+        q[:,0] = a0*b0-a1*b1-a2*b2-a3*b3
+        q[:,1] = a0*b1+a1*b0+a2*b3-a3*b2
+        q[:,2] = a0*b2-a1*b3+a2*b0+a3*b1
+        q[:,3] = a0*b3+a1*b2-a2*b1+a3*b0
+        return QuatArray(q)
+    
+    def __rmul__(self, other):
+        return QuatArray(other)*self
+    
+    # Quaternion Addition
+    def __add__(self, other):
+        return QuatArray(self.q + QuatArray(other).q)
+    
+    # Quaternion Subtraction
+    def __sub__(self, other):
+        return QuatArray(self.q - QuatArray(other).q)
+    
+    # Quaternion Division
+    def __truediv__(self, other):
+        return self*QuatArray(other).inv()
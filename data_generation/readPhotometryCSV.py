@@ -11,8 +11,7 @@ Read and plot photometry from a CSV file generated by blenderRenderRotation.py
 
 #%% IMPORTS %%#
 import matplotlib.pyplot as plt
-import numpy as np
-import csv
+import photometry
 
 #%% USER INPUTS %%#
 filename = '2U-NOWINGS-V1_202202251510150000.csv';
@@ -22,49 +21,18 @@ path     = './photometry/';
 
 # Load File
 filepath = path + filename;
-phot_file = open(filepath);
-csvreader = csv.reader(phot_file);
-
-# Parse CSV File
-i = 0;
-j = 0;
-for row in csvreader:
-    # Skip Text Lines
-    if i == 0 or i == 2 or i == 4:
-        i+=1;
-        continue;
-    
-    # Header Line 1
-    if i == 1:
-        # Read Data
-        file_id    = row[0];            # File ID for saving
-        fps        = float(row[1]);     # Animation FPS
-        dur        = float(row[2]);     # Animation Duration
-        num_frames = int(row[3]);       # Number of frames
-        sun_angle  = float(row[4]);     # Sun Direction (radians)
-        
-        # Initialize Vectors
-        phot = np.zeros(num_frames);    # Normalized Photometry Data
-        t    = np.zeros(num_frames);    # Time [s]
-        i+=1;
-        continue;
-    
-    # Header Line 2
-    if i == 3:
-        omega    = row[0];              # Angular Velocity [s^-1]
-        x_rot    = row[1];              # Rotation Axis X
-        y_rot    = row[2];              # Rotation Axis Y
-        z_rot    = row[3];              # Rotation Axis Z
-        sat_name = row[4];              # Satellite Type
-        i+=1;
-        continue;
-    
-    # Phot Data
-    phot[j] = float(row[0]); 
-    t[j]    = float(row[1]);
-    j+=1;
-
-phot_file.close();
+phot1    = photometry.Phot(filepath);
+
+file_id    = phot1.file_id;             # File ID for saving
+fps        = phot1.fps;                 # Animation FPS
+dur        = phot1.dur;                 # Animation Duration
+num_frames = phot1.num_frames;          # Number of frames
+sun_angle  = phot1.sun_angle;           # Sun Direction (radians)
+omega      = phot1.omega;               # Angular Velocity [s^-1]
+x_rot, y_rot, z_rot = phot1.rot_axis;   # Rotation Axis
+sat_name   = phot1.sat_name;            # Satellite Type
+phot       = phot1.phot;                # Normalized Photometry Data
+t          = phot1.t;                   # Time [s]
 
 #%% PLOT AND PROCESS %%#
 plt.plot(t,phot,'.-');
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      relight
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Deferred relighting: computes photometry for many sun directions from one set
+of stored geometry passes (see gbuffer.py and
+blenderScripts/modules/renderGBuffer.py).
+
+For every foreground pixel the Lambertian radiance albedo * max(0, n.s) is
+evaluated for a whole batch of sun directions at once. The result is summed
+per frame and divided by the frame's pixel count, giving the same
+mean-pixel brightness that generatePhotometry computes from rendered frames.
+The normal pass is in world space, so sun directions are world-space too.
+sun_angle values are converted exactly as blenderRenderRotation does.
+
+Limitations: cast shadows depend on the sun and are not in the passes, so
+parts of the body shadowed by other parts are lit as if unoccluded. Only the
+diffuse term is relit.
+
+INPUTS:
+
+gbpath     : G-buffer file saved by blenderRenderRotation in 'gbuffer' mode
+             (<sat_name>_<file_id>.gbuf.npz)
+num_angles : Number of sun angles, evenly spaced over [0, 2 pi)
+photpath   : Photometry output directory
+fmt        : Output format, 'csv' or 'bin' (see dataFormat)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import numpy as np
+import dataFormat as df
+import framePhotometry as fp
+import gbuffer as gbuf
+from lightCurveSim import sunDirection
+
+#%% CONSTANTS %%#
+CHUNK_SIZE = 2**23          # Pixel x sun elements per pass
+
+#%% FUNCTIONS %%#
+
+# Sun direction at phase angle (radians) from a view direction
+#   view_dir : (3,) direction towards the observer
+#   azimuth  : rotation of the sun about the view direction [rad]
+def sunFromPhase(phase, view_dir, azimuth=0.0):
+    v = np.asarray(view_dir, dtype=float)
+    v = v/np.linalg.norm(v)
+    
+    # Two unit vectors perpendicular to the view direction
+    a  = np.array([0.0, 0.0, 1.0]) if abs(v[2]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    e1 = np.cross(v, a)
+    e1 = e1/np.linalg.norm(e1)
+    e2 = np.cross(v, e1)
+    
+    phase   = np.asarray(phase, dtype=float)[...,None]
+    azimuth = np.asarray(azimuth, dtype=float)[...,None]
+    return np.cos(phase)*v + np.sin(phase)*(np.cos(azimuth)*e1 + np.sin(azimuth)*e2)
+
+# Brightness of every frame for every sun direction
+#   gb       : G-buffer (from gbuffer.loadGBuffer)
+#   sun_dirs : (M,3) world-space directions towards the sun
+# Returns (M, num_frames) brightness
+def relight(gb, sun_dirs):
+    sun_dirs = np.asarray(sun_dirs, dtype=np.float32).reshape(-1,3)
+    sun_dirs = sun_dirs/np.linalg.norm(sun_dirs, axis=1, keepdims=True)
+    
+    normal = gb["normal"]
+    albedo = gb["albedo"]
+    counts = gb["counts"]
+    frame  = np.repeat(np.arange(len(counts)), counts)           # Frame of every pixel
+    
+    sums  = np.zeros((len(counts), len(sun_dirs)))
+    block = max(1, CHUNK_SIZE // len(sun_dirs))
+    for start in range(0, len(normal), block):
+        stop  = min(len(normal), start+block)
+        shade = np.maximum(normal[start:stop] @ sun_dirs.T, 0)*albedo[start:stop,None]
+        _addRows(sums, frame[start:stop], shade)
+    return (sums/(gb["width"]*gb["height"])).T
+
+# Add rows of values into sums grouped by (sorted) frame index
+def _addRows(sums, frame, values):
+    starts = np.flatnonzero(np.r_[True, frame[1:] != frame[:-1]])
+    sums[frame[starts]] += np.add.reduceat(values, starts, axis=0)
+
+# Brightness for blenderRenderRotation style sun angles
+# Returns (M, num_frames) brightness
+def relightAngles(gb, sun_angles):
+    return relight(gb, sunDirection(np.asarray(sun_angles).reshape(-1)))
+
+# Relight one stored sequence for many sun angles and write a photometry file for each
+# File IDs get a 3-digit suffix for the sun angle index
+# Returns the list of written file names
+def relightToFiles(gbpath, sun_angles, photpath, fmt='csv'):
+    gb     = gbuf.loadGBuffer(gbpath)
+    curves = relightAngles(gb, sun_angles)
+    t      = fp.timeVector(curves.shape[1], gb["fps"])
+    
+    filenames = []
+    for k, (sun_angle, phot) in enumerate(zip(np.reshape(sun_angles, -1), curves)):
+        file_id  = gb["file_id"] + str(k).zfill(3)
+        meta     = df.makeMeta(file_id, gb["fps"], gb["dur"], sun_angle, gb["omega"],
+                               gb["rot_axis"], sat_name=gb["sat_name"])
+        filename = gb["sat_name"] + "_" + file_id + "." + fmt
+        df.writePhotometry(os.path.join(photpath, filename), meta, phot, t, fmt=fmt)
+        filenames.append(filename)
+    return filenames
+
+
+#%% ********************** BEGIN RELIGHTING ********************** %%#
+if __name__ == "__main__":
+    
+    #%% USER INPUT %%#
+    gbpath     = "./photometry/Satellite_000000000000000000.gbuf.npz";
+    num_angles = 36;
+    photpath   = "./photometry/";
+    fmt        = 'csv';
+    
+    sun_angles = np.linspace(0, 2*np.pi, num_angles, endpoint=False);
+    filenames  = relightToFiles(gbpath, sun_angles, photpath, fmt);
+    print(str(len(filenames)) + " photometry files written to " + photpath);
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      renderCache
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Content-addressed manifest of rendered cases, so repeated and interrupted
+dataset builds only render what is new.
+
+Every render job gets a key: the SHA-1 hash of everything its output depends
+on.
+
+    attitude : Contents of the attitude file
+    model    : Contents of the .blend file
+    settings : Render settings (satellite name, render mode, ...) and the
+               code version, a hash of the render script and the Blender
+               helper modules. The reduction parameters (NORM_FAC, luminance
+               weights, ...) are constants in those modules, so any change
+               to them also changes the key.
+
+The manifest is a JSON lines file with one record per completed job (key,
+case, output file with its size and modification time). A record is appended
+and flushed as soon as its case is done. A crash therefore loses at most the
+case that was in progress. A torn last line is ignored on loading, and the next
+record starts on a new line so it is not merged into it. Re-running the same
+batch skips every case whose key already has a record whose output file still
+exists unchanged (same size and modification time), and renders only the rest.
+
+File hashes are memoized by (path, size, modification time) so the .blend file
+is read once per run, not once per case.
+
+EXAMPLE:
+    manifest = RenderManifest('./photometry/render_manifest.jsonl')
+    renderScheduler.renderAll(cases, photpath, renderpath, manifest=manifest)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import json
+import time
+import hashlib
+import threading
+
+#%% CONSTANTS %%#
+HASH_BLOCK = 1 << 20                        # Bytes read per hash update
+
+#%% FUNCTIONS %%#
+
+# SHA-1 of a file's contents
+def fileHash(filepath):
+    h = hashlib.sha1()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK), b''):
+            h.update(block)
+    return h.hexdigest()
+
+# Hash of several source files (order independent of the caller's list order)
+def codeVersion(filepaths):
+    h = hashlib.sha1()
+    for filepath in sorted(filepaths):
+        h.update(os.path.basename(filepath).encode())
+        h.update(fileHash(filepath).encode())
+    return h.hexdigest()
+
+class RenderManifest:
+
+    #%% CONSTRUCTOR %%#
+    #   path : JSON lines manifest file (created on the first record)
+    def __init__(self, path):
+        self.path    = path
+        self.entries = {}                   # key : record
+        self._hashes = {}                   # (path, size, mtime) : SHA-1
+        self._lock   = threading.Lock()
+        self._torn   = False                # File ends in a partial line
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.load()
+    
+    # Read the records written so far (a torn last line from a crash is skipped)
+    def load(self):
+        self.entries = {}
+        self._torn   = False
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as file:
+            for line in file:
+                self._torn = not line.endswith('\n')
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[record["key"]] = record
+    
+    # Memoized SHA-1 of a file
+    def fileHash(self, filepath):
+        stat = os.stat(filepath)
+        memo = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+        if memo not in self._hashes:
+            self._hashes[memo] = fileHash(filepath)
+        return self._hashes[memo]
+    
+    # Key of one render job
+    #   case       : Attitude file
+    #   blend_file : Scene file
+    #   settings   : JSON-serializable render settings and reduction parameters
+    def jobKey(self, case, blend_file, settings):
+        job = {"attitude": self.fileHash(case), "model": self.fileHash(blend_file),
+               "settings": settings}
+        return hashlib.sha1(json.dumps(job, sort_keys=True, default=str).encode()).hexdigest()
+    
+    # Output file of a completed job, or None if it still has to be rendered
+    def lookup(self, key):
+        record = self.entries.get(key)
+        if record is None:
+            return None
+        try:
+            stat = os.stat(record["output"])
+        except OSError:
+            return None
+        if stat.st_size != record["size"] or stat.st_mtime_ns != record["mtime"]:
+            return None                     # Overwritten since (e.g. by a job with another key)
+        return record["output"]
+    
+    # Append a completed job to the manifest
+    def record(self, key, case, output):
+        stat   = os.stat(output)
+        record = {"key": key, "case": case, "output": output,
+                  "size": stat.st_size, "mtime": stat.st_mtime_ns, "time": time.time()}
+        with self._lock:
+            self.entries[key] = record
+            with open(self.path, 'a') as file:
+                file.write(('\n' if self._torn else '') + json.dumps(record) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+            self._torn = False
+    
+    # Split cases into cached and pending jobs
+    # Returns (dict of case -> key, dict of case -> cached output, list of pending cases)
+    def plan(self, cases, blend_file, settings):
+        keys    = {}
+        cached  = {}
+        pending = []
+        for case in cases:
+            keys[case] = self.jobKey(case, blend_file, settings)
+            output     = self.lookup(keys[case])
+            if output is None:
+                pending.append(case)
+            else:
+                cached[case] = output
+        return keys, cached, pending
+    
+    # Rewrite the manifest with one line per key, dropping records whose output is gone
+    def compact(self):
+        with self._lock:
+            self.entries = {key: record for key, record in self.entries.items()
+                            if self.lookup(key) is not None}
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as file:
+                file.write(''.join(json.dumps(record) + '\n' for record in self.entries.values()))
+            os.replace(tmp, self.path)
+            self._torn = False
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      renderScheduler
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Renders every attitude file in a rotation_data directory with several
+background Blender processes at once.
+
+Each worker is a long-running process started as
+
+    blender -b satellite.blend --python blenderRenderRotation.py -- --serve ...
+
+It reads attitude file paths from stdin and answers each one with a result
+line on stdout (see blenderRenderRotation.PROTOCOL_TAG):
+
+    @@MA540 READY <pid>
+    @@MA540 DONE <photometry file>
+    @@MA540 FAIL <error>
+
+Cases are handed out through a shared work queue. A worker that exits or
+stops answering within the case timeout is restarted, and its case is put
+back on the queue until max_retries is reached. Any executable that speaks
+the same protocol can stand in for Blender (blender_exe), which is how the
+scheduler is tested without a Blender install (see tests/fakeBlender.py).
+
+With a manifest (see renderCache.py) each case is keyed by a hash of its
+attitude file, the .blend file, the render settings and the code version.
+Cases whose key already has a rendered output are skipped, and every finished
+case is recorded as soon as it is done, so an interrupted batch resumes where
+it stopped and a repeated build only renders new or changed cases.
+
+Each worker renders into its own sub-directory of renderpath so frames from
+different cases never mix. Workers are started with BLENDER_USER_SCRIPTS
+pointing at ./blenderScripts (unless already set) so the helper modules there
+are importable.
+
+INPUTS:
+
+rotdir      : Directory of attitude files (.csv or .bin)
+photpath    : Photometry output directory
+renderpath  : Render output directory (one sub-directory per worker)
+num_workers : Number of Blender processes
+blender_exe : Blender executable (or a stand-in command list)
+blend_file  : Scene to render
+sat_name    : Satellite name written to the photometry files
+mode        : Render mode ('stream' or 'memory')
+max_retries : Attempts per case after a worker crash or timeout
+timeout     : Seconds a single case may take (None = no limit)
+manifest    : Render manifest file or RenderManifest (None = render everything)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import time
+import queue
+import threading
+import subprocess
+import renderCache as rc
+
+#%% CONSTANTS %%#
+PROTOCOL_TAG = '@@MA540'                            # Prefix of worker result lines
+HERE         = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR  = os.path.join(HERE, 'blenderScripts')      # Blender user scripts (modules/ is importable)
+
+#%% FUNCTIONS %%#
+
+# List the attitude files in a directory
+def discoverCases(rotdir, exts=('.csv', '.bin')):
+    return [os.path.join(rotdir, name) for name in sorted(os.listdir(rotdir))
+            if name.endswith(exts)]
+
+class BlenderWorker:
+    
+    # Worker process state
+    proc    = None;         # subprocess.Popen
+    lines   = None;         # Queue of (status, text) result lines
+    
+    #%% CONSTRUCTOR %%#
+    def __init__(self, command, log=None, env=None):
+        self.command = command
+        self.log     = log
+        self.env     = env
+        self.start()
+    
+    # Launch the process and a thread that picks result lines out of its output
+    def start(self):
+        self.lines = queue.Queue()
+        self.proc  = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT, text=True, bufsize=1, env=self.env)
+        threading.Thread(target=self._read, args=(self.proc, self.lines), daemon=True).start()
+    
+    # Forward protocol lines to the queue, everything else to the log
+    def _read(self, proc, lines):
+        for line in proc.stdout:
+            if line.startswith(PROTOCOL_TAG):
+                parts = line[len(PROTOCOL_TAG):].strip().split(' ', 1)
+                lines.put((parts[0], parts[1] if len(parts) > 1 else ''))
+            elif self.log is not None:
+                self.log.write(line)
+        lines.put(('EXIT', str(proc.wait())))
+    
+    # Wait for the next result line (status is 'TIMEOUT' if none arrives)
+    def result(self, timeout=None):
+        try:
+            return self.lines.get(timeout=timeout)
+        except queue.Empty:
+            return 'TIMEOUT', ''
+    
+    # Hand one case to the worker and wait for its result
+    def render(self, case, timeout=None):
+        try:
+            self.proc.stdin.write(case + '\n')
+            self.proc.stdin.flush()
+        except OSError:
+            return 'EXIT', 'stdin closed'
+        return self.result(timeout)
+    
+    # Wait for the READY line, restarting up to retries times if it never comes
+    def ready(self, timeout=None, retries=0):
+        for attempt in range(retries+1):
+            status, text = self.result(timeout)
+            if status == 'READY':
+                return True
+            self.restart()
+        return False
+    
+    # Kill the process and start a fresh one
+    def restart(self):
+        self.stop(kill=True)
+        self.start()
+    
+    # Close stdin so the worker exits (or kill it)
+    def stop(self, kill=False):
+        try:
+            if kill:
+                self.proc.kill()
+            else:
+                self.proc.stdin.close()
+            self.proc.wait(timeout=None if not kill else 10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+# Command line for one worker (blender_exe may be a list, e.g. [python, stand-in script])
+def workerCommand(blender_exe, blend_file, script, renderdir, photpath, sat_name, mode):
+    exe = list(blender_exe) if isinstance(blender_exe, (list, tuple)) else [blender_exe]
+    return exe + ['-b', blend_file, '--python', script, '--', '--serve',
+            '--renderpath', renderdir + os.sep, '--photpath', photpath,
+            '--sat-name', sat_name, '--mode', mode]
+
+# Settings that go into the manifest key of every case
+def renderSettings(script, sat_name, mode, settings=None):
+    modules = os.path.join(SCRIPTS_DIR, 'modules')
+    sources = [script] + [os.path.join(modules, name) for name in os.listdir(modules)
+                          if name.endswith('.py')]
+    return {"sat_name": sat_name, "mode": mode, "code": rc.codeVersion(sources),
+            "extra": settings or {}}
+
+# Render all cases with num_workers Blender processes
+#   manifest : Manifest path or renderCache.RenderManifest. Cases already in it are not rendered again
+#   settings : Extra settings for the manifest key (anything that changes the output but
+#              is not in the scene, script or modules)
+# Returns (dict of case -> photometry file, dict of case -> error message)
+def renderAll(cases, photpath, renderpath, num_workers=None, blender_exe='blender',
+              blend_file=os.path.join(HERE, 'satellite.blend'),
+              script=os.path.join(HERE, 'blenderRenderRotation.py'),
+              sat_name='Satellite', mode='stream', max_retries=2, timeout=None,
+              verbose=True, done=None, manifest=None, settings=None):
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    os.makedirs(photpath, exist_ok=True)
+    
+    env = dict(os.environ)
+    env.setdefault('BLENDER_USER_SCRIPTS', SCRIPTS_DIR)
+    
+    results = {}
+    keys    = {}
+    total   = len(cases)
+    if manifest is not None:
+        if not isinstance(manifest, rc.RenderManifest):
+            manifest = rc.RenderManifest(manifest)
+        keys, results, cases = manifest.plan(cases, blend_file,
+                                             renderSettings(script, sat_name, mode, settings))
+        if verbose:
+            print("%d cases already rendered, %d to render" % (len(results), len(cases)))
+    num_cached = len(results)
+    
+    jobs = queue.Queue()
+    for case in cases:
+        jobs.put((case, 0))
+    
+    failures = {}
+    lock     = threading.Lock()
+    t_start  = time.perf_counter()
+    
+    # Worker thread: owns one Blender process and feeds it cases from the queue
+    def run(w):
+        renderdir = os.path.join(renderpath, 'worker' + str(w).zfill(2))
+        os.makedirs(renderdir, exist_ok=True)
+        worker = BlenderWorker(workerCommand(blender_exe, blend_file, script, renderdir,
+                                             photpath, sat_name, mode), env=env)
+        if not worker.ready(timeout, max_retries):
+            worker.stop(kill=True)
+            return
+        
+        while True:
+            try:
+                case, attempts = jobs.get_nowait()
+            except queue.Empty:
+                break
+            
+            status, text = worker.render(case, timeout)
+            with lock:
+                if status == 'DONE':
+                    results[case] = text
+                    if manifest is not None and os.path.isfile(text):
+                        manifest.record(keys[case], case, text)
+                    if done is not None:
+                        done(case, text)
+                    if verbose:
+                        rate = (len(results) - num_cached)/(time.perf_counter() - t_start)
+                        print("[%d/%d] %s (%.3f cases/s)" % (len(results), total, os.path.basename(case), rate))
+                elif status == 'FAIL':
+                    failures[case] = text
+                    if verbose:
+                        print("FAILED " + case + ": " + text)
+                elif attempts < max_retries:
+                    jobs.put((case, attempts+1))        # Crash or timeout: retry elsewhere
+                else:
+                    failures[case] = "worker " + status.lower() + " " + text
+            
+            if status in ('EXIT', 'TIMEOUT'):
+                worker.restart()
+                if not worker.ready(timeout, max_retries):
+                    worker.stop(kill=True)
+                    return
+        worker.stop()
+    
+    threads = [threading.Thread(target=run, args=(w,)) for w in range(min(num_workers, len(cases)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Cases left over when every worker failed to start
+    while not jobs.empty():
+        case, attempts = jobs.get_nowait()
+        failures[case] = "no worker available"
+    
+    if verbose:
+        elapsed = time.perf_counter() - t_start
+        print("Rendered %d cases (%d cached, %d failed) in %.1f s with %d workers"
+              % (len(results) - num_cached, num_cached, len(failures), elapsed, len(threads)))
+    return results, failures
+
+
+#%% ********************** BEGIN RENDERING ********************** %%#
+if __name__ == "__main__":
+    
+    #%% USER INPUT %%#
+    rotdir      = "./rotation_data/";
+    photpath    = "./photometry/";
+    renderpath  = "./render/";
+    num_workers = None;
+    blender_exe = "blender";
+    sat_name    = "Satellite";
+    manifest    = "./photometry/render_manifest.jsonl";   # None = render everything
+    
+    renderAll(discoverCases(rotdir), photpath, renderpath, num_workers,
+              blender_exe=blender_exe, sat_name=sat_name, manifest=manifest);
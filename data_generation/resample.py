@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      resample
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Resamples a batch of light curves of different lengths onto one common grid,
+so every curve gives the same number of features without zero padding.
+
+The whole batch is handled at once. The curves are concatenated end to end
+and each one is shifted in time by a per-curve offset, so the concatenated
+time vector stays sorted. A single searchsorted call then finds the bracketing
+samples of every output point of every curve.
+
+GRIDS:
+    'normalized' : num_points samples over [0, 1] of each curve's own time span
+    'time'       : num_points samples over [0, t_end] seconds, shared by all curves
+    array        : Explicit times in seconds, shared by all curves
+
+METHODS:
+    'linear' : Linear interpolation
+    'cubic'  : Piecewise cubic Hermite (Catmull-Rom) through the samples, with
+               finite-difference tangents, so unevenly spaced t is handled too
+
+fold() phase-folds each curve on its own period and resamples it over one
+cycle of phase in [0, 1).
+
+INPUTS:
+
+curves  : List of 1-D arrays, or a 2-D padded array with lengths
+times   : Same layout as curves (e.g. Phot.t), or None to use the frame
+          times from fps (framePhotometry.timeVector)
+lengths : Valid samples of each row when curves is a padded 2-D array
+
+"""
+
+#%% IMPORTS %%#
+import numpy as np
+
+#%% CONSTANTS %%#
+BLOCK_ROWS = 256                # Curves interpolated per block
+
+#%% FUNCTIONS %%#
+
+# Concatenate a ragged batch
+# Returns (flat values, lengths)
+def flatten(curves, lengths=None):
+    if lengths is not None:
+        curves  = np.asarray(curves)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        mask    = np.arange(curves.shape[1]) < lengths[:,None]
+        return curves[mask], lengths
+    lengths = np.array([len(c) for c in curves], dtype=np.int64)
+    flat    = np.concatenate([np.asarray(c, dtype=float).ravel() for c in curves]) if len(curves) else np.empty(0)
+    return flat, lengths
+
+# Flat frame times for each curve from its frame rate (matches framePhotometry.timeVector)
+def frameTimes(lengths, fps):
+    fps    = np.broadcast_to(np.asarray(fps, dtype=float), lengths.shape)
+    row    = np.repeat(np.arange(len(lengths)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    k      = np.arange(lengths.sum()) - starts[row]
+    step   = (lengths/fps)/np.maximum(lengths-1, 1)          # linspace(0, n/fps, n) spacing
+    return k*step[row]
+
+# Flat times matching flatten(curves)
+def _times(times, lengths, fps):
+    if times is None:
+        return frameTimes(lengths, fps)
+    if isinstance(times, np.ndarray) and times.ndim == 2:
+        return flatten(times, lengths)[0]
+    return flatten(times)[0]
+
+# Output times of every curve, (num_curves, num_points)
+def _grid(t, starts, lengths, grid, num_points, t_end):
+    t0 = t[starts]
+    t1 = t[starts + lengths - 1]
+    if isinstance(grid, str) and grid == 'normalized':
+        u = np.linspace(0, 1, num_points)
+        return t0[:,None] + u*(t1-t0)[:,None]
+    if isinstance(grid, str) and grid == 'time':
+        if t_end is None:
+            t_end = np.min(t1 - t0)                          # Longest grid every curve covers
+        return np.broadcast_to(np.linspace(0, t_end, num_points), (len(lengths), num_points))
+    return np.broadcast_to(np.asarray(grid, dtype=float), (len(lengths), len(grid)))
+
+# Interpolate flat curves at query times
+#   y, t    : Flat values and times, each curve sorted in time
+#   lengths : Samples per curve
+#   query   : (num_curves, M) query times
+#   fill    : Value outside a curve's time span (None = hold the end values)
+# Rows are processed in blocks of BLOCK_ROWS so the working arrays stay in cache
+def interpolate(y, t, lengths, query, method='linear', fill=None):
+    lengths = np.asarray(lengths, dtype=np.int64)
+    query   = np.asarray(query, dtype=float)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    out     = np.empty(query.shape)
+    for r0 in range(0, len(lengths), BLOCK_ROWS):
+        r1 = min(len(lengths), r0+BLOCK_ROWS)
+        a, b = offsets[r0], offsets[r1]
+        out[r0:r1] = _interpolateBlock(y[a:b], t[a:b], lengths[r0:r1], query[r0:r1], method, fill)
+    return out
+
+# Interpolate one block of rows (see interpolate)
+def _interpolateBlock(y, t, lengths, query, method, fill):
+    num    = len(lengths)
+    starts = np.cumsum(lengths) - lengths
+    ends   = starts + lengths - 1
+    t0     = t[starts,None]
+    t1     = t[ends,None]
+    qc     = np.clip(query, t0, t1)
+    
+    # Shift every curve so the concatenated times increase monotonically
+    base  = np.min(t) if len(t) else 0.0
+    span  = (np.max(t) - base + 1.0) if len(t) else 1.0
+    row   = np.repeat(np.arange(num), lengths)
+    key   = (t - base) + row*span
+    qkey  = (qc - base) + np.arange(num)[:,None]*span
+    
+    # Left sample of the bracketing interval, kept inside its own curve
+    lo_lim = starts[:,None]
+    i0 = np.clip(np.searchsorted(key, qkey, side='right') - 1, lo_lim, np.maximum(ends-1, starts)[:,None])
+    i1 = np.minimum(i0 + 1, ends[:,None])
+    
+    y0 = y[i0]
+    y1 = y[i1]
+    h  = t[i1] - t[i0]
+    s  = np.where(h > 0, (qc - t[i0])/np.where(h > 0, h, 1), 0.0)
+    
+    if method == 'linear':
+        out = y0 + s*(y1 - y0)
+    elif method == 'cubic':
+        # Tangents from the neighbouring samples (one-sided at the curve ends)
+        im = np.maximum(i0 - 1, lo_lim)
+        ip = np.minimum(i1 + 1, ends[:,None])
+        m0 = _slope(y, t, im, i1)*h
+        m1 = _slope(y, t, i0, ip)*h
+        
+        s2 = s*s
+        s3 = s2*s
+        out = ((2*s3 - 3*s2 + 1)*y0 + (s3 - 2*s2 + s)*m0 +
+               (-2*s3 + 3*s2)*y1 + (s3 - s2)*m1)
+    else:
+        raise NameError('Unknown interpolation method: ' + str(method))
+    
+    if fill is not None:
+        out = np.where((query < t0) | (query > t1), fill, out)
+    return out
+
+# Finite-difference slope between flat samples a and b
+def _slope(y, t, a, b):
+    dt = t[b] - t[a]
+    return np.where(dt > 0, (y[b] - y[a])/np.where(dt > 0, dt, 1), 0.0)
+
+# Resample a ragged batch of curves onto a common grid
+#   grid       : 'normalized', 'time' or an array of times [s]
+#   num_points : Grid size for 'normalized' and 'time'
+#   t_end      : End of the 'time' grid [s] (None = shortest curve)
+#   fps        : Frame rate(s) used when times is None
+# Returns (num_curves, num_points) array
+def resample(curves, times=None, num_points=288, grid='normalized', method='linear',
+             lengths=None, fps=24, t_end=None, fill=None):
+    y, lengths = flatten(curves, lengths)
+    t = _times(times, lengths, fps)
+    starts = np.cumsum(lengths) - lengths
+    query  = _grid(t, starts, lengths, grid, num_points, t_end)
+    return interpolate(y, t, lengths, query, method, fill)
+
+# Spin period [s] of an angular velocity [rad/s]
+def spinPeriod(omega):
+    return 2*np.pi/np.asarray(omega, dtype=float)
+
+# Phase-fold each curve on its own period and resample one cycle
+#   periods    : Period of each curve [s] (e.g. spinPeriod(omega))
+#   num_points : Phase samples over [0, 1)
+# Returns (num_curves, num_points) array
+def fold(curves, periods, times=None, num_points=288, method='linear', lengths=None, fps=24):
+    y, lengths = flatten(curves, lengths)
+    t = _times(times, lengths, fps)
+    num = len(lengths)
+    row = np.repeat(np.arange(num), lengths)
+    
+    # Sort every curve by phase (rows stay grouped)
+    phase = np.mod(t/np.broadcast_to(np.asarray(periods, dtype=float), (num,))[row], 1.0)
+    order = np.lexsort((phase, row))
+    
+    # Wrap one sample from each end so the fold is periodic across 0 and 1
+    y, phase = y[order], phase[order]
+    starts = np.cumsum(lengths) - lengths
+    ends   = starts + lengths - 1
+    y_ext     = np.concatenate((y[ends], y, y[starts]))
+    phase_ext = np.concatenate((phase[ends] - 1, phase, phase[starts] + 1))
+    row_ext   = np.concatenate((np.arange(num), row, np.arange(num)))
+    order     = np.lexsort((phase_ext, row_ext))
+    
+    query = np.broadcast_to(np.arange(num_points)/num_points, (num, num_points))
+    return interpolate(y_ext[order], phase_ext[order], lengths + 2, query, method)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      streamPhotometry
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+    
+DESCRIPTION:
+Generates photometry while Blender renders, instead of after the whole
+animation has been written to disk.
+
+Each frame is reduced as soon as it is complete, its row is appended to the
+photometry file, and the image is deleted. Disk usage therefore stays at a
+few frames, and the photometry file is finished right after the last frame
+has rendered.
+
+Frames can be fed to the stream in two ways:
+    - From inside Blender, register stream.renderWrite as a
+      bpy.app.handlers.render_write handler. It is called after every frame
+      is saved.
+    - From another process, call stream.watch(). It polls the render
+      directory for completed frames.
+
+A frame is treated as complete once it decodes and either the next frame
+already exists or its size has not changed since the previous poll.
+
+INPUTS:
+
+renderpath : Directory Blender writes frames to (default naming '0000.tif', ...)
+photpath   : Output photometry file
+meta       : Photometry metadata (see dataFormat.makeMeta)
+numImages  : Number of frames expected
+frameRate  : Frames-per-second for the animation
+ext        : Image extension, '.tif' or '.png'
+fmt        : Output format, 'csv' (written row by row) or 'bin' (written on finish)
+delete     : Delete each frame once it has been reduced
+
+"""
+
+#%% IMPORTS %%#
+import os
+import csv
+import time
+import numpy as np
+import dataFormat as df
+import framePhotometry as fp
+import readTIFF as rt
+import instrument as im
+
+#%% FUNCTIONS %%#
+
+# Load a frame as a (height, width) array and reduce it
+def reduceFile(imPath, normFac=fp.NORM_FAC):
+    if imPath.endswith('.png'):
+        import cv2
+        with im.timer('read'):
+            image = cv2.imread(imPath, cv2.IMREAD_UNCHANGED)
+        with im.timer('reduce'):
+            return fp.reduceFrame(image, normFac)
+    # lazy: the constructor only parses the header, decoding happens on im_raw
+    with im.timer('read'):
+        reader = rt.TIFFreader(imPath, row_major=True, lazy=True)
+    with reader:
+        with im.timer('decode'):
+            image = reader.im_raw
+        with im.timer('reduce'):
+            return fp.reduceFrame(image, normFac)
+
+class PhotometryStream:
+    
+    #%% CONSTRUCTOR %%#
+    def __init__(self, renderpath, photpath, meta, numImages, frameRate, ext='.tif',
+                 fmt='csv', delete=True, normFac=fp.NORM_FAC):
+        self.renderpath = renderpath
+        self.photpath   = photpath
+        self.meta       = meta
+        self.numImages  = numImages
+        self.ext        = ext
+        self.fmt        = fmt
+        self.delete     = delete
+        self.normFac    = normFac
+        
+        self.t       = fp.timeVector(numImages, frameRate)  # Time Vector
+        self.phot    = np.full(numImages, np.nan)           # Photometry Data
+        self.next    = 0                                    # Next frame to write
+        self.pending = {}                                   # Reduced frames waiting for their turn
+        self.sizes   = {}                                   # File sizes seen by the last poll
+        
+        # Open the output and write the header now so rows can be appended
+        self.file      = None
+        self.csvwriter = None
+        if fmt == 'csv':
+            self.file      = open(photpath, 'w', newline='')
+            self.csvwriter = csv.writer(self.file)
+            df.writeCSVHeader(self.csvwriter, df.PHOTOMETRY, meta, numImages)
+            self.file.flush()
+    
+    # Context Manager
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish()
+    
+    # File path of frame k
+    def framePath(self, k):
+        return os.path.join(self.renderpath, str(k).zfill(4) + self.ext)
+    
+    # True once every frame has been written
+    def done(self):
+        return self.next >= self.numImages
+    
+    # Reduce frame k (from imPath or its default path) and append it to the output
+    def consume(self, k, imPath=None):
+        if imPath is None:
+            imPath = self.framePath(k)
+        if k < self.next or k in self.pending or k >= self.numImages:
+            return
+        
+        self.pending[k] = reduceFile(imPath, self.normFac)
+        if self.delete:
+            os.remove(imPath)
+        self.sizes.pop(k, None)
+        
+        # Write every frame that is now in order
+        with im.timer('write'):
+            while self.next in self.pending:
+                self.phot[self.next] = self.pending.pop(self.next)
+                if self.csvwriter is not None:
+                    self.csvwriter.writerow([self.phot[self.next], self.t[self.next]])
+                self.next += 1
+            if self.file is not None:
+                self.file.flush()
+        im.count('frames')
+    
+    # bpy.app.handlers.render_write handler (called after each frame is saved)
+    def renderWrite(self, scene, *args):
+        k = scene.frame_current
+        self.consume(k, scene.render.frame_path(frame=k))
+    
+    # Check the render directory once and consume every completed frame
+    # Returns the number of frames consumed
+    def poll(self):
+        consumed = 0
+        for k in range(self.next, self.numImages):
+            if k in self.pending:
+                continue
+            imPath = self.framePath(k)
+            if not os.path.exists(imPath):
+                continue
+            
+            # Complete when the next frame exists or the size has settled
+            size = os.path.getsize(imPath)
+            if not os.path.exists(self.framePath(k+1)) and self.sizes.get(k) != size:
+                self.sizes[k] = size
+                continue
+            try:
+                self.consume(k, imPath)
+                consumed += 1
+            except (NameError, ValueError, OSError):
+                # Still being written
+                self.sizes[k] = size
+        return consumed
+    
+    # Poll the render directory until all frames are consumed
+    #   interval : Seconds between polls
+    #   timeout  : Give up after this many seconds without a new frame (None = never)
+    def watch(self, interval=0.5, timeout=None):
+        last = time.perf_counter()
+        while not self.done():
+            if self.poll():
+                last = time.perf_counter()
+            elif timeout is not None and time.perf_counter() - last > timeout:
+                raise TimeoutError("No new frames in " + str(timeout) + " s, stopped at frame " + str(self.next))
+            else:
+                time.sleep(interval)
+        return self.finish()
+    
+    # Close the output (writing it now for binary output)
+    # Returns the photometry data as a (numImages, 2) array of (phot, t)
+    def finish(self):
+        if self.file is not None:
+            self.file.close()
+            self.file      = None
+            self.csvwriter = None
+        elif self.fmt == 'bin' and self.done():
+            df.writePhotometry(self.photpath, self.meta, self.phot, self.t, fmt='bin')
+        return np.column_stack((self.phot, self.t))
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      tumblePropagator
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Torque-free rigid-body attitude propagation for many objects at once.
+
+generateAttitudeData only models a constant spin about a fixed axis. A real
+tumbling body (a dead CubeSat, a piece of debris) only does that when it
+spins about a principal axis. Any other spin precesses and nutates according
+to the inertia tensor. This module integrates Euler's equations in the body
+frame
+
+    I1 dw1/dt = (I2 - I3) w2 w3
+    I2 dw2/dt = (I3 - I1) w3 w1
+    I3 dw3/dt = (I1 - I2) w1 w2
+
+together with the quaternion kinematics dq/dt = 1/2 q * (0, w), where q rotates
+body coordinates into the world frame as in generateAttitude. The integrator is
+classical RK4 on the combined (q, w) state. The quaternion is renormalized
+after every step.
+
+The whole batch is propagated together. The state is held as (7, N) rows of
+contiguous arrays, so every RK4 stage is a handful of NumPy operations over all
+N objects, and the Python loop only runs over the time steps.
+
+Each object gets its own principal moments of inertia (I1, I2, I3), initial
+body angular velocity [rad/s] and initial attitude. The output uses the same
+(q0, q1, q2, q3, t) attitude table as generateAttitude, at frames k/fps.
+
+File IDs are those of generateAttitudeDataset with ID_TAG in front
+(TSSSSSSSSSSCCCCCCCC). Tumbling and spinning datasets can therefore share a
+seed and an output directory without overwriting each other's files.
+
+INPUTS:
+
+num_objects : Number of tumbling objects to generate
+fps         : Animation frames per second
+substeps    : RK4 steps per frame
+path        : Output directory
+fmt         : Output format, 'csv' or 'bin' (see dataFormat)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import numpy as np
+import generateAttitudeData as gad
+import generateAttitudeDataset as gads
+
+#%% CONSTANTS %%#
+ID_TAG = 'T'                                # File ID prefix of tumbling cases
+
+#%% FUNCTIONS %%#
+
+# Time derivative of the stacked state, written into dx
+#   x : (7,N) rows q0, q1, q2, q3, w1, w2, w3
+#   k : (3,N) Euler coefficients ((I2-I3)/I1, (I3-I1)/I2, (I1-I2)/I3)
+def _derivative(x, k, dx):
+    q0, q1, q2, q3, w1, w2, w3 = x
+    
+    # dq/dt = 1/2 q * (0, w)
+    dx[0] = -0.5*(q1*w1 + q2*w2 + q3*w3)
+    dx[1] =  0.5*(q0*w1 + q2*w3 - q3*w2)
+    dx[2] =  0.5*(q0*w2 + q3*w1 - q1*w3)
+    dx[3] =  0.5*(q0*w3 + q1*w2 - q2*w1)
+    
+    # Euler's equations (torque free)
+    dx[4] = k[0]*w2*w3
+    dx[5] = k[1]*w3*w1
+    dx[6] = k[2]*w1*w2
+
+# One RK4 step of size dt in place, with the quaternion renormalized afterwards
+#   work : (5,7,N) scratch array, reused between steps so no large temporaries are allocated
+def _step(x, k, dt, work):
+    k1, k2, k3, k4, y = work
+    _derivative(x, k, k1)
+    np.multiply(k1, 0.5*dt, out=y)
+    y += x
+    _derivative(y, k, k2)
+    np.multiply(k2, 0.5*dt, out=y)
+    y += x
+    _derivative(y, k, k3)
+    np.multiply(k3, dt, out=y)
+    y += x
+    _derivative(y, k, k4)
+    
+    # x += dt/6 (k1 + 2 k2 + 2 k3 + k4)
+    k2 += k3
+    k2 *= 2
+    k2 += k1
+    k2 += k4
+    k2 *= dt/6
+    x  += k2
+    x[0:4] /= np.sqrt(x[0]**2 + x[1]**2 + x[2]**2 + x[3]**2)
+
+# Propagate a batch of torque-free rigid bodies
+#   inertia    : (N,3) principal moments of inertia (any consistent units)
+#   omega      : (N,3) initial angular velocity in the body frame [rad/s]
+#   q_init     : (N,4) initial attitudes (body to world), identity when None
+#   fps        : Frames per second
+#   num_frames : Number of output frames (frame k at k/fps)
+#   substeps   : RK4 steps per frame
+#   dtype      : Output dtype (float32 halves the memory of large batches)
+# Returns (q, w): (N,num_frames,4) attitudes and (N,num_frames,3) body rates
+def propagate(inertia, omega, q_init=None, fps=24, num_frames=288, substeps=1, dtype=np.float64):
+    inertia = np.asarray(inertia, dtype=float).reshape(-1,3)
+    omega   = np.asarray(omega, dtype=float).reshape(-1,3)
+    n       = max(len(inertia), len(omega))
+    
+    I1, I2, I3 = np.broadcast_to(inertia, (n,3)).T
+    k = np.array([(I2 - I3)/I1, (I3 - I1)/I2, (I1 - I2)/I3])
+    
+    x = np.empty((7,n))
+    if q_init is None:
+        x[0:4] = [[1], [0], [0], [0]]
+    else:
+        x[0:4] = np.broadcast_to(np.asarray(q_init, dtype=float).reshape(-1,4), (n,4)).T
+        x[0:4] /= np.sqrt(np.sum(x[0:4]**2, axis=0))
+    x[4:7] = np.broadcast_to(omega, (n,3)).T
+    
+    out  = np.empty((num_frames,7,n), dtype=dtype)
+    work = np.empty((5,7,n))
+    dt   = 1/(fps*substeps)
+    for frame in range(num_frames):
+        out[frame] = x
+        if frame < num_frames-1:
+            for sub in range(substeps):
+                _step(x, k, dt, work)
+    
+    out = out.transpose(2,0,1)
+    return out[:,:,0:4], out[:,:,4:7]
+
+# Attitude tables of a propagated batch in the generateAttitude layout
+#   q   : (N,num_frames,4) attitudes from propagate()
+#   dur : Duration [s] spanned by the t column (as in generateAttitude)
+# Returns an (N,num_frames,5) array with columns (q0, q1, q2, q3, t)
+def attitudeTables(q, dur):
+    n, num_frames = q.shape[0:2]
+    data = np.empty((n,num_frames,5), dtype=q.dtype)
+    data[:,:,0:4] = q
+    data[:,:,4]   = np.linspace(0, dur, num_frames)
+    return data
+
+# Angular momentum direction in the world frame (the fixed axis the body
+# precesses about). Used as rot_axis in the attitude file metadata.
+#   q, w : Attitudes (N,4) and body rates (N,3) at any common time
+def momentumAxis(inertia, q, w):
+    h  = np.asarray(inertia, dtype=float)*np.asarray(w, dtype=float)
+    q  = np.asarray(q, dtype=float)
+    u  = q[:,1:]
+    uh = np.cross(u, h)
+    H  = h + 2*(q[:,0:1]*uh + np.cross(u, uh))
+    return H/np.sqrt(np.sum(H**2, axis=1))[:,None]
+
+# Draw random tumble parameters for a batch
+#   rng         : numpy Generator
+#   inertia     : (3,) nominal principal moments, e.g. of a 1U/2U/6U bus
+#   spread      : Relative random spread of each moment
+#   dur         : (N,) durations [s], used to set the spin rate range
+# Returns a dictionary of propagate() arguments (inertia, omega, q_init)
+def randomTumble(rng, num_objects, inertia=(1.0, 1.0, 1.0), spread=0.3, dur=10.0):
+    dur     = np.broadcast_to(np.asarray(dur, dtype=float), (num_objects,))
+    inertia = np.asarray(inertia, dtype=float)*(1 + spread*rng.uniform(-1, 1, (num_objects,3)))
+    
+    # Same range of total rotations as generateAttitudeData (2 to 5 per case)
+    rate  = rng.uniform(2, 5, num_objects)*2*np.pi/dur
+    axis  = rng.normal(size=(num_objects,3))
+    omega = rate[:,None]*axis/np.sqrt(np.sum(axis**2, axis=1))[:,None]
+    
+    q_init = rng.normal(size=(num_objects,4))       # Uniform random attitude
+    q_init /= np.sqrt(np.sum(q_init**2, axis=1))[:,None]
+    return {"inertia": inertia, "omega": omega, "q_init": q_init}
+
+# File ID for a single tumbling case
+def tumbleFileID(seed, case_index):
+    return ID_TAG + gads.caseFileID(seed, case_index)
+
+# Generate and write a batch of tumbling cases
+# Returns the list of file names
+def generateTumbleDataset(num_objects, path, seed=0, fps=24, dur=10.0, substeps=1, fmt='csv', **kwargs):
+    os.makedirs(path, exist_ok=True)
+    rng        = np.random.default_rng(seed)
+    num_frames = int(np.ceil(fps*dur))
+    params     = randomTumble(rng, num_objects, dur=dur, **kwargs)
+    sun_angles = rng.uniform(0, 2*np.pi, num_objects)
+    
+    q, w   = propagate(fps=fps, num_frames=num_frames, substeps=substeps, **params)
+    tables = attitudeTables(q, dur)
+    axes   = momentumAxis(params["inertia"], q[:,0], w[:,0])
+    rates  = np.sqrt(np.sum(params["omega"]**2, axis=1))
+    
+    write     = gad.writeAttitudeBinary if fmt == 'bin' else gad.writeAttitudeCSV
+    filenames = []
+    for i in range(num_objects):
+        file_id  = tumbleFileID(seed, i)
+        filename = "rotation_data_" + file_id + "." + fmt
+        write(os.path.join(path, filename), file_id, fps, dur, sun_angles[i],
+              rates[i], axes[i], tables[i])
+        filenames.append(filename)
+    return filenames
+
+
+#%% ********************** BEGIN GENERATING FILES ********************** %%#
+if __name__ == "__main__":
+
+    #%% USER INPUT %%#
+    num_objects = 100;
+    seed        = 0;
+    fps         = 24;
+    dur         = 10;
+    substeps    = 1;
+    path        = "./rotation_data/";
+    fmt         = 'csv';
+    
+    filenames = generateTumbleDataset(num_objects, path, seed, fps, dur, substeps, fmt);
+    print("Generated " + str(len(filenames)) + " tumbling cases in " + path);
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      kernelCache
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Kernel matrices for the light-curve classifiers, built from pairwise squared
+distances that are computed only once.
+
+The RBF, Matern and periodic (ExpSineSquared) kernels depend on the inputs only
+through the distance |x - x'|. The O(N^2 D) part of every kernel evaluation is
+therefore the same for all hyperparameters. KernelEngine computes it once:
+
+    |a - b|^2 = |a|^2 + |b|^2 - 2 a.b
+
+The cross term is computed with one BLAS matrix product per block of rows. The
+product runs multi-threaded, and each block is written straight into a
+memory-mapped .npy file in the cache directory. Peak memory is
+block_rows x len(B), independent of the size of the full matrix. The file is
+named after the dataset version (a hash of the data, or a version string
+supplied by the caller), so later runs and other processes reuse it.
+
+A hyperparameter trial or CV fold then only applies an elementwise transform to
+the cached distances (or to a slice of them, e.g. D[np.ix_(train, train)]).
+The result can be passed to any estimator that accepts a precomputed kernel.
+
+EXAMPLE:
+    engine = KernelEngine('./kernel_cache')
+    D      = engine.distances(X)
+    for l in [0.5, 1.0, 2.0]:
+        K = rbf(D, l)
+
+"""
+
+#%% IMPORTS %%#
+import os
+import hashlib
+import numpy as np
+
+#%% CONSTANTS %%#
+BLOCK_ROWS = 1024                           # Rows of the distance matrix per BLAS call
+
+#%% FUNCTIONS %%#
+
+# Version string of a data array (hash of its shape, dtype and contents)
+def datasetVersion(X):
+    X = np.ascontiguousarray(X)
+    h = hashlib.sha1()
+    h.update(str((X.shape, X.dtype.str)).encode())
+    h.update(X.data)
+    return h.hexdigest()[0:16]
+
+# Squared distances between the rows of A and B, computed block by block
+#   out : (len(A), len(B)) array to fill (e.g. a memmap), allocated when None
+def sqDistances(A, B=None, out=None, block_rows=BLOCK_ROWS):
+    A    = np.asarray(A, dtype=float)
+    same = B is None
+    B    = A if same else np.asarray(B, dtype=float)
+    if out is None:
+        out = np.empty((len(A), len(B)))
+    
+    norm_a = np.einsum('ij,ij->i', A, A)
+    norm_b = np.einsum('ij,ij->i', B, B)
+    for r0 in range(0, len(A), block_rows):
+        r1 = min(len(A), r0+block_rows)
+        block = A[r0:r1] @ B.T                              # BLAS
+        block *= -2
+        block += norm_a[r0:r1,None]
+        block += norm_b[None,:]
+        np.maximum(block, 0, out=block)                     # Round-off can go slightly negative
+        if same:
+            block[np.arange(r1-r0), np.arange(r0, r1)] = 0  # Exact zero self-distance
+        out[r0:r1] = block
+    return out
+
+#%% KERNELS %%#
+# Each takes squared distances D (any shape) and returns the kernel values
+
+# RBF: a * exp(-r^2 / (2 l^2))
+def rbf(D, lengthscale=1.0, amplitude=1.0):
+    return amplitude*np.exp(-0.5*np.asarray(D)/lengthscale**2)
+
+# Matern with nu = 0.5, 1.5 or 2.5 (any other nu is not closed form)
+def matern(D, lengthscale=1.0, nu=1.5, amplitude=1.0):
+    r = np.sqrt(np.asarray(D))/lengthscale
+    if nu == 0.5:
+        K = np.exp(-r)
+    elif nu == 1.5:
+        r = np.sqrt(3)*r
+        K = (1 + r)*np.exp(-r)
+    elif nu == 2.5:
+        r = np.sqrt(5)*r
+        K = (1 + r + r**2/3)*np.exp(-r)
+    else:
+        raise NameError('Matern kernel only supports nu = 0.5, 1.5 or 2.5')
+    return amplitude*K
+
+# Periodic (ExpSineSquared): a * exp(-2 sin^2(pi r / p) / l^2)
+def periodic(D, lengthscale=1.0, periodicity=1.0, amplitude=1.0):
+    r = np.sqrt(np.asarray(D))
+    return amplitude*np.exp(-2*np.sin(np.pi*r/periodicity)**2/lengthscale**2)
+
+KERNELS = {"rbf": rbf, "matern": matern, "periodic": periodic}
+
+class KernelEngine:
+
+    #%% CONSTRUCTOR %%#
+    #   cache_dir  : Directory for the cached distance matrices
+    #   block_rows : Rows per BLAS block (peak memory is block_rows x len(B) floats)
+    def __init__(self, cache_dir='./kernel_cache', block_rows=BLOCK_ROWS):
+        self.cache_dir  = cache_dir
+        self.block_rows = block_rows
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    # Cache file of a distance matrix
+    def _path(self, version_a, version_b):
+        name = 'sqdist_' + version_a + ('' if version_b is None else '_' + version_b) + '.npy'
+        return os.path.join(self.cache_dir, name)
+    
+    # Squared distances between the rows of A and B (None = A with itself)
+    #   version_a/b : Dataset version strings (None = hash of the data)
+    # Returns a read-only memory-mapped (len(A), len(B)) array
+    def distances(self, A, B=None, version_a=None, version_b=None):
+        if version_a is None:
+            version_a = datasetVersion(A)
+        if B is not None and version_b is None:
+            version_b = datasetVersion(B)
+        path = self._path(version_a, version_b)
+        
+        if not os.path.exists(path):
+            num_b = len(A) if B is None else len(B)
+            tmp   = path[:-4] + '.tmp.npy'
+            out   = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64,
+                                              shape=(len(A), num_b))
+            sqDistances(A, B, out, self.block_rows)
+            out.flush()
+            del out
+            os.replace(tmp, path)                           # Never leave a partial matrix behind
+        return np.load(path, mmap_mode='r')
+    
+    # Kernel matrix from the cached distances
+    #   name   : 'rbf', 'matern' or 'periodic'
+    #   rows   : Optional row indices (e.g. a CV training fold)
+    #   cols   : Optional column indices (defaults to rows for a square matrix)
+    #   params : Kernel hyperparameters (lengthscale, nu, periodicity, amplitude)
+    def kernel(self, name, A, B=None, rows=None, cols=None, version_a=None, version_b=None, **params):
+        D = self.distances(A, B, version_a, version_b)
+        if rows is not None or cols is not None:
+            rows = np.arange(D.shape[0]) if rows is None else np.asarray(rows)
+            cols = (rows if B is None else np.arange(D.shape[1])) if cols is None else np.asarray(cols)
+            D = D[np.ix_(rows, cols)]
+        return KERNELS[name](D, **params)
+    
+    # Delete every cached matrix
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.startswith('sqdist_') and name.endswith('.npy'):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      sparseGP
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Sparse Gaussian process classifier for photometry curves that scales to
+10^5 - 10^6 training samples.
+
+The RBF kernel is replaced by a low-rank feature map phi(x) with
+phi(x).phi(x') ~ k(x,x'):
+
+    'nystrom' : phi(x) = k(x,Z) L^-T   (Z = inducing points drawn from the
+                training set, Kzz = L L^T), exact on the span of Z
+    'rff'     : phi(x) = sqrt(2 a / M) cos(x W + b)   (random Fourier features,
+                W ~ N(0, 1/lengthscale^2))
+
+A latent GP per class then becomes f_c(x) = phi(x).w_c + b_c with w_c ~ N(0, I).
+The weights are fitted by mini-batch Adam on the softmax likelihood (MAP
+estimate). A Laplace approximation of the posterior of each w_c then gives
+predictive variances, and these moderate the class probabilities
+(probit approximation).
+
+Cost is O(N M) per epoch and O(B M + M^2) memory for M features and mini-batch
+size B, against O(N^3) time and O(N^2) memory for the exact
+GaussianProcessClassifier. Mini-batch products use the multi-threaded BLAS.
+
+The interface follows sklearn: fit(X, y), predict(X), predict_proba(X) and
+classes_. compareExact() reports training time, peak memory and accuracy of
+this model against sklearn's exact classifier.
+
+EXAMPLE:
+    gpc = SparseGPClassifier(num_inducing=512, random_state=seed)
+    gpc.fit(X_train, y_train)
+    ypred_test = gpc.predict(X_test)
+
+"""
+
+#%% IMPORTS %%#
+import time
+import tracemalloc
+import numpy as np
+import kernelCache as kc
+
+#%% CONSTANTS %%#
+JITTER = 1e-6                               # Added to the inducing point kernel diagonal
+
+#%% FUNCTIONS %%#
+
+# RBF kernel between the rows of A and B
+def rbf(A, B, lengthscale, amplitude=1.0):
+    return kc.rbf(kc.sqDistances(A, B), lengthscale, amplitude)
+
+# Median pairwise distance of a random subset (lengthscale heuristic)
+def medianDistance(X, rng, num=1000):
+    idx = rng.choice(len(X), min(num, len(X)), replace=False)
+    d   = kc.sqDistances(X[idx])
+    return float(np.sqrt(np.median(d[np.triu_indices(len(idx), 1)]))) if len(idx) > 1 else 1.0
+
+# Row-wise softmax
+def softmax(F):
+    F = F - F.max(axis=1, keepdims=True)
+    P = np.exp(F)
+    return P/P.sum(axis=1, keepdims=True)
+
+class SparseGPClassifier:
+
+    #%% CONSTRUCTOR %%#
+    #   num_inducing  : Number of inducing points / random features (M)
+    #   approx        : 'nystrom' or 'rff'
+    #   lengthscale   : RBF lengthscale (None = median distance heuristic)
+    #   amplitude     : RBF amplitude
+    #   batch_size    : Mini-batch size
+    #   epochs        : Passes over the training set
+    #   learning_rate : Adam step size
+    def __init__(self, num_inducing=512, approx='nystrom', lengthscale=None, amplitude=1.0,
+                 batch_size=1024, epochs=20, learning_rate=0.01, random_state=None, verbose=False):
+        self.num_inducing  = num_inducing
+        self.approx        = approx
+        self.lengthscale   = lengthscale
+        self.amplitude     = amplitude
+        self.batch_size    = batch_size
+        self.epochs        = epochs
+        self.learning_rate = learning_rate
+        self.random_state  = random_state
+        self.verbose       = verbose
+    
+    #%% FEATURES %%#
+    
+    # Build the feature map from the training data
+    def _initFeatures(self, X, rng):
+        M = min(self.num_inducing, len(X)) if self.approx == 'nystrom' else self.num_inducing
+        if self.lengthscale_ is None:
+            self.lengthscale_ = medianDistance(X, rng)
+        
+        if self.approx == 'nystrom':
+            self.inducing_ = X[rng.choice(len(X), M, replace=False)].copy()
+            Kzz = rbf(self.inducing_, self.inducing_, self.lengthscale_, self.amplitude)
+            L   = np.linalg.cholesky(Kzz + JITTER*self.amplitude*np.eye(M))
+            self.projection_ = np.linalg.inv(L).T                   # L^-T
+        elif self.approx == 'rff':
+            self.freqs_  = rng.normal(0, 1/self.lengthscale_, (X.shape[1], M))
+            self.phases_ = rng.uniform(0, 2*np.pi, M)
+        else:
+            raise NameError('Unknown approximation: ' + str(self.approx))
+    
+    # Feature map phi(X), (len(X), M)
+    def features(self, X):
+        X = np.asarray(X, dtype=float)
+        if self.approx == 'nystrom':
+            return rbf(X, self.inducing_, self.lengthscale_, self.amplitude) @ self.projection_
+        M = self.freqs_.shape[1]
+        return np.sqrt(2*self.amplitude/M)*np.cos(X @ self.freqs_ + self.phases_)
+    
+    # Mini-batches of row indices
+    def _batches(self, n, rng=None):
+        order = rng.permutation(n) if rng is not None else np.arange(n)
+        for start in range(0, n, self.batch_size):
+            yield order[start:start+self.batch_size]
+    
+    #%% TRAINING %%#
+    
+    # Fit the classifier
+    def fit(self, X, y):
+        t_start = time.perf_counter()
+        X   = np.asarray(X, dtype=float)
+        y   = np.ravel(y)
+        rng = np.random.default_rng(self.random_state)
+        
+        self.classes_, labels = np.unique(y, return_inverse=True)
+        self.lengthscale_ = self.lengthscale
+        self._initFeatures(X, rng)
+        
+        N = len(X)
+        C = len(self.classes_)
+        M = self.features(X[0:1]).shape[1]
+        Y = np.eye(C)[labels]
+        
+        # MAP weights by mini-batch Adam on  sum_n CE_n + |W|^2/2
+        params  = [np.zeros((M, C)), np.zeros(C)]
+        moments = [[np.zeros_like(p), np.zeros_like(p)] for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        step = 0
+        for epoch in range(self.epochs):
+            loss = 0.0
+            for idx in self._batches(N, rng):
+                Phi = self.features(X[idx])
+                P   = softmax(Phi @ params[0] + params[1])
+                R   = (P - Y[idx])*(N/len(idx))                     # Scaled to the full data set
+                grads = [Phi.T @ R + params[0], R.sum(axis=0)]
+                loss += -np.sum(np.log(P[Y[idx] > 0] + 1e-300))
+                
+                step += 1
+                for p, g, m in zip(params, grads, moments):
+                    m[0] = beta1*m[0] + (1-beta1)*g
+                    m[1] = beta2*m[1] + (1-beta2)*g*g
+                    p   -= self.learning_rate*(m[0]/(1-beta1**step))/(np.sqrt(m[1]/(1-beta2**step)) + eps)
+            if self.verbose:
+                print("Epoch " + str(epoch+1) + "/" + str(self.epochs) + " : mean log loss " + str(loss/N))
+        self.weights_, self.bias_ = params
+        
+        # Laplace approximation: H_c = sum_n p_nc (1 - p_nc) phi_n phi_n^T + I
+        H = np.zeros((C, M, M))
+        for idx in self._batches(N):
+            Phi = self.features(X[idx])
+            P   = softmax(Phi @ self.weights_ + self.bias_)
+            for c in range(C):
+                H[c] += (Phi*(P[:,c]*(1-P[:,c]))[:,None]).T @ Phi
+        H += np.eye(M)
+        self.covariance_ = np.linalg.inv(H)
+        
+        self.train_time_ = time.perf_counter() - t_start
+        return self
+    
+    #%% PREDICTION %%#
+    
+    # Latent mean and variance of each class, (len(X), C) each
+    def latent(self, X):
+        mean = []
+        var  = []
+        for idx in self._batches(len(X)):
+            Phi = self.features(np.asarray(X)[idx])
+            mean.append(Phi @ self.weights_ + self.bias_)
+            var.append(np.einsum('nm,cmk,nk->nc', Phi, self.covariance_, Phi))
+        return np.concatenate(mean), np.concatenate(var)
+    
+    # Class probabilities, columns ordered as classes_
+    def predict_proba(self, X):
+        mean, var = self.latent(X)
+        return softmax(mean/np.sqrt(1 + np.pi*var/8))
+    
+    # Most probable class
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+    
+    # Mean accuracy
+    def score(self, X, y):
+        return float(np.mean(self.predict(X) == np.ravel(y)))
+
+# Train a model and measure it
+# Returns (model, train time [s], peak traced memory [bytes])
+def _measure(model, X, y):
+    tracemalloc.start()
+    t_start = time.perf_counter()
+    model.fit(X, y)
+    train_time = time.perf_counter() - t_start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return model, train_time, peak
+
+# Compare the sparse model with sklearn's exact GaussianProcessClassifier
+#   max_exact : The exact model is trained on at most this many samples
+#               (its time and memory grow as N^3 and N^2)
+# Returns a dictionary of train time [s], peak memory [MB] and test accuracy per model
+def compareExact(X_train, y_train, X_test, y_test, max_exact=2000, random_state=None, **kwargs):
+    from sklearn.gaussian_process import GaussianProcessClassifier
+    from sklearn.gaussian_process.kernels import RBF
+    
+    results = {}
+    sparse, train_time, peak = _measure(SparseGPClassifier(random_state=random_state, **kwargs),
+                                        X_train, y_train)
+    results["sparse"] = {"num_train": len(X_train), "train_time": train_time,
+                         "peak_mb": peak/2**20, "accuracy": sparse.score(X_test, y_test)}
+    
+    rng = np.random.default_rng(random_state)
+    idx = rng.choice(len(X_train), min(max_exact, len(X_train)), replace=False)
+    exact, train_time, peak = _measure(GaussianProcessClassifier(kernel=1.0*RBF(1.0), random_state=random_state),
+                                       np.asarray(X_train)[idx], np.ravel(y_train)[idx])
+    results["exact"] = {"num_train": len(idx), "train_time": train_time, "peak_mb": peak/2**20,
+                        "accuracy": float(np.mean(exact.predict(X_test) == np.ravel(y_test)))}
+    
+    for name, result in results.items():
+        print(name + ": " + str(result["num_train"]) + " samples, " +
+              "{:.2f} s, {:.1f} MB, accuracy {:.3f}".format(result["train_time"], result["peak_mb"],
+                                                           result["accuracy"]))
+    return results
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      fakeBlender
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Stand-in for a Blender worker started by renderScheduler. It accepts the same
+command line (blender -b scene --python script -- --serve ...), answers with
+the same @@MA540 READY/DONE/FAIL lines and writes a small photometry file per
+case instead of rendering.
+
+Failures are switched on per case through the environment. Each one happens
+only on the first attempt at that case (a marker file <case>.<switch> is left
+in the photometry directory holding the worker's pid), so the retry succeeds.
+
+    FAKE_BLENDER_CRASH : Case file name on which the worker exits
+    FAKE_BLENDER_HANG  : Case file name on which the worker stops answering
+    FAKE_BLENDER_FAIL  : Case file name reported as FAIL (every attempt)
+
+USE:
+    renderScheduler.renderAll(cases, photpath, renderpath,
+                              blender_exe=[sys.executable, 'fakeBlender.py'])
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+import time
+
+#%% CONSTANTS %%#
+PROTOCOL_TAG = '@@MA540'                    # Same prefix as blenderRenderRotation
+
+#%% FUNCTIONS %%#
+
+# Report a result line for the scheduler
+def report(status, text):
+    sys.stdout.write(PROTOCOL_TAG + " " + status + " " + text + "\n")
+    sys.stdout.flush()
+
+# True the first time a switch fires for a case (leaves a marker with the pid)
+def firstTime(switch, case, photpath):
+    if os.environ.get('FAKE_BLENDER_' + switch.upper()) != os.path.basename(case):
+        return False
+    marker = os.path.join(photpath, os.path.basename(case) + '.' + switch)
+    if os.path.exists(marker):
+        return False
+    with open(marker, 'w') as file:
+        file.write(str(os.getpid()))
+    return True
+
+# Answer cases read from stdin until it closes
+def serve(photpath, sat_name):
+    report("READY", str(os.getpid()))
+    for line in sys.stdin:
+        case = line.strip()
+        if not case:
+            continue
+        if firstTime('crash', case, photpath):
+            os._exit(1)
+        if firstTime('hang', case, photpath):
+            time.sleep(3600)
+        if os.environ.get('FAKE_BLENDER_FAIL') == os.path.basename(case):
+            report("FAIL", "ValueError('fake failure')")
+            continue
+
+        file_id   = os.path.splitext(os.path.basename(case))[0].replace('rotation_data_', '')
+        phot_file = os.path.join(photpath, sat_name + "_" + file_id + ".csv")
+        with open(phot_file, 'w') as file:
+            file.write(case + "\n")
+        report("DONE", phot_file)
+
+
+#%% ********************** MAIN ********************** %%#
+if __name__ == "__main__":
+    args     = sys.argv[sys.argv.index('--')+1:] if '--' in sys.argv else []
+    photpath = '.'
+    sat_name = 'Satellite'
+    while args:
+        arg = args.pop(0)
+        if arg == '--photpath':
+            photpath = args.pop(0)
+        elif arg == '--sat-name':
+            sat_name = args.pop(0)
+        elif arg in ('--renderpath', '--mode'):
+            args.pop(0)
+    serve(photpath, sat_name)
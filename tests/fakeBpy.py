@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      fakeBpy
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Minimal stand-in for the Blender python module, enough to drive
+renderPhotometry outside Blender. Rendering frame k copies a known RGBA frame
+into the 'Viewer Node' image, which hands it out through pixels.foreach_get
+as a flat float32 buffer with rows bottom to top, like Blender does.
+
+USE:
+    bpy = FakeBpy(frames)           # frames : {k: (height, width, 4) RGBA, top row first}
+    renderPhotometry.renderPhotometry(bpy, bpy.context.scene, frames, 24)
+
+"""
+
+#%% IMPORTS %%#
+from types import SimpleNamespace
+import numpy as np
+
+#%% CLASSES %%#
+
+class FakePixels:
+
+    #%% CONSTRUCTOR %%#
+    def __init__(self):
+        self.data = np.zeros(0, dtype=np.float32)
+
+    # Copy the pixels into a flat float32 buffer
+    def foreach_get(self, buf):
+        buf[:] = self.data
+
+class FakeImage:
+
+    #%% CONSTRUCTOR %%#
+    def __init__(self):
+        self.size   = (0, 0)                # (width, height)
+        self.pixels = FakePixels()
+
+    # Store an RGBA frame (top row first) the way Blender lays it out
+    def load(self, rgba):
+        height, width, channels = rgba.shape
+        self.size        = (width, height)
+        self.channels    = channels
+        self.pixels.data = np.ascontiguousarray(rgba[::-1], dtype=np.float32).ravel()
+
+class FakeNodeTree:
+
+    #%% CONSTRUCTOR %%#
+    def __init__(self):
+        self.nodes = FakeNodes()
+        self.links = SimpleNamespace(new=lambda output, input: None)
+
+class FakeNodes(list):
+
+    # Add a compositor node of the given Blender type name
+    def new(self, type_name):
+        node_type = 'R_LAYERS' if type_name == 'CompositorNodeRLayers' else 'VIEWER'
+        node = SimpleNamespace(type=node_type, use_alpha=True,
+                               inputs={'Image': None}, outputs={'Image': None})
+        self.append(node)
+        return node
+
+class FakeScene:
+
+    #%% CONSTRUCTOR %%#
+    def __init__(self):
+        self.frame_current = 0
+        self.use_nodes     = False
+        self.node_tree     = FakeNodeTree()
+
+    # Set the current frame
+    def frame_set(self, k):
+        self.frame_current = k
+
+class FakeBpy:
+
+    #%% CONSTRUCTOR %%#
+    #   frames : {frame number: (height, width, 4) RGBA array, top row first}
+    def __init__(self, frames):
+        self.frames  = frames
+        self.scene   = FakeScene()
+        self.context = SimpleNamespace(scene=self.scene)
+        self.data    = SimpleNamespace(images={'Viewer Node': FakeImage()})
+        self.ops     = SimpleNamespace(render=SimpleNamespace(render=self.render))
+        self.renders = 0
+
+    # Render the current frame into the Viewer Node image
+    def render(self, write_still=False):
+        self.renders += 1
+        self.data.images['Viewer Node'].load(self.frames[self.scene.frame_current])
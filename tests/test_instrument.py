@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      test_instrument
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Checks that progress lines of consecutive runs under the same name each start
+from their own count and start time.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_generation'))
+import instrument as im
+
+#%% TESTS %%#
+
+def test_progress_restarts_after_a_finished_run(capsys):
+    im.reset()
+    for run in range(2):
+        for done in range(1, 4):
+            im.progress("Processing images", total=3, interval=0)
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(" (")[0] for line in lines] == ["Processing images: %d/3" % k for k in (1, 2, 3)]*2
+    assert "/s" not in lines[0] and "/s" not in lines[3]     # No rate on the first line of a run
+
+def test_progress_restarts_when_done_goes_back(capsys):
+    im.reset()
+    im.progress("Rendered frames", 5, interval=0)
+    im.progress("Rendered frames", 9, interval=0)
+    im.progress("Rendered frames", 1, interval=0)
+    im.progress("Rendered frames", interval=0)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["Rendered frames: 5", lines[1], "Rendered frames: 1", lines[3]]
+    assert lines[1].startswith("Rendered frames: 9 (")
+    assert lines[3].startswith("Rendered frames: 2 (")
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      test_photometryStore
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Checks that PhotometryStore keeps one curve per (sat_name, file_id), so every
+satellite rendered from the same attitude file is ingested.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_generation'))
+import dataFormat as df
+import photometryStore as ps
+
+#%% TESTS %%#
+
+# Write one photometry CSV per satellite for each file_id
+def writeCurves(directory, file_ids, sat_names):
+    for k, file_id in enumerate(file_ids):
+        for j, sat_name in enumerate(sat_names):
+            meta = df.makeMeta(file_id, 24, 1.0, 0.5, 2.0, [0, 0, 1], sat_name=sat_name)
+            phot = np.full(24, 10*k + j, dtype=float)
+            df.writePhotometry(os.path.join(directory, sat_name + "_" + file_id + ".csv"),
+                               meta, phot, np.arange(24)/24)
+
+def test_ingest_keeps_every_satellite_of_a_file_id(tmp_path):
+    phot_dir = tmp_path / 'photometry'
+    phot_dir.mkdir()
+    sat_names = list(ps.SAT_CLASSES)
+    writeCurves(str(phot_dir), ['000000000000000001'], sat_names)
+    
+    store = ps.PhotometryStore(str(tmp_path / 'store'))
+    rows  = store.ingest(str(phot_dir), workers=1)
+    assert len(rows) == len(sat_names)
+    assert sorted(store.index["sat_name"].tolist()) == sorted(sat_names)
+    assert sorted(store.index["sat_class"].tolist()) == [0, 1, 2]
+
+def test_ingest_skips_known_curves_only(tmp_path):
+    phot_dir = tmp_path / 'photometry'
+    phot_dir.mkdir()
+    sat_names = list(ps.SAT_CLASSES)
+    writeCurves(str(phot_dir), ['000000000000000001'], sat_names[0:1])
+    
+    store = ps.PhotometryStore(str(tmp_path / 'store'))
+    assert len(store.ingest(str(phot_dir), workers=1)) == 1
+    
+    # Same file_id for the other satellites, plus a new file_id for all of them
+    writeCurves(str(phot_dir), ['000000000000000001', '000000000000000002'], sat_names)
+    assert len(store.ingest(str(phot_dir), workers=1)) == 2*len(sat_names) - 1
+    assert len(store.ingest(str(phot_dir), workers=1)) == 0
+    
+    # append() applies the same key to files it is handed directly
+    filepaths = [str(phot_dir / name) for name in os.listdir(phot_dir)]
+    assert len(store.append(filepaths, workers=1)) == 0
+    assert len(store) == 2*len(sat_names)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      test_renderCache
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Checks that a record appended after a crash mid-line survives the next load.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_generation'))
+import renderCache as rc
+
+#%% TESTS %%#
+
+def test_record_after_torn_line_is_kept(tmp_path):
+    outputs = []
+    for i in range(3):
+        output = tmp_path / ('Satellite_%d.csv' % i)
+        output.write_text(str(i))
+        outputs.append(str(output))
+    path = str(tmp_path / 'render_manifest.jsonl')
+
+    manifest = rc.RenderManifest(path)
+    manifest.record('key0', 'case0', outputs[0])
+    manifest.record('key1', 'case1', outputs[1])
+
+    # Crash halfway through writing the second record
+    with open(path) as file:
+        text = file.read()
+    with open(path, 'w') as file:
+        file.write(text[:-len(text.splitlines()[1])//2])
+
+    manifest = rc.RenderManifest(path)
+    assert list(manifest.entries) == ['key0']
+    manifest.record('key2', 'case2', outputs[2])
+
+    manifest = rc.RenderManifest(path)
+    assert sorted(manifest.entries) == ['key0', 'key2']
+    assert manifest.lookup('key2') == outputs[2]
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      test_renderPhotometry
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Runs the 'memory' render mode against fakeBpy.py: the curve read back from the
+Viewer Node buffer must match framePhotometry.reduceFrame on the Rec. 709
+luminance of the same frames.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'data_generation', 'blenderScripts', 'modules'))
+import framePhotometry as fp
+import renderPhotometry as rp
+from fakeBpy import FakeBpy
+
+#%% TESTS %%#
+
+# Known RGBA frames (top row first), a lit block that moves from frame to frame
+def makeFrames(frames, height=12, width=16):
+    rng    = np.random.default_rng(0)
+    images = {}
+    for i, k in enumerate(frames):
+        rgba = np.zeros((height, width, 4), dtype=np.float32)
+        rgba[i:i+4, 2*i:2*i+5, 0:3] = rng.uniform(0.1, 1.0, (4, 5, 3))
+        rgba[:, :, 3] = 1.0
+        images[k] = rgba
+    return images
+
+# Expected curve: reduceFrame on the luminance of each frame
+def expected(images, frames, stats=False, threshold=0.0):
+    weights = np.array([0.2126, 0.7152, 0.0722])
+    results = [fp.reduceFrame(images[k][:, :, 0:3] @ weights, 1.0, stats, threshold) for k in frames]
+    return fp.collectRun(results, 24, stats)
+
+def test_memory_mode_matches_reduceFrame():
+    frames = range(1, 6)
+    images = makeFrames(frames)
+    bpy    = FakeBpy(images)
+    phot   = rp.renderPhotometry(bpy, bpy.context.scene, frames, 24, verbose=False)
+    assert bpy.renders == len(frames)
+    assert phot.shape == (len(frames), 1)
+    np.testing.assert_allclose(phot, expected(images, frames), rtol=1e-5)
+
+def test_memory_mode_stats_match_reduceFrame():
+    frames = range(1, 6)
+    images = makeFrames(frames)
+    bpy    = FakeBpy(images)
+    run    = rp.renderPhotometry(bpy, bpy.context.scene, frames, 24, stats=True,
+                                 threshold=0.2, verbose=False)
+    ref    = expected(images, frames, stats=True, threshold=0.2)
+    for name in run.dtype.names:
+        np.testing.assert_allclose(run[name], ref[name], rtol=1e-5, atol=1e-6, err_msg=name)
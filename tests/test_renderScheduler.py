@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+TITLE:      test_renderScheduler
+DATE:       10-18-2026
+AUTHOR:     MA540 Team 4
+
+DESCRIPTION:
+Drives renderScheduler.renderAll with fakeBlender.py standing in for Blender:
+every case completes, crashed and hung workers are restarted and their case
+retried, and a repeated run with the same manifest renders nothing.
+
+"""
+
+#%% IMPORTS %%#
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'data_generation'))
+import renderCache as rc
+import renderScheduler as rs
+
+#%% CONSTANTS %%#
+FAKE_BLENDER = [sys.executable, os.path.join(HERE, 'fakeBlender.py')]
+
+#%% TESTS %%#
+
+# Attitude files and a scene file for the scheduler to hand out
+def makeCases(tmp_path, num_cases=6):
+    rotdir = tmp_path / 'rotation_data'
+    rotdir.mkdir()
+    for i in range(num_cases):
+        (rotdir / ('rotation_data_%04d.csv' % i)).write_text(str(i))
+    blend_file = tmp_path / 'satellite.blend'
+    blend_file.write_text('scene')
+    return rs.discoverCases(str(rotdir)), str(blend_file)
+
+# renderAll with the stand-in and test defaults
+def render(tmp_path, cases, blend_file, **kwargs):
+    kwargs.setdefault('num_workers', 2)
+    kwargs.setdefault('timeout', 10)
+    return rs.renderAll(cases, str(tmp_path / 'photometry'), str(tmp_path / 'render'),
+                        blender_exe=FAKE_BLENDER, blend_file=blend_file,
+                        script=FAKE_BLENDER[1], **kwargs)
+
+# True if a process with this pid still exists
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+def test_every_case_completes(tmp_path):
+    cases, blend_file = makeCases(tmp_path)
+    results, failures = render(tmp_path, cases, blend_file)
+    assert failures == {}
+    assert sorted(results) == cases
+    assert all(os.path.isfile(phot_file) for phot_file in results.values())
+
+def test_failed_case_is_not_retried(tmp_path, monkeypatch):
+    cases, blend_file = makeCases(tmp_path)
+    monkeypatch.setenv('FAKE_BLENDER_FAIL', os.path.basename(cases[1]))
+    results, failures = render(tmp_path, cases, blend_file)
+    assert list(failures) == [cases[1]]
+    assert sorted(results) == cases[0:1] + cases[2:]
+
+def test_crashed_worker_is_restarted(tmp_path, monkeypatch):
+    cases, blend_file = makeCases(tmp_path)
+    monkeypatch.setenv('FAKE_BLENDER_CRASH', os.path.basename(cases[2]))
+    results, failures = render(tmp_path, cases, blend_file)
+    assert failures == {}
+    assert sorted(results) == cases
+    assert (tmp_path / 'photometry' / (os.path.basename(cases[2]) + '.crash')).exists()
+
+def test_hung_worker_is_killed_after_timeout(tmp_path, monkeypatch):
+    cases, blend_file = makeCases(tmp_path)
+    monkeypatch.setenv('FAKE_BLENDER_HANG', os.path.basename(cases[2]))
+    timeout = 3
+    t_start = time.perf_counter()
+    results, failures = render(tmp_path, cases, blend_file, timeout=timeout)
+    assert time.perf_counter() - t_start >= timeout
+    assert failures == {}
+    assert sorted(results) == cases
+
+    marker = tmp_path / 'photometry' / (os.path.basename(cases[2]) + '.hang')
+    assert not alive(int(marker.read_text()))
+
+def test_repeated_run_is_cached(tmp_path, capsys):
+    cases, blend_file = makeCases(tmp_path)
+    manifest = rc.RenderManifest(str(tmp_path / 'photometry' / 'render_manifest.jsonl'))
+    first, failures = render(tmp_path, cases, blend_file, manifest=manifest)
+    assert failures == {}
+    assert len(manifest.entries) == len(cases)
+
+    capsys.readouterr()
+    second, failures = render(tmp_path, cases, blend_file, manifest=manifest)
+    assert failures == {}
+    assert second == first
+    assert "%d cases already rendered, 0 to render" % len(cases) in capsys.readouterr().out
+
+    # A fresh manifest object reads the same records from the file
+    reloaded = rc.RenderManifest(manifest.path)
+    assert reloaded.plan(cases, blend_file, rs.renderSettings(FAKE_BLENDER[1], 'Satellite', 'stream'))[2] == []